@@ -1,17 +1,22 @@
+import asyncio
 import os
 import sys
 from logging.config import fileConfig
 
 from dotenv import load_dotenv
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
-from src.shared.db.base import Base
-
-load_dotenv()
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import src.shared.db.models  # noqa: E402, F401  (registers the tables)
+from src.shared.db.base import Base  # noqa: E402
+
+load_dotenv()
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -21,21 +26,18 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-config.set_main_option("sqlalchemy.url", os.getenv("SYNC_DATABASE_URL"))  # type: ignore
-
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-# target_metadata = None
-target_metadata = Base.metadata
-print("Таблицы, видимые Alembic:", target_metadata.tables.keys())
+# The async URL of the application; SYNC_DATABASE_URL is still accepted.
+config.set_main_option(
+    "sqlalchemy.url",
+    os.getenv("DATABASE_URL") or os.getenv("SYNC_DATABASE_URL"),  # type: ignore
+)
 
+# A DDL statement waiting for a lock blocks every query queued behind it,
+# so migrations give up quickly instead of stalling live traffic; rerun
+# them when the conflicting transaction is gone.
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
 
-# other values from the config, defined by the needs of env.py,
-# can be acquired:
-# my_important_option = config.get_main_option("my_important_option")
-# ... etc.
+target_metadata = Base.metadata
 
 
 def run_migrations_offline() -> None:
@@ -56,39 +58,54 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 
-# def do_run_migrations(connection):
-#     context.configure(
-#         connection=connection,
-#         target_metadata=target_metadata,
-#     )
-#     with context.begin_transaction():
-#         context.run_migrations()
+def do_run_migrations(connection: Connection) -> None:
+    """Run the migrations on a connection, one transaction per revision.
 
+    Per-revision transactions let a revision leave its transaction for
+    `CREATE INDEX CONCURRENTLY` and batched backfills
+    (see `src.shared.db.online_migrations`).
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+        connection.commit()
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
 
-def run_migrations_online() -> None:
-    """Run migrations in 'online' mode.
-
-    In this scenario we need to create an Engine
-    and associate a connection with the context.
 
-    """
-    connectable = engine_from_config(
+async def run_async_migrations() -> None:
+    """Create an async engine and run the migrations through it."""
+    connectable = async_engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+
+    """
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
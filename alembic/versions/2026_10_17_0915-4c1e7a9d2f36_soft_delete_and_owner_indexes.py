@@ -0,0 +1,56 @@
+"""soft delete and owner indexes
+
+Revision ID: 4c1e7a9d2f36
+Revises: b9638fef33f9
+Create Date: 2026-10-17 09:15:12.318204
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+from src.shared.db.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1e7a9d2f36"
+down_revision: Union[str, None] = "b9638fef33f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default only changes the catalog (PostgreSQL 11+), so neither
+    # column rewrites the table. IF NOT EXISTS: the index builds below commit
+    # separately, so the revision may have to be rerun.
+    op.execute(
+        "ALTER TABLE todos "
+        "ADD COLUMN IF NOT EXISTS is_deleted boolean DEFAULT false NOT NULL, "
+        "ADD COLUMN IF NOT EXISTS user_id integer"
+    )
+    # The primary key already has a unique index.
+    drop_index_concurrently("ix_todos_id", "todos")
+    create_index_concurrently(
+        "ix_todos_live_created_at_id",
+        "todos",
+        ["created_at", "id"],
+        where="NOT is_deleted",
+    )
+    create_index_concurrently(
+        "ix_todos_user_id_is_deleted_created_at_id",
+        "todos",
+        ["user_id", "is_deleted", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently("ix_todos_user_id_is_deleted_created_at_id", "todos")
+    drop_index_concurrently("ix_todos_live_created_at_id", "todos")
+    create_index_concurrently("ix_todos_id", "todos", ["id"])
+    op.drop_column("todos", "user_id")
+    op.drop_column("todos", "is_deleted")
@@ -0,0 +1,67 @@
+"""list filters and search
+
+Revision ID: 8b2f6d31c0e4
+Revises: 4c1e7a9d2f36
+Create Date: 2026-10-17 10:40:27.904113
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from src.shared.db.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2f6d31c0e4"
+down_revision: Union[str, None] = "4c1e7a9d2f36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # An expression index instead of a stored generated column: adding such a
+    # column rewrites the whole table under an ACCESS EXCLUSIVE lock. Must
+    # match `search_document` of the model for searches to use it.
+    create_index_concurrently(
+        "ix_todos_search_vector",
+        "todos",
+        [
+            sa.text(
+                "to_tsvector('simple'::regconfig, "
+                "(coalesce(title, '') || ' ') || coalesce(description, ''))"
+            )
+        ],
+        using="gin",
+    )
+    create_index_concurrently(
+        "ix_todos_live_updated_at_id",
+        "todos",
+        ["updated_at", "id"],
+        where="NOT is_deleted",
+    )
+    create_index_concurrently(
+        "ix_todos_live_title_id",
+        "todos",
+        ["title", "id"],
+        where="NOT is_deleted",
+    )
+    create_index_concurrently(
+        "ix_todos_live_is_completed_created_at_id",
+        "todos",
+        ["is_completed", "created_at", "id"],
+        where="NOT is_deleted",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently("ix_todos_live_is_completed_created_at_id", "todos")
+    drop_index_concurrently("ix_todos_live_title_id", "todos")
+    drop_index_concurrently("ix_todos_live_updated_at_id", "todos")
+    drop_index_concurrently("ix_todos_search_vector", "todos")
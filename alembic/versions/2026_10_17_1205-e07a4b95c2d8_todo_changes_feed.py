@@ -0,0 +1,92 @@
+"""todo changes feed
+
+Revision ID: e07a4b95c2d8
+Revises: 8b2f6d31c0e4
+Create Date: 2026-10-17 12:05:41.127730
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.shared.db.online_migrations import (
+    backfill,
+    create_index_concurrently,
+    drop_index_concurrently,
+    set_not_null,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "e07a4b95c2d8"
+down_revision: Union[str, None] = "8b2f6d31c0e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The revision commits half way (see `src.shared.db.online_migrations`):
+    # every step is written to be safe to rerun.
+    op.execute("CREATE SEQUENCE IF NOT EXISTS todos_change_seq")
+    # Nullable columns without defaults only touch the catalog; volatile
+    # defaults given with ADD COLUMN would rewrite the table under ACCESS
+    # EXCLUSIVE. The defaults are set afterwards, for new rows only.
+    op.execute(
+        "ALTER TABLE todos "
+        "ADD COLUMN IF NOT EXISTS change_seq bigint, "
+        "ADD COLUMN IF NOT EXISTS change_xid xid8"
+    )
+    op.execute(
+        "ALTER TABLE todos "
+        "ALTER COLUMN change_seq SET DEFAULT nextval('todos_change_seq'), "
+        "ALTER COLUMN change_xid SET DEFAULT pg_current_xact_id()"
+    )
+    # The trigger is in place before existing rows are numbered, so rows
+    # written during the backfill get their change_seq from it. A no-op
+    # update (same values written back) does not move a row in the feed.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION todos_bump_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_seq := nextval('todos_change_seq');
+            NEW.change_xid := pg_current_xact_id();
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE TRIGGER todos_bump_change_seq
+        BEFORE UPDATE ON todos
+        FOR EACH ROW
+        WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION todos_bump_change_seq()
+        """
+    )
+    # Existing rows predate the feed (clients get them with a full sync), so
+    # they are simply numbered in key order, in committed batches. Setting
+    # change_xid fires the trigger, which assigns change_seq.
+    backfill("todos", "change_xid = pg_current_xact_id()", where="change_seq IS NULL")
+    set_not_null("todos", "change_seq")
+    set_not_null("todos", "change_xid")
+    create_index_concurrently(
+        "ix_todos_change_seq", "todos", ["change_seq"], unique=True
+    )
+    create_index_concurrently(
+        "ix_todos_user_id_change_seq", "todos", ["user_id", "change_seq"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently("ix_todos_user_id_change_seq", "todos")
+    drop_index_concurrently("ix_todos_change_seq", "todos")
+    op.execute("DROP TRIGGER todos_bump_change_seq ON todos")
+    op.execute("DROP FUNCTION todos_bump_change_seq()")
+    op.drop_column("todos", "change_xid")
+    op.drop_column("todos", "change_seq")
+    op.execute(sa.schema.DropSequence(sa.Sequence("todos_change_seq")))
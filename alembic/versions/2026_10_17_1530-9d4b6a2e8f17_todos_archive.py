@@ -0,0 +1,81 @@
+"""todos archive
+
+Revision ID: 9d4b6a2e8f17
+Revises: 5a9e3c7d1b42
+Create Date: 2026-10-17 15:30:48.206117
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from src.shared.db.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+from src.shared.db.types import XID8
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b6a2e8f17"
+down_revision: Union[str, None] = "5a9e3c7d1b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "todos_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("change_xid", XID8(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_todos_archive_user_id_created_at_id",
+        "todos_archive",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_todos_archive_change_seq", "todos_archive", ["change_seq"], unique=True
+    )
+    op.create_index(
+        "ix_todos_archive_user_id_change_seq",
+        "todos_archive",
+        ["user_id", "change_seq"],
+        unique=False,
+    )
+    # `todos` is large and written to all the time: build without blocking.
+    create_index_concurrently(
+        "ix_todos_cold_updated_at",
+        "todos",
+        ["updated_at"],
+        where="is_deleted OR is_completed",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived rows go back to the live table before the archive is dropped.
+    op.execute(
+        "INSERT INTO todos (id, title, description, is_completed, created_at, "
+        "updated_at, is_deleted, user_id, change_seq, change_xid) "
+        "SELECT id, title, description, is_completed, created_at, updated_at, "
+        "is_deleted, user_id, change_seq, change_xid FROM todos_archive"
+    )
+    drop_index_concurrently("ix_todos_cold_updated_at", "todos")
+    op.drop_index("ix_todos_archive_user_id_change_seq", table_name="todos_archive")
+    op.drop_index("ix_todos_archive_change_seq", table_name="todos_archive")
+    op.drop_index("ix_todos_archive_user_id_created_at_id", table_name="todos_archive")
+    op.drop_table("todos_archive")
@@ -0,0 +1,36 @@
+"""purge deleted todos
+
+Revision ID: 2f7c5e1a9b36
+Revises: 9d4b6a2e8f17
+Create Date: 2026-10-17 16:45:12.873340
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from src.shared.db.online_migrations import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "2f7c5e1a9b36"
+down_revision: Union[str, None] = "9d4b6a2e8f17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index_concurrently(
+        "ix_todos_archive_deleted_updated_at",
+        "todos_archive",
+        ["updated_at"],
+        where="is_deleted",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently("ix_todos_archive_deleted_updated_at", "todos_archive")
@@ -0,0 +1,6 @@
+"""
+Benchmarks of the todo API.
+
+Run with `python -m benchmarks --help` from the project root; see the
+"Бенчмарки" section of the README.
+"""
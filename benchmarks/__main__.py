@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import sys
+
+from benchmarks.common import (
+    backend_url,
+    discard_database,
+    is_reachable,
+    write_report,
+)
+
+
+def _sizes(raw: str) -> tuple[int, ...]:
+    return tuple(int(size) for size in raw.split(","))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmarks of the todo API."
+    )
+    sub = parser.add_subparsers(dest="suite", required=True)
+
+    micro = sub.add_parser("micro", help="Repository and serialization benchmarks.")
+    micro.add_argument("--sizes", type=_sizes, default=(10, 1_000, 100_000))
+    micro.add_argument("--iterations", type=int, default=200)
+    micro.add_argument("--max-seconds", type=float, default=5.0)
+
+    load = sub.add_parser("load", help="In-process HTTP load of every endpoint.")
+    load.add_argument("--rows", type=int, default=1_000)
+    load.add_argument("--requests", type=int, default=500)
+    load.add_argument("--concurrency", type=int, default=16)
+
+    for suite in (micro, load):
+        suite.add_argument(
+            "--backend",
+            choices=("sqlite", "postgres"),
+            default="sqlite",
+            help="postgres uses BENCH_POSTGRES_URL and is skipped if unreachable.",
+        )
+        suite.add_argument("--out", help="Write the results as JSON to this file.")
+
+    diff = sub.add_parser("compare", help="Compare two JSON reports.")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument(
+        "--threshold", type=float, default=10.0, help="p95 increase in percent."
+    )
+
+    args = parser.parse_args()
+    if args.suite == "compare":
+        from benchmarks.compare import compare
+
+        return 1 if compare(args.baseline, args.current, args.threshold) else 0
+
+    url = backend_url(args.backend)
+    if args.backend == "postgres" and not asyncio.run(is_reachable(url)):
+        print(f"PostgreSQL is not reachable at {url}, skipping.", file=sys.stderr)
+        return 0
+
+    try:
+        if args.suite == "micro":
+            from benchmarks.micro import run_micro
+
+            params = {
+                "sizes": args.sizes,
+                "iterations": args.iterations,
+                "max_seconds": args.max_seconds,
+            }
+            results = asyncio.run(run_micro(args.backend, url, **params))
+        else:
+            from benchmarks.load import run_load
+
+            params = {
+                "rows": args.rows,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+            }
+            results = asyncio.run(run_load(args.backend, url, **params))
+    finally:
+        discard_database(url)
+
+    write_report(args.suite, {"backend": args.backend, **params}, results, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
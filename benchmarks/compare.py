@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _index(path: str) -> dict[tuple, dict]:
+    report = json.loads(Path(path).read_text())
+    return {(r["backend"], r["name"], r["rows"]): r for r in report["results"]}
+
+
+def compare(baseline: str, current: str, threshold: float = 10.0) -> int:
+    """
+    Print the latency change of every benchmark present in both reports.
+
+    Args:
+        baseline (str): Path of the older JSON report.
+        current (str): Path of the newer JSON report.
+        threshold (float): Percent increase of p95 reported as a regression.
+
+    Returns:
+        int: Number of regressions (usable as an exit status).
+    """
+    old, new = _index(baseline), _index(current)
+    regressions = 0
+    for key in sorted(old.keys() & new.keys(), key=str):
+        deltas = []
+        for metric in METRICS:
+            before, after = old[key][metric], new[key][metric]
+            change = (after - before) / before * 100 if before else 0.0
+            deltas.append(f"{metric}={after:.3f}ms ({change:+.1f}%)")
+            if metric == "p95_ms" and change > threshold:
+                regressions += 1
+                deltas[-1] += " REGRESSION"
+        backend, name, rows = key
+        print(f"{backend:>8} {name:<32} rows={rows:<7} " + " ".join(deltas))
+    for key in sorted(old.keys() ^ new.keys(), key=str):
+        print(f"only in {'baseline' if key in old else 'current'}: {key}")
+    return regressions
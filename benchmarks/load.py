@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import os
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from benchmarks.common import percentile, reset_schema, seed_todos
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Requests of one endpoint of the todo router.
+
+    Attributes:
+        name (str): Method and route template, e.g. `GET /todos/{todo_id}`.
+        build (Callable[[], tuple[str, str, Any]]): Returns method, path and
+            JSON body (or None) of the next request.
+    """
+
+    name: str
+    build: Callable[[], tuple[str, str, Any]]
+
+
+def todo_scenarios(rows: int, requests: int) -> list[Scenario]:
+    """
+    One scenario per endpoint of `todo_router.py`.
+
+    Reads and updates hit random seeded rows. Deletes consume distinct rows
+    from the end of the table and run last, so they never 404 and never
+    affect the other endpoints.
+
+    Args:
+        rows (int): Number of seeded todos.
+        requests (int): Requests per endpoint.
+
+    Returns:
+        list[Scenario]: The scenarios, in the order they should run.
+    """
+    counter = itertools.count()
+    to_delete = itertools.count(rows, -1)
+
+    def any_id() -> int:
+        return random.randint(1, max(1, rows - 11 * requests))
+
+    return [
+        Scenario(
+            "POST /todos", lambda: ("POST", "/todos", {"title": f"n{next(counter)}"})
+        ),
+        Scenario(
+            "POST /todos:batch",
+            lambda: (
+                "POST",
+                "/todos:batch",
+                {"items": [{"title": f"b{next(counter)}"} for _ in range(10)]},
+            ),
+        ),
+        Scenario("GET /todos", lambda: ("GET", "/todos?limit=50", None)),
+        Scenario(
+            "GET /todos?is_completed&sort",
+            lambda: (
+                "GET",
+                "/todos?is_completed=false&sort=-updated_at&limit=50",
+                None,
+            ),
+        ),
+        Scenario("GET /todos/export", lambda: ("GET", "/todos/export", None)),
+        Scenario(
+            "GET /todos/changes", lambda: ("GET", "/todos/changes?limit=500", None)
+        ),
+        Scenario("GET /todos/{todo_id}", lambda: ("GET", f"/todos/{any_id()}", None)),
+        Scenario(
+            "PATCH /todos/{todo_id}",
+            lambda: ("PATCH", f"/todos/{any_id()}", {"title": f"u{next(counter)}"}),
+        ),
+        Scenario(
+            "PATCH /todos:batch",
+            lambda: (
+                "PATCH",
+                "/todos:batch",
+                {"items": [{"id": any_id(), "is_completed": True} for _ in range(10)]},
+            ),
+        ),
+        Scenario(
+            "POST /todos/{todo_id}/complete",
+            lambda: ("POST", f"/todos/{any_id()}/complete", None),
+        ),
+        Scenario(
+            "DELETE /todos/{todo_id}",
+            lambda: ("DELETE", f"/todos/{next(to_delete)}", None),
+        ),
+        Scenario(
+            "DELETE /todos:batch",
+            lambda: (
+                "DELETE",
+                "/todos:batch",
+                {"ids": [next(to_delete) for _ in range(10)]},
+            ),
+        ),
+    ]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> dict[str, Any]:
+    """
+    Send `requests` requests of a scenario from `concurrency` workers.
+
+    Returns:
+        dict[str, Any]: Latency percentiles, throughput and error count.
+    """
+    latencies: list[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while next(remaining) < requests:
+            method, path, body = scenario.build()
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        "name": scenario.name,
+        "samples": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "ops_per_sec": round(len(ordered) / elapsed, 1),
+    }
+
+
+async def run_load(
+    backend: str,
+    url: str,
+    rows: int = 1_000,
+    requests: int = 500,
+    concurrency: int = 16,
+) -> list[dict]:
+    """
+    Drive the whole application in-process through the httpx ASGI transport.
+
+    The full middleware stack and dependency graph run as in production;
+    only the network and the server are left out. The application reads
+    its database URL at import time, so one process benchmarks one backend.
+
+    Args:
+        backend (str): Label of the database in the results.
+        url (str): Async URL of a database the benchmark may wipe.
+        rows (int): Todos seeded before the run.
+        requests (int): Requests per endpoint.
+        concurrency (int): Requests in flight at a time.
+
+    Returns:
+        list[dict]: One result per endpoint.
+    """
+    os.environ["DATABASE_URL"] = url
+    from src.main_app.init_app import app
+    from src.shared.db.engine import get_async_engine
+
+    engine = get_async_engine()
+    await reset_schema(engine)
+    # Deletes use up to 11 rows per request from the end of the table.
+    await seed_todos(engine, rows + 11 * requests)
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for scenario in todo_scenarios(rows + 11 * requests, requests):
+            result = await run_scenario(client, scenario, requests, concurrency)
+            results.append({**result, "backend": backend, "rows": rows})
+    await engine.dispose()
+    return results
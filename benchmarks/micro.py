@@ -0,0 +1,113 @@
+import itertools
+import random
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.common import measure, reset_schema, seed_todos, summarize
+from src.moduls.todo.api.v1.schemas import ToDoRead
+from src.moduls.todo.todo_repository import ToDoRepository
+from src.shared.db.models.todo_model import ToDo
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+
+_todo_list = TypeAdapter(list[ToDoRead])
+
+
+def _repository_benchmarks(sessions: async_sessionmaker, rows: int) -> list:
+    counter = itertools.count()
+
+    async def create():
+        async with sessions() as s:
+            await ToDoRepository(s).create({"title": f"new {next(counter)}"})
+
+    async def get():
+        async with sessions() as s:
+            await ToDoRepository(s).get(random.randint(1, rows))
+
+    async def list_page():
+        async with sessions() as s:
+            await ToDoRepository(s).list_page(limit=50)
+
+    async def list_all():
+        async with sessions() as s:
+            await ToDoRepository(s).list()
+
+    async def update():
+        async with sessions() as s:
+            await ToDoRepository(s).update(
+                random.randint(1, rows), {"title": f"upd {next(counter)}"}
+            )
+
+    return [
+        ("repo.create", create),
+        ("repo.get", get),
+        ("repo.list_page", list_page),
+        ("repo.list", list_all),
+        ("repo.update", update),
+    ]
+
+
+def _serialization_benchmarks(objs: list[ToDo]) -> list:
+    async def validate():
+        [ToDoRead.model_validate(o) for o in objs]
+
+    async def dump_json():
+        _todo_list.dump_json(_todo_list.validate_python(objs, from_attributes=True))
+
+    return [
+        ("ToDoRead.model_validate", validate),
+        ("ToDoRead.dump_json", dump_json),
+    ]
+
+
+async def run_micro(
+    backend: str,
+    url: str,
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    iterations: int = 200,
+    max_seconds: float = 5.0,
+) -> list[dict]:
+    """
+    Benchmark repository operations and `ToDoRead` serialization.
+
+    For every table size the schema is recreated and seeded, then each
+    repository call runs in its own session, as in a request.
+    Serialization is measured on `size` ORM objects loaded up front.
+
+    Args:
+        backend (str): Label of the database in the results.
+        url (str): Async URL of a database the benchmark may wipe.
+        sizes (tuple[int, ...]): Table sizes to benchmark.
+        iterations (int): Maximum timed calls per benchmark.
+        max_seconds (float): Time budget per benchmark.
+
+    Returns:
+        list[dict]: One result per benchmark and size.
+    """
+    engine = create_async_engine(url)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    results = []
+    try:
+        for rows in sizes:
+            await reset_schema(engine)
+            await seed_todos(engine, rows)
+            benchmarks = _repository_benchmarks(sessions, rows)
+            async with sessions() as s:
+                objs = list((await s.scalars(select(ToDo).limit(rows))).all())
+            benchmarks += _serialization_benchmarks(objs)
+
+            for name, fn in benchmarks:
+                samples = await measure(fn, iterations, max_seconds)
+                results.append(
+                    {
+                        "name": name,
+                        "backend": backend,
+                        "rows": rows,
+                        **summarize(samples),
+                    }
+                )
+    finally:
+        await engine.dispose()
+    return results
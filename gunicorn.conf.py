@@ -0,0 +1,17 @@
+import os
+import shutil
+
+from src.shared.metrics import MULTIPROC_DIR_ENV, mark_process_dead
+
+
+def on_starting(server):
+    """Start every server with an empty Prometheus multiprocess directory."""
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Let Prometheus forget the live gauges of a finished worker."""
+    mark_process_dead(worker.pid)
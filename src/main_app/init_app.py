@@ -1,9 +1,18 @@
 from contextlib import asynccontextmanager
+from typing import Any
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Response
 
 from src.moduls.todo.api.v1.todo_router import todo_router_v1
-from src.shared.configs.log_conf import setup_logger
+from src.shared.cache.entity_cache import (
+    start_invalidation_listeners,
+    stop_invalidation_listeners,
+)
+from src.shared.configs.get_settings import get_settings
+from src.shared.configs.log_conf import setup_logger, stop_logger
+from src.shared.db.profiling import QueryBudgetMiddleware
+from src.shared.metrics import MetricsMiddleware, render_metrics
+from src.shared.request_context import CorrelationIdMiddleware
 
 
 @asynccontextmanager
@@ -11,8 +20,9 @@ async def lifespan(app: FastAPI):
     """
     Context manager executed during the startup and shutdown phases of the FastAPI application.
 
-    Initializes application-wide logging before the server starts
-    and performs cleanup when the application stops.
+    Initializes application-wide logging and the cache invalidation
+    listeners before the server starts and performs cleanup (including
+    flushing the queued log records) when the application stops.
 
     Args:
         app (FastAPI): The current FastAPI application instance.
@@ -21,7 +31,12 @@ async def lifespan(app: FastAPI):
         None: Control is passed to the application runtime.
     """
     setup_logger()
-    yield
+    await start_invalidation_listeners()
+    try:
+        yield
+    finally:
+        await stop_invalidation_listeners()
+        stop_logger()
 
 
 def get_app() -> FastAPI:
@@ -29,7 +44,9 @@ def get_app() -> FastAPI:
     Initialize and return the FastAPI application instance.
 
     Creates and configures the FastAPI app, registers routers,
-    sets up logging, and adds a health check endpoint.
+    sets up logging, and adds a health check endpoint and, when enabled,
+    the `/metrics` endpoint with its middleware and the per-request query
+    budget middleware. Every request gets a correlation id.
     The Swagger documentation is available at `/swagger`.
 
     Returns:
@@ -41,7 +58,9 @@ def get_app() -> FastAPI:
     from sqlalchemy.exc import SQLAlchemyError
     from sqlalchemy.ext.asyncio import AsyncSession
 
-    from src.shared.db.session import get_async_session
+    from src.shared.cache.entity_cache import get_cache_stats
+    from src.shared.db.engine import get_pool_stats
+    from src.shared.db.session import get_read_session
 
     @app_init.get(
         "/health_check",
@@ -50,31 +69,62 @@ def get_app() -> FastAPI:
         tags=["Service"],
     )
     async def health_check(
-        session: AsyncSession = Depends(get_async_session),
-    ) -> dict[str, str]:
+        session: AsyncSession = Depends(get_read_session),
+    ) -> dict[str, Any]:
         """
         Check the health of the application and database connection.
 
         Executes a simple SQL query (`SELECT 1`) using the provided async
         SQLAlchemy session.
         Returns `"ok"` if the database is reachable, otherwise `"error"` with
-        the corresponding exception message.
+        the corresponding exception message. The connection pool state of
+        the worker that served the request is reported under `"pool"`, and
+        the counters of its in-process entity caches under `"cache"`.
 
         Args:
             session (AsyncSession): The async SQLAlchemy session dependency.
 
         Returns:
-            dict[str, str]: A dictionary containing the application
-            and database status.
+            dict[str, Any]: A dictionary containing the application
+            and database status and the pool and cache metrics.
         """
         try:
             await session.execute(text("SELECT 1"))
-            return {"status": "ok", "database": "connected"}
+            return {
+                "status": "ok",
+                "database": "connected",
+                "pool": get_pool_stats(),
+                "cache": get_cache_stats(),
+            }
         except SQLAlchemyError as e:
             return {"status": "error", "database": f"unavailable: {str(e)}"}
         except Exception as e:
             return {"status": "error", "database": f"unavailable: {str(e)}"}
 
+    settings = get_settings()
+    if settings.query_profiling:
+        app_init.add_middleware(
+            QueryBudgetMiddleware,
+            budget=settings.query_budget,
+            repeat_threshold=settings.query_repeat_threshold,
+        )
+
+    if settings.metrics_enabled:
+        app_init.add_middleware(MetricsMiddleware)
+
+        @app_init.get("/metrics", include_in_schema=False)
+        async def metrics() -> Response:
+            """
+            Expose request and database metrics in the Prometheus text format.
+
+            Returns:
+                Response: Metrics aggregated over all workers.
+            """
+            payload, content_type = render_metrics()
+            return Response(payload, media_type=content_type)
+
+    # Added last so it is outermost and every log record of a request has its id.
+    app_init.add_middleware(CorrelationIdMiddleware)
     app_init.include_router(todo_router_v1)
     return app_init
 
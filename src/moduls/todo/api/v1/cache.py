@@ -0,0 +1,26 @@
+from src.moduls.todo.api.v1.schemas import ToDoRead
+from src.shared.cache.entity_cache import EntityCache
+from src.shared.cache.local_cache import LocalTTLCache
+from src.shared.configs.get_settings import get_settings
+
+settings = get_settings()
+
+# The in-process tier relies on Redis pub/sub for cross-worker invalidation,
+# so it is only enabled together with Redis.
+todo_cache = EntityCache(
+    "todo:v1",
+    ToDoRead,
+    ttl=settings.cache_ttl_seconds,
+    local=(
+        LocalTTLCache(settings.local_cache_size, settings.local_cache_ttl_seconds)
+        if settings.redis_url and settings.local_cache_size
+        else None
+    ),
+    # Reads may come from a lagging replica: keep refusing stale values
+    # for as long as the writer's own reads stay on the primary.
+    tombstone_ttl_ms=(
+        round(settings.read_your_writes_seconds * 1000)
+        if settings.replica_urls
+        else None
+    ),
+)
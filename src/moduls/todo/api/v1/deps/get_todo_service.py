@@ -1,26 +1,11 @@
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+"""
+Backward-compatible import path of the ToDo service dependencies.
 
-from src.moduls.todo.api.v1.services.todo_service import ToDoService
-from src.shared.configs.get_settings import get_settings
-from src.shared.db.session import get_async_session
+The providers are built by `base_get_service` in
+`src.moduls.todo.api.v1.get_service` and receive a lazy session, so a
+request only checks out a database connection if the service queries it.
+"""
 
+from src.moduls.todo.api.v1.get_service import get_todo_read_service, get_todo_service
 
-async def get_todo_service(
-    db: AsyncSession = Depends(get_async_session),
-) -> ToDoService:
-    """
-    Dependency provider that returns a ToDoService instance.
-
-    Initializes and provides a new instance of the ToDoService
-    with the current application settings and an active database session.
-
-    Args:
-        db (AsyncSession): SQLAlchemy asynchronous session, injected by FastAPI's dependency system.
-
-    Returns:
-        ToDoService: The service object responsible for ToDo business logic and database operations.
-    """
-    return ToDoService(
-        settings=get_settings(),
-    )
+__all__ = ["get_todo_read_service", "get_todo_service"]
@@ -1,5 +1,32 @@
+from src.moduls.todo.api.v1.cache import todo_cache
 from src.moduls.todo.api.v1.services.todo_service import ToDoService
 from src.moduls.todo.todo_repository import ToDoRepository
+from src.shared.cache.single_flight import SingleFlight
+from src.shared.configs.get_settings import get_settings
+from src.shared.db.session import AsyncSessionLocal
+from src.shared.db.write_behind import WriteCoalescer
 from src.shared.services.base_get_service import base_get_service
 
-get_todo_service = base_get_service(ToDoService, ToDoRepository)
+settings = get_settings()
+
+# Per-worker registry coalescing identical concurrent reads.
+todo_flights = SingleFlight()
+
+# Opt-in per-worker batching of field updates (e.g. bursts of /complete).
+todo_writes = (
+    WriteCoalescer(
+        AsyncSessionLocal,
+        ToDoRepository,
+        window=settings.write_behind_window_ms / 1000,
+        max_batch=settings.write_behind_max_batch,
+    )
+    if settings.write_behind_window_ms
+    else None
+)
+
+get_todo_service = base_get_service(
+    ToDoService, ToDoRepository, todo_cache, todo_flights, todo_writes
+)
+get_todo_read_service = base_get_service(
+    ToDoService, ToDoRepository, todo_cache, todo_flights, read_only=True
+)
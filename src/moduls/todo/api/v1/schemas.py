@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -53,12 +54,99 @@ class ToDoRead(ToDoBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+ToDoSort = Literal[
+    "created_at", "-created_at", "updated_at", "-updated_at", "title", "-title"
+]
+
+
 class ToDoListResponse(BaseModel):
     """
     Schema for representing a paginated list of ToDo items.
+
+    `next_cursor` is an opaque token to pass back as `cursor` to fetch the
+    next page; it is null on the last page.
+    """
+
+    items: list[ToDoRead]
+    next_cursor: str | None = None
+
+
+class ToDoChangesResponse(BaseModel):
+    """
+    Schema for one page of the todo changes feed.
+
+    `items` are the todos created or updated since the token, `deleted` the
+    identifiers of todos deleted since then. `next_token` is passed back as
+    `since` on the next sync; if `has_more` is true the client should request
+    the next page right away.
     """
 
     items: list[ToDoRead]
+    deleted: list[int]
+    next_token: str | None = None
+    has_more: bool = False
+
+
+MAX_BATCH_ITEMS = 5000
+
+
+class ToDoBatchCreate(BaseModel):
+    """
+    Schema for creating ToDo items in bulk.
+
+    Each item is validated against `ToDoCreate` individually, so an invalid
+    item is reported in the response instead of rejecting the whole batch.
+    """
+
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ToDoBatchUpdateItem(ToDoUpdate):
+    """
+    Schema for a single item of a bulk update: the target ID plus changes.
+    """
+
+    id: int
+
+
+class ToDoBatchUpdate(BaseModel):
+    """
+    Schema for updating ToDo items in bulk.
+
+    Each item is validated against `ToDoBatchUpdateItem` individually.
+    """
+
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ToDoBatchDelete(BaseModel):
+    """
+    Schema for deleting ToDo items in bulk.
+    """
+
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class ToDoBatchItemResult(BaseModel):
+    """
+    Outcome of one item of a bulk operation.
+
+    `item` is set for successful creates and updates, `id` for successful
+    deletes, `error` for items that were not applied.
+    """
+
+    index: int
+    id: int | None = None
+    item: ToDoRead | None = None
+    error: str | None = None
+
+
+class ToDoBatchResponse(BaseModel):
+    """
+    Schema for the per-item results of a bulk operation, in request order.
+    """
+
+    results: list[ToDoBatchItemResult]
 
 
 class MessageResponse(BaseModel):
@@ -14,4 +14,25 @@ class ToDoService(BaseCRUDService[ToDoRepository]):
         BaseCRUDService[ToDoRepository]: Provides generic CRUD operations for ToDo objects.
     """
 
-    pass
+    async def complete(self, obj_id: int, user_id: int | None = None):
+        """
+        Mark a ToDo item as completed.
+
+        Performed as one atomic, idempotent `UPDATE ... RETURNING` statement;
+        completing an already completed item does not change `updated_at`.
+        With write-behind enabled, bursts of completions are merged into one
+        statement with the same guarantees.
+
+        Args:
+            obj_id (int): The primary key of the ToDo item.
+            user_id (int | None): Optional user ID for ownership validation.
+
+        Returns:
+            ToDo | None: The updated ToDo item, or None if not found.
+        """
+        if self.writes is not None:
+            return await self.update(obj_id, {"is_completed": True}, user_id)
+        obj = await self.repo.set_flag(obj_id, "is_completed", True, user_id)
+        if obj is not None:
+            await self._invalidate(obj_id)
+        return obj
@@ -1,18 +1,181 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, TypeVar
 
-from src.moduls.todo.api.v1.get_service import get_todo_service
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError, create_model
+
+from src.moduls.todo.api.v1.get_service import get_todo_read_service, get_todo_service
 from src.moduls.todo.api.v1.schemas import (
     MessageResponse,
+    ToDoBatchCreate,
+    ToDoBatchDelete,
+    ToDoBatchItemResult,
+    ToDoBatchResponse,
+    ToDoBatchUpdate,
+    ToDoBatchUpdateItem,
+    ToDoChangesResponse,
     ToDoCreate,
     ToDoListResponse,
     ToDoRead,
+    ToDoSort,
     ToDoUpdate,
 )
 from src.moduls.todo.api.v1.services.todo_service import ToDoService
+from src.shared.bulk import BulkItemResult
+from src.shared.configs.get_settings import get_settings
+from src.shared.etag import (
+    collection_etag,
+    entity_etag,
+    none_match,
+    parse_entity_etag,
+    split_etags,
+)
+from src.shared.fast_json import FastJSONResponse
+from src.shared.list_query import Filter, ListQuery
+from src.shared.pagination import InvalidCursorError
+from src.shared.sparse_fields import InvalidFieldsError, parse_fields, sparse_model
+from src.shared.streaming import NDJSON_MEDIA_TYPE, iter_ndjson, iter_ndjson_rows
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+DEFAULT_CHANGES_SIZE = 500
+MAX_CHANGES_SIZE = 5000
+TODO_READ_FIELDS = tuple(ToDoRead.model_fields)
+ETAG_FIELDS = ("id", "updated_at")
+FIELDS_QUERY = Query(
+    None,
+    description=(
+        "Comma-separated subset of `ToDoRead` fields to return, e.g. `id,title`. "
+        "Only these columns are read from the database."
+    ),
+)
+ARCHIVED_QUERY = Query(
+    False,
+    description=(
+        "Also return archived todos, i.e. completed todos not updated for "
+        "`ARCHIVE_AFTER_DAYS` days. Archived todos are read-only."
+    ),
+)
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+NOT_MODIFIED_RESPONSE = {304: {"description": "Not modified"}}
 
 todo_router_v1 = APIRouter(prefix="/todos", tags=["ToDo"])
 
 
+def _validate_batch(
+    items: list[dict[str, Any]], schema: type[SchemaType]
+) -> tuple[list[tuple[int, SchemaType]], dict[int, ToDoBatchItemResult]]:
+    """Validate batch items one by one, collecting failures by item index."""
+    valid: list[tuple[int, SchemaType]] = []
+    failed: dict[int, ToDoBatchItemResult] = {}
+    for index, raw in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(raw)))
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )
+            failed[index] = ToDoBatchItemResult(index=index, error=message)
+    return valid, failed
+
+
+def _batch_response(
+    total: int,
+    valid: Sequence[tuple[int, Any]],
+    applied: list[BulkItemResult],
+    failed: dict[int, ToDoBatchItemResult],
+) -> ToDoBatchResponse:
+    """Merge repository results of valid items with validation failures."""
+    results = dict(failed)
+    for (index, _), res in zip(valid, applied, strict=True):
+        if not res.ok:
+            results[index] = ToDoBatchItemResult(index=index, error=res.error)
+        elif isinstance(res.obj, int):
+            results[index] = ToDoBatchItemResult(index=index, id=res.obj)
+        else:
+            results[index] = ToDoBatchItemResult(
+                index=index, id=res.obj.id, item=ToDoRead.model_validate(res.obj)
+            )
+    return ToDoBatchResponse(results=[results[i] for i in range(total)])
+
+
+def _todo_etag(todo: Any, fields: tuple[str, ...] | None = None) -> str:
+    """Return the strong ETag of a todo (ORM object, row or `ToDoRead`)."""
+    variant = ",".join(fields) if fields is not None else None
+    return entity_etag(todo.id, todo.updated_at, variant)
+
+
+def _parse_fields(raw: str | None) -> tuple[str, ...] | None:
+    """Validate the `fields` query parameter against `ToDoRead`."""
+    try:
+        return parse_fields(raw, ToDoRead)
+    except InvalidFieldsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from None
+
+
+def _columns(fields: tuple[str, ...]) -> tuple[str, ...]:
+    """Columns to select for a sparse fieldset: the fields plus ETag inputs."""
+    return fields + tuple(name for name in ETAG_FIELDS if name not in fields)
+
+
+def todo_list_query(
+    is_completed: bool | None = Query(None, description="Filter by status"),
+    created_after: datetime | None = Query(
+        None, description="Only todos created after this time"
+    ),
+    created_before: datetime | None = Query(
+        None, description="Only todos created before this time"
+    ),
+    updated_since: datetime | None = Query(
+        None, description="Only todos updated at or after this time"
+    ),
+    sort: ToDoSort | None = Query(
+        None, description="Ordering; prefix with `-` for descending"
+    ),
+    q: str | None = Query(
+        None,
+        min_length=1,
+        max_length=200,
+        description="Search in title and description",
+    ),
+    archived: bool = ARCHIVED_QUERY,
+) -> ListQuery:
+    """Collect the filtering, ordering and search parameters of GET /todos."""
+    filters = []
+    if is_completed is not None:
+        filters.append(Filter("is_completed", "eq", is_completed))
+    if created_after is not None:
+        filters.append(Filter("created_at", "gt", created_after))
+    if created_before is not None:
+        filters.append(Filter("created_at", "lt", created_before))
+    if updated_since is not None:
+        filters.append(Filter("updated_at", "ge", updated_since))
+    return ListQuery(filters=tuple(filters), sort=sort, q=q, archived=archived)
+
+
+@lru_cache(maxsize=256)
+def _sparse_list_model(fields: tuple[str, ...]) -> type[BaseModel]:
+    """`ToDoListResponse` counterpart whose items only have `fields`."""
+    return create_model(
+        "ToDoSparseListResponse",
+        items=(list[sparse_model(ToDoRead, fields)], ...),
+        next_cursor=(str | None, None),
+    )
+
+
+def _not_modified(etag: str) -> Response:
+    """Build a bodiless 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
 @todo_router_v1.post(
     "",
     response_model=ToDoRead,
@@ -22,6 +185,7 @@ todo_router_v1 = APIRouter(prefix="/todos", tags=["ToDo"])
 )
 async def create_todo(
     todo_in: ToDoCreate,
+    response: Response,
     service: ToDoService = Depends(get_todo_service),
 ) -> ToDoRead:
     """Persist a new todo item and return the created instance."""
@@ -31,39 +195,223 @@ async def create_todo(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to create todo",
         )
+    response.headers["ETag"] = _todo_etag(todo)
     return todo
 
 
+@todo_router_v1.post(
+    ":batch",
+    response_model=ToDoBatchResponse,
+    summary="Create todos in bulk",
+    description=(
+        "Create many todo items at once. Every item of `items` has the "
+        "`ToDoCreate` shape; results are reported per item in request order."
+    ),
+)
+async def batch_create_todos(
+    batch_in: ToDoBatchCreate,
+    service: ToDoService = Depends(get_todo_service),
+) -> ToDoBatchResponse:
+    """Validate and insert a batch of todos with set-based statements."""
+    valid, failed = _validate_batch(batch_in.items, ToDoCreate)
+    applied = await service.bulk_create([item.model_dump() for _, item in valid])
+    return _batch_response(len(batch_in.items), valid, applied, failed)
+
+
+@todo_router_v1.patch(
+    ":batch",
+    response_model=ToDoBatchResponse,
+    summary="Update todos in bulk",
+    description=(
+        "Apply partial updates to many todo items at once. Every item of "
+        "`items` has the `ToDoUpdate` shape plus the target `id`."
+    ),
+)
+async def batch_update_todos(
+    batch_in: ToDoBatchUpdate,
+    service: ToDoService = Depends(get_todo_service),
+) -> ToDoBatchResponse:
+    """Validate and apply a batch of partial updates."""
+    valid, failed = _validate_batch(batch_in.items, ToDoBatchUpdateItem)
+    applied = await service.bulk_update(
+        [
+            (item.id, item.model_dump(exclude_unset=True, exclude={"id"}))
+            for _, item in valid
+        ]
+    )
+    return _batch_response(len(batch_in.items), valid, applied, failed)
+
+
+@todo_router_v1.delete(
+    ":batch",
+    response_model=ToDoBatchResponse,
+    summary="Delete todos in bulk",
+    description="Delete many todo items by their identifiers.",
+)
+async def batch_delete_todos(
+    batch_in: ToDoBatchDelete,
+    service: ToDoService = Depends(get_todo_service),
+) -> ToDoBatchResponse:
+    """Delete a batch of todos and report which identifiers were found."""
+    valid = list(enumerate(batch_in.ids))
+    applied = await service.bulk_delete(batch_in.ids)
+    return _batch_response(len(batch_in.ids), valid, applied, {})
+
+
 @todo_router_v1.get(
     "",
     response_model=ToDoListResponse,
     summary="List todos",
-    description="Retrieve the collection of todo items with minimal metadata.",
+    description=(
+        "Retrieve a page of todo items ordered by creation time or by `sort`, "
+        "optionally filtered by status and time ranges and searched with `q`. "
+        "Pass `next_cursor` from the response as `cursor` to get the next page. "
+        "Use `fields` to return only some fields of every item. "
+        "Supports conditional requests with `If-None-Match`."
+    ),
+    responses=NOT_MODIFIED_RESPONSE,
 )
 async def list_todos(
-    service: ToDoService = Depends(get_todo_service),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Cursor of the page to fetch"),
+    fields: str | None = FIELDS_QUERY,
+    query: ListQuery = Depends(todo_list_query),
+    if_none_match: str | None = Header(None),
+    service: ToDoService = Depends(get_todo_read_service),
 ) -> ToDoListResponse:
-    """Return the list of todos available to the current context."""
-    todos = await service.list()
-    return ToDoListResponse(items=todos)
+    """Return one page of todos available to the current context."""
+    selected = _parse_fields(fields)
+    # With FAST_JSON_RESPONSES the page is read as row tuples and encoded
+    # straight to bytes; the wire format is identical to ToDoListResponse.
+    fast = get_settings().fast_json_responses
+    if selected is not None:
+        columns = _columns(selected)
+    else:
+        columns = TODO_READ_FIELDS if fast else None
+    try:
+        todos, next_cursor = await service.list_page(
+            limit=limit, cursor=cursor, columns=columns, query=query
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from None
+
+    etag = collection_etag(map(_todo_etag, todos), next_cursor, selected)
+    if not none_match(if_none_match, etag):
+        return _not_modified(etag)
+    if fast:
+        names = selected or TODO_READ_FIELDS
+        items = [{name: getattr(row, name) for name in names} for row in todos]
+        return FastJSONResponse(
+            {"items": items, "next_cursor": next_cursor}, headers={"ETag": etag}
+        )
+    if selected is not None:
+        page = _sparse_list_model(selected)(items=todos, next_cursor=next_cursor)
+        return Response(
+            page.model_dump_json(),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+    response.headers["ETag"] = etag
+    return ToDoListResponse(items=todos, next_cursor=next_cursor)
+
+
+@todo_router_v1.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export todos",
+    description=(
+        "Stream all todo items as newline-delimited JSON, one `ToDoRead` "
+        "object per line, in creation order."
+    ),
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def export_todos(
+    service: ToDoService = Depends(get_todo_read_service),
+) -> StreamingResponse:
+    """Stream every todo without loading the whole table into memory."""
+    if get_settings().fast_json_responses:
+        batches = service.stream(batch_size=EXPORT_BATCH_SIZE, columns=TODO_READ_FIELDS)
+        content = iter_ndjson_rows(batches, TODO_READ_FIELDS)
+    else:
+        batches = service.stream(batch_size=EXPORT_BATCH_SIZE)
+        content = iter_ndjson(batches, ToDoRead)
+    return StreamingResponse(content, media_type=NDJSON_MEDIA_TYPE)
+
+
+@todo_router_v1.get(
+    "/changes",
+    response_model=ToDoChangesResponse,
+    summary="Sync todo changes",
+    description=(
+        "Return todo items created, updated or deleted since the `since` token, "
+        "in change order, and the token to use for the next sync. Omit `since` "
+        "for the initial sync."
+    ),
+)
+async def list_todo_changes(
+    since: str | None = Query(None, description="Token from the previous sync"),
+    limit: int = Query(DEFAULT_CHANGES_SIZE, ge=1, le=MAX_CHANGES_SIZE),
+    service: ToDoService = Depends(get_todo_read_service),
+) -> ToDoChangesResponse:
+    """Return the todos changed since the client's last sync."""
+    try:
+        changed, next_token, has_more = await service.changes(since, limit=limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token"
+        ) from None
+    return ToDoChangesResponse(
+        items=[todo for todo in changed if not todo.is_deleted],
+        deleted=[todo.id for todo in changed if todo.is_deleted],
+        next_token=next_token,
+        has_more=has_more,
+    )
 
 
 @todo_router_v1.get(
     "/{todo_id}",
     response_model=ToDoRead,
     summary="Get todo",
-    description="Fetch a todo item by its identifier.",
+    description=(
+        "Fetch a todo item by its identifier. Use `fields` to return only some "
+        "of its fields. Supports conditional requests with `If-None-Match`."
+    ),
+    responses=NOT_MODIFIED_RESPONSE,
 )
 async def get_todo(
     todo_id: int,
-    service: ToDoService = Depends(get_todo_service),
+    response: Response,
+    fields: str | None = FIELDS_QUERY,
+    archived: bool = ARCHIVED_QUERY,
+    if_none_match: str | None = Header(None),
+    service: ToDoService = Depends(get_todo_read_service),
 ) -> ToDoRead:
     """Return a single todo by identifier or raise a not found error."""
-    todo = await service.get(todo_id)
+    selected = _parse_fields(fields)
+    todo = await service.get(
+        todo_id,
+        columns=_columns(selected) if selected is not None else None,
+        archived=archived,
+    )
     if not todo:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="ToDo not found"
         )
+
+    etag = _todo_etag(todo, selected)
+    if not none_match(if_none_match, etag):
+        return _not_modified(etag)
+    if selected is not None:
+        item = sparse_model(ToDoRead, selected).model_validate(todo)
+        return Response(
+            item.model_dump_json(),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+    response.headers["ETag"] = etag
     return todo
 
 
@@ -71,19 +419,42 @@ async def get_todo(
     "/{todo_id}",
     response_model=ToDoRead,
     summary="Update todo",
-    description="Apply partial updates to a todo item.",
+    description=(
+        "Apply partial updates to a todo item. Send the ETag of the version "
+        "being edited in `If-Match` to reject the update with 412 if the item "
+        "was changed in the meantime."
+    ),
+    responses={412: {"description": "The todo was modified concurrently"}},
 )
 async def update_todo(
     todo_id: int,
     todo_in: ToDoUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
     service: ToDoService = Depends(get_todo_service),
 ) -> ToDoRead:
     """Update selected fields of a todo and return the modified entity."""
-    todo = await service.update(todo_id, todo_in)
+    expected = None
+    if if_match is not None and "*" not in split_etags(if_match):
+        versions = (parse_entity_etag(tag) for tag in split_etags(if_match))
+        expected = [v[1] for v in versions if v is not None and v[0] == todo_id]
+        if not expected:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="ToDo was modified",
+            )
+
+    todo = await service.update(todo_id, todo_in, expected_updated_at=expected)
     if not todo:
+        if expected is not None and await service.get(todo_id, archived=True):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="ToDo was modified",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="ToDo not found"
         )
+    response.headers["ETag"] = _todo_etag(todo)
     return todo
 
 
@@ -95,14 +466,16 @@ async def update_todo(
 )
 async def mark_todo_completed(
     todo_id: int,
+    response: Response,
     service: ToDoService = Depends(get_todo_service),
 ) -> ToDoRead:
     """Mark the todo as completed and return the updated instance."""
-    todo = await service.update(todo_id, {"is_completed": True})
+    todo = await service.complete(todo_id)
     if not todo:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="ToDo not found"
         )
+    response.headers["ETag"] = _todo_etag(todo)
     return todo
 
 
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.moduls.todo.api.v1.cache import todo_cache
+from src.moduls.todo.todo_repository import ToDoRepository
+from src.shared.cache.redis_client import close_redis
+from src.shared.celery_app import celery_app
+from src.shared.configs.get_settings import get_settings
+from src.shared.db.archive import archive_cold_rows
+from src.shared.db.engine import create_task_engine
+from src.shared.db.maintenance import purge_deleted_rows
+
+app_log = logging.getLogger("app_log")
+
+MaintenanceJob = Callable[..., Awaitable[int]]
+
+
+# Handlers of the outbox events of `ToDoRepository`; the task name is the
+# event topic. Side effects of todo writes (notifications, webhooks, search
+# indexing) belong here, off the request path. Events are delivered at least
+# once, so handlers must be idempotent; the task id (`outbox-<event id>`)
+# identifies duplicates.
+
+
+@celery_app.task(name="todo.created")
+def todo_created(payload: dict[str, Any]) -> None:
+    """Handle a created todo."""
+    app_log.info("todo %s created", payload["id"])
+
+
+@celery_app.task(name="todo.updated")
+def todo_updated(payload: dict[str, Any]) -> None:
+    """Handle an updated todo."""
+    app_log.info("todo %s updated", payload["id"])
+
+
+@celery_app.task(name="todo.deleted")
+def todo_deleted(payload: dict[str, Any]) -> None:
+    """Handle a deleted todo."""
+    app_log.info("todo %s deleted", payload["id"])
+
+
+async def _maintain(
+    job: MaintenanceJob, before: datetime, batch_size: int, pause: float, **options
+) -> int:
+    engine = create_task_engine()
+    try:
+        return await job(
+            async_sessionmaker(engine, expire_on_commit=False),
+            ToDoRepository,
+            before,
+            batch_size=batch_size,
+            pause=pause,
+            **options,
+        )
+    finally:
+        await engine.dispose()
+        await close_redis()
+
+
+@celery_app.task(name="todo.archive")
+def archive_todos() -> int:
+    """Move todos completed or deleted `ARCHIVE_AFTER_DAYS` ago to the archive."""
+    settings = get_settings()
+    before = datetime.now(UTC) - timedelta(days=settings.archive_after_days)
+    return asyncio.run(
+        _maintain(
+            archive_cold_rows,
+            before,
+            settings.archive_batch_size,
+            settings.archive_pause,
+            cache=todo_cache,
+        )
+    )
+
+
+@celery_app.task(name="todo.purge")
+def purge_todos() -> int:
+    """Permanently delete todos deleted more than `PURGE_AFTER_DAYS` ago."""
+    settings = get_settings()
+    before = datetime.now(UTC) - timedelta(days=settings.purge_after_days)
+    return asyncio.run(
+        _maintain(
+            purge_deleted_rows, before, settings.purge_batch_size, settings.purge_pause
+        )
+    )
@@ -2,6 +2,7 @@ import asyncio
 from datetime import datetime
 
 import pytest
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy import Boolean, Column, DateTime, Integer, String, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -11,6 +12,8 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import declarative_base
 
 from src.shared.base_repo import BaseRepository as ProjectBaseRepository
+from src.shared.cache.entity_cache import EntityCache  # noqa: E402
+from src.shared.db.archive import archive_table  # noqa: E402
 from src.shared.services.base_crud_service import BaseCRUDService  # noqa: E402
 
 Base = declarative_base()
@@ -25,6 +28,12 @@ class ToDo(Base):
     is_done = Column(Boolean, nullable=False, server_default=text("0"))
     is_deleted = Column(Boolean, nullable=False, server_default=text("0"), index=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+todos_archive = archive_table(ToDo.__table__)
 
 
 @pytest.fixture(scope="session")
@@ -56,6 +65,9 @@ async def session(engine):
 
 
 class ToDoRepository(ProjectBaseRepository[ToDo]):  # type: ignore[type-arg]
+    sortable_fields = ("created_at", "updated_at", "title")
+    search_fields = ("title",)
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, ToDo)
 
@@ -82,3 +94,93 @@ def ToDoRepositoryClass():
 @pytest.fixture()
 def ToDoServiceClass():
     return ToDoService
+
+
+@pytest.fixture()
+def archive_repo_class(ToDoRepositoryClass):
+    class ArchivedToDoRepository(ToDoRepositoryClass):
+        archive_table = todos_archive
+        archive_flags = ("is_deleted", "is_done")
+
+    return ArchivedToDoRepository
+
+
+@pytest.fixture()
+def archive_repo(archive_repo_class, session):
+    return archive_repo_class(session)
+
+
+class FakeRedis:
+    """
+    Minimal in-memory stand-in for `redis.asyncio.Redis` (no expiry).
+    """
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.published: list[tuple[str, str]] = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    async def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.calls: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self.redis, n)(*a, **kw) for n, a, kw in self.calls]
+
+
+@pytest.fixture()
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+
+@pytest.fixture()
+def cached_service(repo, fake_redis, ToDoReadSchema) -> ToDoService:
+    cache = EntityCache(
+        "todo:test", ToDoReadSchema, ttl=60, client_factory=lambda: fake_redis
+    )
+    return ToDoService(repo, cache)
+
+
+class ToDoRead(BaseModel):
+    id: int
+    title: str
+    is_done: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+@pytest.fixture()
+def ToDoReadSchema():
+    return ToDoRead
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.shared.cache.entity_cache import EntityCache
+from src.shared.db.archive import archive_cold_rows
+from src.shared.list_query import ListQuery
+
+
+def _later() -> datetime:
+    return datetime.utcnow() + timedelta(minutes=1)
+
+
+async def _archived_count(repo) -> int:
+    stmt = select(func.count()).select_from(repo.archive_table)
+    return (await repo.session.execute(stmt)).scalar_one()
+
+
+async def test_archive_moves_only_cold_records(archive_repo):
+    live = await archive_repo.create({"title": "live", "user_id": 1})
+    done = await archive_repo.create({"title": "done", "user_id": 1})
+    gone = await archive_repo.create({"title": "gone", "user_id": 1})
+    await archive_repo.set_flag(done.id, "is_done", True)
+    await archive_repo.delete(gone.id)
+
+    assert await archive_repo.archive(datetime.utcnow() - timedelta(days=1)) == []
+    assert sorted(await archive_repo.archive(_later())) == [done.id, gone.id]
+    assert await _archived_count(archive_repo) == 2
+    assert [t.id for t in await archive_repo.list()] == [live.id]
+
+
+async def test_reads_include_archive_only_on_request(archive_repo):
+    live = await archive_repo.create({"title": "live", "user_id": 1})
+    done = await archive_repo.create({"title": "done", "user_id": 1})
+    await archive_repo.set_flag(done.id, "is_done", True)
+    await archive_repo.archive(_later())
+
+    assert await archive_repo.get(done.id) is None
+    found = await archive_repo.get(done.id, archived=True)
+    assert (found.id, found.title, found.is_done) == (done.id, "done", True)
+    row = await archive_repo.get(done.id, columns=("title",), archived=True)
+    assert row.title == "done"
+
+    page, _ = await archive_repo.list_page(limit=10)
+    assert [t.id for t in page] == [live.id]
+    page, _ = await archive_repo.list_page(limit=10, query=ListQuery(archived=True))
+    assert [t.id for t in page] == [live.id, done.id]
+    assert len(await archive_repo.list(archived=True)) == 2
+
+
+async def test_changes_include_archived_tombstones(archive_repo):
+    todo = await archive_repo.create({"title": "a", "user_id": 1})
+    _, token, _ = await archive_repo.changes()
+    await archive_repo.delete(todo.id)
+    await archive_repo.archive(_later())
+
+    changed, _, _ = await archive_repo.changes(token)
+    assert [(t.id, t.is_deleted) for t in changed] == [(todo.id, True)]
+
+
+async def test_archive_cold_rows_works_in_batches(archive_repo_class, engine, repo):
+    for i in range(5):
+        todo = await repo.create({"title": f"t{i}", "user_id": 1})
+        await repo.delete(todo.id)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    moved = await archive_cold_rows(
+        sessions, archive_repo_class, _later(), batch_size=2, pause=0
+    )
+
+    assert moved == 5
+    assert await _archived_count(archive_repo_class(repo.session)) == 5
+
+
+async def test_writes_restore_archived_records(archive_repo):
+    todos = [
+        await archive_repo.create({"title": f"t{i}", "user_id": 1}) for i in range(4)
+    ]
+    for todo in todos:
+        await archive_repo.set_flag(todo.id, "is_done", True)
+    await archive_repo.archive(_later())
+
+    updated = await archive_repo.update(todos[0].id, {"title": "x"}, user_id=1)
+    assert (updated.id, updated.title) == (todos[0].id, "x")
+    reopened = await archive_repo.set_flag(todos[1].id, "is_done", False)
+    assert reopened.is_done is False
+    assert await archive_repo.delete(todos[2].id) is True
+    # Someone else's record stays archived.
+    assert await archive_repo.update(todos[3].id, {"title": "x"}, user_id=2) is None
+
+    assert await _archived_count(archive_repo) == 1
+    assert [t.id for t in await archive_repo.list()] == [todos[0].id, todos[1].id]
+
+
+async def test_bulk_writes_restore_archived_records(archive_repo):
+    todos = [
+        await archive_repo.create({"title": f"t{i}", "user_id": 1}) for i in range(3)
+    ]
+    for todo in todos:
+        await archive_repo.set_flag(todo.id, "is_done", True)
+    await archive_repo.archive(_later())
+
+    results = await archive_repo.bulk_update(
+        [(todos[0].id, {"title": "x"}), (999, {"title": "x"})]
+    )
+    assert [r.ok for r in results] == [True, False]
+    assert results[0].obj.title == "x"
+    assert [r.ok for r in await archive_repo.bulk_soft_delete([todos[1].id])] == [True]
+    updated = await archive_repo.update_rows({todos[2].id: {"is_done": False}})
+    assert updated[todos[2].id].is_done is False
+
+    assert await _archived_count(archive_repo) == 0
+    assert [t.id for t in await archive_repo.list()] == [todos[0].id, todos[2].id]
+
+
+async def test_conditional_update_keeps_a_stale_record_archived(archive_repo):
+    version = datetime(2026, 1, 1, 12, 0, 0)
+    todo = await archive_repo.create({"title": "a", "user_id": 1})
+    await archive_repo.update(todo.id, {"is_done": True, "updated_at": version})
+    await archive_repo.archive(_later())
+
+    stale = [version - timedelta(minutes=1)]
+    assert await archive_repo.update(todo.id, {"title": "x"}, None, stale) is None
+    assert await _archived_count(archive_repo) == 1
+
+    updated = await archive_repo.update(todo.id, {"title": "x"}, None, [version])
+    assert updated.title == "x"
+    assert await _archived_count(archive_repo) == 0
+
+
+async def test_writes_retry_a_record_restored_concurrently(archive_repo):
+    todos = [
+        await archive_repo.create({"title": f"t{i}", "user_id": 1}) for i in range(2)
+    ]
+    for todo in todos:
+        await archive_repo.set_flag(todo.id, "is_done", True)
+    await archive_repo.archive(_later())
+    restore = archive_repo._restore
+
+    async def restored_by_someone_else(*args):
+        await restore(*args)
+        return set()
+
+    archive_repo._restore = restored_by_someone_else
+
+    updated = await archive_repo.update(todos[0].id, {"title": "x"})
+    assert updated.title == "x"
+    results = await archive_repo.bulk_update([(todos[1].id, {"title": "y"})])
+    assert results[0].obj.title == "y"
+
+
+async def test_archive_cold_rows_invalidates_the_cache(
+    archive_repo_class, engine, repo, fake_redis, ToDoReadSchema
+):
+    todo = await repo.create({"title": "a", "user_id": 1})
+    await repo.set_flag(todo.id, "is_done", True)
+    cache = EntityCache(
+        "todo:test", ToDoReadSchema, ttl=60, client_factory=lambda: fake_redis
+    )
+    await cache.get_or_load(todo.id, lambda: repo.get(todo.id))
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    await archive_cold_rows(sessions, archive_repo_class, _later(), cache=cache)
+
+    assert cache.key(todo.id) not in fake_redis.data
+    assert f"{cache.key(todo.id)}:tombstone" in fake_redis.data
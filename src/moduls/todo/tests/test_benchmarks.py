@@ -0,0 +1,25 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import reset_schema, seed_todos
+from src.shared.db.base import Base
+from src.shared.db.models.todo_model import ToDo
+
+
+async def test_benchmark_schema_builds_on_sqlite():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        await reset_schema(engine)
+        await seed_todos(engine, 10)
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(
+                lambda sync: sync.dialect.get_table_names(sync)
+            )
+            count = (
+                await conn.execute(select(func.count()).select_from(ToDo))
+            ).scalar()
+    finally:
+        await engine.dispose()
+
+    assert set(Base.metadata.tables) <= set(tables)
+    assert count == 10
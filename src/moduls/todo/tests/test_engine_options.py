@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+
+from src.shared.db.engine import _limit_prepared_statements, _pgbouncer_connect_args
+
+
+def test_pgbouncer_disables_server_side_prepares_without_cache():
+    assert _pgbouncer_connect_args("postgresql+psycopg://h/db", 0) == {
+        "prepare_threshold": None
+    }
+    args = _pgbouncer_connect_args("postgresql+asyncpg://h/db", 0)
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    assert (
+        args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+    )
+
+
+def test_pgbouncer_keeps_driver_cache_when_enabled():
+    assert _pgbouncer_connect_args("postgresql+psycopg://h/db", 100) == {}
+    assert _pgbouncer_connect_args("postgresql+asyncpg://h/db", 100) == {
+        "statement_cache_size": 100,
+        "prepared_statement_cache_size": 100,
+    }
+
+
+def _connect_listeners(engine) -> list:
+    return list(engine.pool.dispatch.connect)
+
+
+def test_psycopg_cache_size_sets_prepared_max_on_connect():
+    engine = create_engine("sqlite://")
+    builtin = _connect_listeners(engine)
+    _limit_prepared_statements(engine, "postgresql+psycopg://h/db", 100)
+    (set_prepared_max,) = _connect_listeners(engine)[len(builtin) :]
+    raw = SimpleNamespace()
+    adapted = SimpleNamespace(driver_connection=SimpleNamespace())
+
+    set_prepared_max(raw, None)
+    set_prepared_max(adapted, None)
+
+    assert raw.prepared_max == 100
+    assert adapted.driver_connection.prepared_max == 100
+
+
+def test_prepared_max_is_left_alone_for_other_drivers_and_without_cache():
+    for url, size in (
+        ("postgresql+psycopg2://h/db", 100),
+        ("postgresql+psycopg://h/db", 0),
+    ):
+        engine = create_engine("sqlite://")
+        builtin = _connect_listeners(engine)
+        _limit_prepared_statements(engine, url, size)
+        assert _connect_listeners(engine) == builtin
+    assert _pgbouncer_connect_args("postgresql+psycopg2://h/db", 0) == {}
@@ -0,0 +1,53 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.shared.cache.entity_cache import EntityCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_is_served_from_cache_after_first_load(
+    cached_service, repo, fake_redis, monkeypatch
+):
+    created = await cached_service.create({"title": "hot"}, user_id=1)
+
+    first = await cached_service.get(created.id)
+    assert first.title == "hot"
+    assert fake_redis.data[f"todo:test:{created.id}"]
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("repository must not be hit on a cache hit")
+
+    monkeypatch.setattr(repo, "get", fail)
+    second = await cached_service.get(created.id)
+    assert second == first
+
+
+async def test_writes_invalidate_cached_entry(cached_service, fake_redis):
+    created = await cached_service.create({"title": "old"}, user_id=1)
+    await cached_service.get(created.id)
+
+    await cached_service.update(created.id, {"title": "new"})
+    assert f"todo:test:{created.id}" not in fake_redis.data
+
+    # the tombstone keeps a concurrent stale reader from re-populating the key
+    assert (await cached_service.get(created.id)).title == "new"
+    assert f"todo:test:{created.id}" not in fake_redis.data
+
+    await cached_service.delete(created.id)
+    assert await cached_service.get(created.id) is None
+
+
+async def test_falls_back_to_database_when_redis_is_down(
+    repo, ToDoServiceClass, ToDoReadSchema
+):
+    class DownRedis:
+        async def get(self, key):
+            raise RedisConnectionError("down")
+
+    cache = EntityCache("todo:test", ToDoReadSchema, ttl=60, client_factory=DownRedis)
+    service = ToDoServiceClass(repo, cache)
+    created = await service.create({"title": "still works"}, user_id=1)
+
+    assert (await service.get(created.id)).title == "still works"
+    assert (await service.get(created.id)).title == "still works"
@@ -0,0 +1,45 @@
+from datetime import UTC, datetime
+
+from src.shared.etag import (
+    collection_etag,
+    entity_etag,
+    none_match,
+    parse_entity_etag,
+)
+
+
+def test_entity_etag_round_trips_id_and_version():
+    updated_at = datetime(2025, 10, 19, 18, 3, 50, 502140, tzinfo=UTC)
+
+    etag = entity_etag(42, updated_at)
+
+    assert parse_entity_etag(etag) == (42, updated_at)
+    assert parse_entity_etag('W/"42-1"') is None
+    assert parse_entity_etag('"garbage"') is None
+
+
+def test_none_match_uses_weak_comparison_and_wildcard():
+    etag = entity_etag(1, datetime(2025, 1, 1, tzinfo=UTC))
+
+    assert none_match(None, etag) is True
+    assert none_match(f'"other", W/{etag}', etag) is False
+    assert none_match("*", etag) is False
+    assert none_match('"other"', etag) is True
+
+
+def test_collection_etag_depends_on_members_and_cursor():
+    a = collection_etag(['"1-a"', '"2-b"'], None)
+
+    assert a == collection_etag(['"1-a"', '"2-b"'], None)
+    assert a != collection_etag(['"1-a"', '"2-c"'], None)
+    assert a != collection_etag(['"1-a"', '"2-b"'], "cursor")
+
+
+def test_entity_etag_variant_changes_tag_but_keeps_version():
+    updated_at = datetime(2025, 10, 19, 18, 3, 50, tzinfo=UTC)
+
+    sparse = entity_etag(7, updated_at, variant="id,title")
+
+    assert sparse != entity_etag(7, updated_at)
+    assert sparse != entity_etag(7, updated_at, variant="title")
+    assert parse_entity_etag(sparse) == (7, updated_at)
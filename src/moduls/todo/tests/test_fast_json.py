@@ -0,0 +1,28 @@
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from pydantic import BaseModel
+
+from src.shared import fast_json
+
+
+class Payload(BaseModel):
+    title: str
+    note: str | None
+    done: bool
+    at: datetime
+
+
+@pytest.mark.parametrize(
+    "at",
+    [
+        datetime(2025, 1, 1, tzinfo=UTC),
+        datetime(2025, 1, 1, 1, 2, 3, 400000, tzinfo=UTC),
+        datetime(2025, 1, 1, 1, 2, 3, 4),
+        datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=3))),
+    ],
+)
+def test_dumps_matches_pydantic_wire_format(at):
+    data = {"title": "ünïcode", "note": None, "done": True, "at": at}
+
+    assert fast_json.dumps(data) == Payload(**data).model_dump_json().encode()
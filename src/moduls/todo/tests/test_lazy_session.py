@@ -0,0 +1,32 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.db.lazy_session import LazyAsyncSession
+
+
+async def test_session_is_created_on_first_use_only(engine):
+    created = []
+
+    def factory():
+        created.append(AsyncSession(engine))
+        return created[-1]
+
+    unused = LazyAsyncSession(factory)
+    assert unused.in_transaction() is False
+    await unused.close()
+    assert created == []
+
+    lazy = LazyAsyncSession(factory)
+    assert (await lazy.execute(text("SELECT 1"))).scalar() == 1
+    assert lazy.started and len(created) == 1
+    await lazy.close()
+
+
+async def test_reads_release_the_connection(service, session):
+    todo = await service.create({"title": "r"}, user_id=1)
+
+    assert not session.in_transaction()
+    await service.get(todo.id, user_id=1)
+    await service.list_page(limit=1)
+    await service.changes()
+    assert not session.in_transaction()
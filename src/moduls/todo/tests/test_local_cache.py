@@ -0,0 +1,72 @@
+import pytest
+
+from src.shared.cache.entity_cache import EntityCache, get_cache_stats
+from src.shared.cache.local_cache import MISSING, LocalTTLCache
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def test_local_cache_evicts_lru_and_expires_entries():
+    clock = FakeClock()
+    cache = LocalTTLCache(maxsize=2, ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b" is the least recently used one
+
+    assert cache.get("b") is MISSING
+    clock.now = 11
+    assert cache.get("a") is MISSING
+    assert cache.stats() == {
+        "size": 1,
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "expirations": 1,
+    }
+
+
+async def test_local_tier_serves_repeated_reads_and_publishes_invalidations(
+    repo, fake_redis, ToDoServiceClass, ToDoReadSchema
+):
+    local = LocalTTLCache(maxsize=100, ttl=60)
+    cache = EntityCache(
+        "todo:test",
+        ToDoReadSchema,
+        ttl=60,
+        client_factory=lambda: fake_redis,
+        local=local,
+    )
+    service = ToDoServiceClass(repo, cache)
+    created = await service.create({"title": "hot"}, user_id=1)
+
+    await service.get(created.id)
+    fake_redis.data.clear()  # a local hit must not need Redis
+    assert (await service.get(created.id)).title == "hot"
+    assert local.hits == 1
+
+    await service.update(created.id, {"title": "new"})
+    assert len(local) == 0
+    assert fake_redis.published == [("todo:test:invalidate", str(created.id))]
+
+
+async def test_cache_stats_cover_every_local_tier(ToDoReadSchema):
+    cache = EntityCache(
+        "todo:stats", ToDoReadSchema, ttl=60, local=LocalTTLCache(10, 60)
+    )
+    EntityCache("todo:no-local", ToDoReadSchema, ttl=60)
+    cache.local.get("todo:stats:1")
+
+    stats = get_cache_stats()
+
+    assert stats["todo:stats"]["misses"] == 1
+    assert "todo:no-local" not in stats
@@ -0,0 +1,71 @@
+import logging
+import queue
+
+import httpx
+from fastapi import FastAPI
+
+from src.shared.configs.log_conf import (
+    CorrelationIdFilter,
+    DroppingQueueHandler,
+    InfoSamplingFilter,
+)
+from src.shared.request_context import CorrelationIdMiddleware, get_request_id
+
+
+def _record(level: int = logging.INFO, request_id: str | None = None):
+    record = logging.LogRecord("app_log", level, __file__, 0, "msg", (), None)
+    record.request_id = request_id
+    return record
+
+
+def test_full_queue_drops_records_and_reports_them_later():
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+
+    handler.handle(_record())
+    handler.handle(_record())
+    handler.handle(_record())
+    assert handler.dropped == 2
+
+    log_queue.get_nowait()
+    log_queue.maxsize = 2
+    handler.handle(_record())
+    notice = log_queue.get_nowait()
+    assert notice.levelno == logging.WARNING
+    assert notice.getMessage() == "2 log records dropped: logging queue full"
+    assert log_queue.get_nowait().getMessage() == "msg"
+    assert handler.dropped == 0
+
+
+def test_sampling_keeps_whole_requests_and_all_warnings():
+    sampler = InfoSamplingFilter(0.5)
+    ids = [f"req-{i}" for i in range(200)]
+    kept = {i for i in ids if sampler.filter(_record(request_id=i))}
+
+    assert 0 < len(kept) < len(ids)
+    assert all(sampler.filter(_record(request_id=i)) for i in kept)
+    assert all(sampler.filter(_record(logging.WARNING, request_id=i)) for i in ids)
+    assert not InfoSamplingFilter(0).filter(_record(request_id="req-1"))
+
+
+async def test_requests_get_a_correlation_id():
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware)
+    seen = []
+
+    @app.get("/ping")
+    async def ping():
+        record = _record()
+        CorrelationIdFilter().filter(record)
+        seen.append(record.request_id)
+        return {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        passed = await client.get("/ping", headers={"X-Request-ID": "abc-123"})
+        generated = await client.get("/ping", headers={"X-Request-ID": "bad id\n"})
+
+    assert passed.headers["x-request-id"] == "abc-123"
+    assert generated.headers["x-request-id"] not in ("abc-123", "bad id\n")
+    assert seen == ["abc-123", generated.headers["x-request-id"]]
+    assert get_request_id() is None
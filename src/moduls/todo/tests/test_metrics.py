@@ -0,0 +1,55 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.shared import metrics
+
+
+def _requests(route: str, status: str) -> float:
+    value = metrics.prometheus_client.REGISTRY.get_sample_value(
+        "http_requests_total",
+        {"method": "GET", "route": route, "status": status},
+    )
+    return value or 0.0
+
+
+async def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    before = _requests("/items/{item_id}", "200"), _requests("unmatched", "404")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+
+    assert _requests("/items/{item_id}", "200") == before[0] + 2
+    assert _requests("unmatched", "404") == before[1] + 1
+
+
+def test_statements_are_grouped_by_operation():
+    assert metrics._operation("  select 1") == "SELECT"
+    assert metrics._operation("UPDATE todos SET x = 1") == "UPDATE"
+    assert metrics._operation("COMMIT") == "OTHER"
+    assert metrics._operation("") == "OTHER"
+
+
+async def test_failed_statements_leave_nothing_on_the_connection():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    metrics.instrument_engine(engine, "test")
+
+    async with engine.connect() as conn:
+        info = dict(conn.info)
+        with pytest.raises(DBAPIError):
+            await conn.execute(text("SELECT * FROM missing"))
+        assert dict(conn.info) == info
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+    await engine.dispose()
@@ -0,0 +1,218 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from src.shared.db import online_migrations
+
+
+class FakeResult:
+    def __init__(self, value=None, rowcount=0):
+        self.value = value
+        self.rowcount = rowcount
+
+    def scalar(self):
+        return self.value
+
+    def one(self):
+        return self.value
+
+
+class FakeOp:
+    """
+    Records the operations and SQL of the helpers, in order.
+    """
+
+    def __init__(self, dialect, results=None, rowcount=0):
+        self.calls: list = []
+        self.results = results or {}
+        self.rowcount = rowcount
+        self.bind = SimpleNamespace(
+            dialect=SimpleNamespace(name=dialect), execute=self._execute
+        )
+
+    def _execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.calls.append(("sql", sql, params))
+        for prefix, value in self.results.items():
+            if sql.startswith(prefix):
+                return FakeResult(value)
+        return FakeResult(rowcount=self.rowcount)
+
+    def get_bind(self):
+        return self.bind
+
+    def get_context(self):
+        return SimpleNamespace(autocommit_block=self._autocommit_block)
+
+    @contextmanager
+    def _autocommit_block(self):
+        self.calls.append(("autocommit",))
+        yield
+        self.calls.append(("commit",))
+
+    @contextmanager
+    def batch_alter_table(self, table):
+        yield SimpleNamespace(
+            alter_column=lambda *a, **kw: self.calls.append(
+                ("alter_column", table, *a, kw)
+            )
+        )
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.calls.append((name, *a, kw))
+
+
+@pytest.fixture()
+def fake_op(monkeypatch):
+    def install(*args, **kwargs):
+        op = FakeOp(*args, **kwargs)
+        monkeypatch.setattr(online_migrations, "_op", lambda: op)
+        return op
+
+    return install
+
+
+def _sql(op) -> list[str]:
+    return [call[1] for call in op.calls if call[0] in ("sql", "execute")]
+
+
+LIFT = ["SHOW lock_timeout", "SET lock_timeout = 0"]
+RESTORE = ["SET lock_timeout = '5s'"]
+
+
+def test_create_index_falls_back_to_plain_ddl(fake_op):
+    op = fake_op("sqlite")
+
+    online_migrations.create_index_concurrently("ix", "todos", ["a"], where="b")
+
+    (call,) = op.calls
+    assert call[:4] == ("create_index", "ix", "todos", ["a"])
+    assert str(call[4]["sqlite_where"]) == "b"
+
+
+def test_create_index_rebuilds_an_invalid_index_without_lock_timeout(fake_op):
+    op = fake_op(
+        "postgresql",
+        {"SHOW lock_timeout": "5s", "SELECT i.indisvalid": False},
+    )
+
+    online_migrations.create_index_concurrently("ix", "todos", ["a"], unique=True)
+
+    assert op.calls[0] == ("autocommit",)
+    assert op.calls[-1] == ("commit",)
+    assert [c[0] for c in op.calls[1:-1]] == [
+        "sql",
+        "sql",
+        "sql",
+        "drop_index",
+        "create_index",
+        "sql",
+    ]
+    assert _sql(op)[:2] == LIFT and _sql(op)[-1:] == RESTORE
+    assert op.calls[4] == (
+        "drop_index",
+        "ix",
+        {"table_name": "todos", "postgresql_concurrently": True},
+    )
+    assert op.calls[5] == (
+        "create_index",
+        "ix",
+        "todos",
+        ["a"],
+        {"unique": True, "postgresql_concurrently": True},
+    )
+
+
+def test_create_index_skips_a_valid_index(fake_op):
+    op = fake_op("postgresql", {"SHOW lock_timeout": "5s", "SELECT i.indisvalid": True})
+
+    online_migrations.create_index_concurrently("ix", "todos", ["a"])
+
+    assert not [c for c in op.calls if c[0] in ("create_index", "drop_index")]
+    assert _sql(op)[-1:] == RESTORE
+
+
+def test_create_index_on_an_expression(fake_op):
+    op = fake_op("postgresql", {"SHOW lock_timeout": "5s", "SELECT i.indisvalid": None})
+    document = text("to_tsvector('simple'::regconfig, title)")
+
+    online_migrations.create_index_concurrently("ix", "todos", [document], using="gin")
+
+    assert [c for c in op.calls if c[0] == "create_index"] == [
+        (
+            "create_index",
+            "ix",
+            "todos",
+            [document],
+            {
+                "unique": False,
+                "postgresql_concurrently": True,
+                "postgresql_using": "gin",
+            },
+        )
+    ]
+
+
+def test_drop_index_concurrently(fake_op):
+    op = fake_op("sqlite")
+    online_migrations.drop_index_concurrently("ix", "todos")
+    assert op.calls == [
+        ("drop_index", "ix", {"table_name": "todos", "if_exists": True})
+    ]
+
+    op = fake_op("postgresql", {"SHOW lock_timeout": "5s"})
+    online_migrations.drop_index_concurrently("ix", "todos")
+    assert op.calls[3] == (
+        "drop_index",
+        "ix",
+        {"table_name": "todos", "postgresql_concurrently": True, "if_exists": True},
+    )
+    assert _sql(op) == LIFT + RESTORE
+
+
+def test_backfill_updates_key_ranges_in_batches(fake_op):
+    op = fake_op("postgresql", {"SELECT min(id)": (1, 25)}, rowcount=4)
+
+    updated = online_migrations.backfill(
+        "todos", "priority = 0", where="priority IS NULL", batch_size=10, pause=0
+    )
+
+    assert updated == 12
+    updates = [c for c in op.calls if c[0] == "sql" and c[1].startswith("UPDATE")]
+    assert updates[0][1] == (
+        "UPDATE todos SET priority = 0 WHERE id >= :lo AND id < :hi "
+        "AND (priority IS NULL)"
+    )
+    assert [c[2] for c in updates] == [
+        {"lo": 1, "hi": 11},
+        {"lo": 11, "hi": 21},
+        {"lo": 21, "hi": 31},
+    ]
+
+
+def test_backfill_of_an_empty_table(fake_op):
+    op = fake_op("sqlite", {"SELECT min(id)": (None, None)})
+
+    assert online_migrations.backfill("todos", "priority = 0") == 0
+    assert len(_sql(op)) == 1
+
+
+def test_set_not_null(fake_op):
+    op = fake_op("sqlite")
+    online_migrations.set_not_null("todos", "priority")
+    assert op.calls == [("alter_column", "todos", "priority", {"nullable": False})]
+
+    op = fake_op("postgresql", {"SHOW lock_timeout": "5s"})
+    online_migrations.set_not_null("todos", "priority")
+    check = "todos_priority_not_null"
+    assert _sql(op) == [
+        f"ALTER TABLE todos DROP CONSTRAINT IF EXISTS {check}, "
+        f"ADD CONSTRAINT {check} CHECK (priority IS NOT NULL) NOT VALID",
+        *LIFT,
+        f"ALTER TABLE todos VALIDATE CONSTRAINT {check}",
+        *RESTORE,
+        f"ALTER TABLE todos DROP CONSTRAINT {check}",
+    ]
+    assert ("alter_column", "todos", "priority", {"nullable": False}) in op.calls
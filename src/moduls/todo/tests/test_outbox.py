@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.shared.celery_app import celery_app
+from src.shared.db.models.outbox_model import OutboxEvent
+from src.shared.outbox import OutboxRelay, publish_to_celery
+
+
+@pytest.fixture()
+async def outbox_repo(engine, session, ToDoRepositoryClass):
+    async with engine.begin() as conn:
+        await conn.run_sync(OutboxEvent.__table__.create)
+
+    class OutboxToDoRepository(ToDoRepositoryClass):
+        outbox_topic = "todo"
+
+    return OutboxToDoRepository(session)
+
+
+async def _events(session) -> list[OutboxEvent]:
+    return list(
+        (await session.scalars(select(OutboxEvent).order_by(OutboxEvent.id))).all()
+    )
+
+
+async def test_writes_record_outbox_events(outbox_repo, session):
+    todo = await outbox_repo.create({"title": "a", "user_id": 1})
+    await outbox_repo.update(todo.id, {"title": "b"})
+    await outbox_repo.update(999, {"title": "missing"})
+    await outbox_repo.delete(todo.id)
+
+    events = await _events(session)
+    assert [e.topic for e in events] == ["todo.created", "todo.updated", "todo.deleted"]
+    assert {e.aggregate_id for e in events} == {todo.id}
+    assert events[1].payload["title"] == "b"
+    assert events[2].payload == {"id": todo.id}
+
+
+async def test_repository_without_topic_records_nothing(repo, engine, session):
+    async with engine.begin() as conn:
+        await conn.run_sync(OutboxEvent.__table__.create)
+    await repo.create({"title": "a", "user_id": 1})
+    assert await _events(session) == []
+
+
+async def test_relay_publishes_in_order_and_deletes(outbox_repo, engine, session):
+    for title in ("a", "b", "c"):
+        await outbox_repo.create({"title": title, "user_id": 1})
+    published = []
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    relay = OutboxRelay(sessions, publish=published.extend, batch_size=2)
+
+    assert await relay.relay_batch() == 2
+    assert await relay.relay_batch() == 1
+    assert await relay.relay_batch() == 0
+    assert [e.payload["title"] for e in published] == ["a", "b", "c"]
+    assert await _events(session) == []
+
+
+async def test_failed_publish_keeps_events(outbox_repo, engine, session):
+    await outbox_repo.create({"title": "a", "user_id": 1})
+
+    def fail(events):
+        raise ConnectionError("broker down")
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    with pytest.raises(ConnectionError):
+        await OutboxRelay(sessions, publish=fail).relay_batch()
+    assert len(await _events(session)) == 1
+
+
+def test_events_become_celery_tasks_named_by_topic():
+    assert celery_app.conf.broker_url.startswith("memory://")
+    event = OutboxEvent(id=7, topic="todo.created", aggregate_id=1, payload={"id": 1})
+    publish_to_celery([event])
+
+    with celery_app.connection_for_read() as conn:
+        message = conn.SimpleQueue("celery", no_ack=True).get(timeout=1)
+    assert message.headers["task"] == "todo.created"
+    assert message.headers["id"] == "outbox-7"
+
+    # What a worker does with the message: run the task of that name.
+    celery_app.loader.import_default_modules()
+    args, kwargs, _ = message.payload
+    assert args == [{"id": 1}]
+    celery_app.tasks[message.headers["task"]](*args, **kwargs)
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.shared import metrics
+from src.shared.db.maintenance import purge_deleted_rows
+
+
+def _later() -> datetime:
+    return datetime.utcnow() + timedelta(minutes=1)
+
+
+async def _count(repo, table) -> int:
+    stmt = select(func.count()).select_from(table)
+    return (await repo.session.execute(stmt)).scalar_one()
+
+
+def _purged_rows(table: str) -> float:
+    value = metrics.prometheus_client.REGISTRY.get_sample_value(
+        "maintenance_rows_total", {"job": "purge", "table": table}
+    )
+    return value or 0.0
+
+
+async def test_purge_deletes_old_soft_deleted_records_in_batches(repo):
+    kept = await repo.create({"title": "kept", "user_id": 1})
+    for i in range(3):
+        todo = await repo.create({"title": f"t{i}", "user_id": 1})
+        await repo.delete(todo.id)
+    table = repo.model.__table__
+
+    assert await repo.purge(datetime.utcnow() - timedelta(days=1)) == {"todos": 0}
+    assert await repo.purge(_later(), batch_size=2) == {"todos": 2}
+    assert await repo.purge(_later(), batch_size=2) == {"todos": 1}
+    assert await _count(repo, table) == 1
+    assert (await repo.get(kept.id)).title == "kept"
+
+
+async def test_purge_spends_the_rest_of_the_batch_on_the_archive(archive_repo):
+    for i in range(3):
+        todo = await archive_repo.create({"title": f"t{i}", "user_id": 1})
+        await archive_repo.delete(todo.id)
+    await archive_repo.archive(_later(), batch_size=2)
+    todo = await archive_repo.create({"title": "t3", "user_id": 1})
+    await archive_repo.delete(todo.id)
+
+    purged = await archive_repo.purge(_later(), batch_size=3)
+    assert purged == {"todos": 2, "todos_archive": 1}
+    assert await _count(archive_repo, archive_repo.model.__table__) == 0
+    assert await _count(archive_repo, archive_repo.archive_table) == 1
+    purged = await archive_repo.purge(_later(), batch_size=3)
+    assert purged == {"todos": 0, "todos_archive": 1}
+    assert await _count(archive_repo, archive_repo.archive_table) == 0
+
+
+async def test_purge_deleted_rows_covers_the_archive(archive_repo, engine):
+    for i in range(3):
+        todo = await archive_repo.create({"title": f"t{i}", "user_id": 1})
+        await archive_repo.delete(todo.id)
+    # One deleted record stays in the live table, two move to the archive.
+    await archive_repo.archive(_later(), batch_size=2)
+    live = await archive_repo.create({"title": "live", "user_id": 1})
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    before = _purged_rows("todos"), _purged_rows("todos_archive")
+
+    purged = await purge_deleted_rows(
+        sessions, type(archive_repo), _later(), batch_size=2, pause=0
+    )
+
+    assert purged == 3
+    assert _purged_rows("todos") == before[0] + 1
+    assert _purged_rows("todos_archive") == before[1] + 2
+    assert await _count(archive_repo, archive_repo.archive_table) == 0
+    assert await _count(archive_repo, archive_repo.model.__table__) == 1
+    assert [t.id for t in await archive_repo.list(archived=True)] == [live.id]
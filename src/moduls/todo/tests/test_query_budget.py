@@ -0,0 +1,86 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.shared.db.profiling import QueryBudgetMiddleware, profile_engine
+
+
+def _app(engine, queries: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, budget=2, repeat_threshold=3)
+
+    @app.get("/items")
+    async def items():
+        async with engine.connect() as conn:
+            for _ in range(queries):
+                await conn.execute(text("SELECT 1"))
+        return []
+
+    return app
+
+
+async def _get(app: FastAPI) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        return await client.get("/items")
+
+
+async def test_server_timing_reports_statements_of_the_request(caplog):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    profile_engine(engine, slow_query_ms=10_000)
+
+    with caplog.at_level(logging.WARNING, logger="app_log"):
+        response = await _get(_app(engine, queries=2))
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="2 queries"' in timing
+    assert ", app;dur=" in timing
+    assert not caplog.records
+    await engine.dispose()
+
+
+async def test_requests_over_budget_and_repeated_statements_are_logged(caplog):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    profile_engine(engine, slow_query_ms=10_000)
+
+    with caplog.at_level(logging.WARNING, logger="app_log"):
+        await _get(_app(engine, queries=3))
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(
+        "Query budget exceeded: GET /items ran 3 statements" in m for m in messages
+    )
+    assert any("Possible N+1: GET /items" in m for m in messages)
+    await engine.dispose()
+
+
+async def test_slow_selects_are_logged_with_their_plan(caplog):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    profile_engine(engine, slow_query_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger="app_log"):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    (record,) = caplog.records
+    assert "Slow query" in record.getMessage()
+    assert "SCAN CONSTANT ROW" in record.getMessage()
+    await engine.dispose()
+
+
+async def test_failed_statements_leave_nothing_on_the_connection():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    profile_engine(engine, slow_query_ms=10_000)
+
+    async with engine.connect() as conn:
+        info = dict(conn.info)
+        with pytest.raises(DBAPIError):
+            await conn.execute(text("SELECT * FROM missing"))
+        assert dict(conn.info) == info
+    await engine.dispose()
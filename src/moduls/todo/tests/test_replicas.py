@@ -0,0 +1,47 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from fastapi import Request, Response
+from sqlalchemy.pool import QueuePool
+
+from src.shared.db.replicas import (
+    PRIMARY_COOKIE,
+    ReplicaSelector,
+    stick_to_primary,
+    wants_primary,
+)
+
+
+def _request(cookie: str | None = None) -> Request:
+    headers = [(b"cookie", f"{PRIMARY_COOKIE}={cookie}".encode())] if cookie else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_round_robin_cycles_through_replicas():
+    engines = ["r1", "r2", "r3"]
+    selector = ReplicaSelector(engines)  # type: ignore[arg-type]
+
+    assert [selector.choose() for _ in range(4)] == ["r1", "r2", "r3", "r1"]
+    assert ReplicaSelector([]).choose() is None
+
+
+def test_least_connections_picks_idlest_pool():
+    busy = SimpleNamespace(pool=QueuePool(MagicMock))
+    idle = SimpleNamespace(pool=QueuePool(MagicMock))
+    checked_out = busy.pool.connect()
+    selector = ReplicaSelector([busy, idle], strategy="least_connections")  # type: ignore[list-item]
+
+    assert [selector.choose() for _ in range(2)] == [idle, idle]
+    checked_out.close()
+
+
+def test_sticky_cookie_keeps_reads_on_primary():
+    response = Response()
+    stick_to_primary(response)
+    value = response.headers["set-cookie"].split(";")[0].split("=")[1]
+
+    assert wants_primary(_request(value)) is True
+    assert wants_primary(_request(f"{time.time() - 1}")) is False
+    assert wants_primary(_request("garbage")) is False
+    assert wants_primary(_request()) is False
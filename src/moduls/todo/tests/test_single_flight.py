@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.cache.single_flight import SingleFlight
+from src.shared.db.lazy_session import LazyAsyncSession
+
+
+async def test_concurrent_identical_calls_share_one_load():
+    flights = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    tasks = [asyncio.create_task(flights.do("g", "k", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flights.in_flight() == 1
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [1] * 5
+    assert calls == 1
+    assert flights.in_flight() == 0
+
+
+async def test_forget_starts_a_fresh_call_for_new_callers():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    results = iter(["stale", "fresh"])
+
+    async def loader():
+        value = next(results)
+        await release.wait()
+        return value
+
+    before = asyncio.create_task(flights.do("g", "k", loader))
+    await asyncio.sleep(0)
+    flights.forget("g")
+    after = asyncio.create_task(flights.do("g", "k", loader))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await before == "stale"
+    assert await after == "fresh"
+
+
+async def test_errors_are_shared_and_leader_cancellation_is_not():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    tasks = [asyncio.create_task(flights.do("g", "e", failing)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    for task in tasks:
+        with pytest.raises(RuntimeError):
+            await task
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "own"
+
+    leader = asyncio.create_task(flights.do("g", "c", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("g", "c", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "own"
+
+
+async def test_service_coalesces_reads_and_forgets_them_on_write(repo, service):
+    todo = await service.create({"title": "hot"}, user_id=1)
+    service.flights = SingleFlight()
+    calls = 0
+    original_get = repo.get
+
+    async def counting_get(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return await original_get(*args, **kwargs)
+
+    repo.get = counting_get
+    results = await asyncio.gather(*(service.get(todo.id) for _ in range(5)))
+
+    assert calls == 1
+    assert {r.title for r in results} == {"hot"}
+
+    reader = asyncio.create_task(service.get(todo.id))
+    await asyncio.sleep(0)
+    await service.update(todo.id, {"title": "cold"})
+    assert (await service.get(todo.id)).title == "cold"
+    await reader
+    assert calls == 3
+
+
+async def test_primary_reads_do_not_join_replica_reads(
+    engine, service, ToDoRepositoryClass, ToDoServiceClass
+):
+    todo = await service.create({"title": "fresh"}, user_id=1)
+    flights = SingleFlight()
+    primary = ToDoServiceClass(service.repo, flights=flights)
+    replica = ToDoServiceClass(
+        ToDoRepositoryClass(LazyAsyncSession(lambda: AsyncSession(engine), True)),
+        flights=flights,
+    )
+    calls = []
+
+    def counting(repo, name):
+        original_get = repo.get
+
+        async def get(*args, **kwargs):
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return await original_get(*args, **kwargs)
+
+        return get
+
+    primary.repo.get = counting(primary.repo, "primary")
+    replica.repo.get = counting(replica.repo, "replica")
+    await asyncio.gather(
+        replica.get(todo.id), replica.get(todo.id), primary.get(todo.id)
+    )
+    await replica.repo.session.close()
+
+    assert sorted(calls) == ["primary", "replica"]
@@ -0,0 +1,24 @@
+import pytest
+
+from src.moduls.todo.api.v1.schemas import ToDoRead
+from src.shared.sparse_fields import InvalidFieldsError, parse_fields, sparse_model
+
+
+def test_parse_fields_returns_schema_order_without_duplicates():
+    assert parse_fields(None, ToDoRead) is None
+    assert parse_fields(" title ,id,title", ToDoRead) == ("title", "id")
+
+
+@pytest.mark.parametrize("raw", ["", " , ", "id,secret"])
+def test_parse_fields_rejects_empty_and_unknown(raw):
+    with pytest.raises(InvalidFieldsError):
+        parse_fields(raw, ToDoRead)
+
+
+def test_sparse_model_keeps_only_requested_fields():
+    model = sparse_model(ToDoRead, ("id", "title"))
+
+    assert model is sparse_model(ToDoRead, ("id", "title"))
+    assert set(model.model_fields) == {"id", "title"}
+    item = model.model_validate({"id": 1, "title": "a", "description": "ignored"})
+    assert item.model_dump() == {"id": 1, "title": "a"}
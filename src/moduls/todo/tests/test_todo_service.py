@@ -1,6 +1,11 @@
+from datetime import datetime
+
 import pytest
 from sqlalchemy import select
 
+from src.shared.list_query import Filter, ListQuery
+from src.shared.pagination import InvalidCursorError
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -67,3 +72,167 @@ async def test_delete_marks_is_deleted_true(service, repo, session):
     items = await service.list()
     ids = {x.id for x in items}
     assert r.id not in ids
+
+
+async def test_list_page_walks_all_records_with_cursor(service):
+    created = [await service.create({"title": f"t{i}"}, user_id=1) for i in range(5)]
+    deleted = created.pop(2)
+    await service.delete(deleted.id, user_id=1)
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = await service.list_page(limit=2, cursor=cursor)
+        seen.extend(x.id for x in items)
+        if cursor is None:
+            break
+
+    assert seen == [x.id for x in created]
+
+
+async def test_list_page_rejects_malformed_cursor(service):
+    with pytest.raises(InvalidCursorError):
+        await service.list_page(limit=2, cursor="not-a-cursor")
+
+
+async def test_stream_yields_batches_and_releases_transaction(service, session):
+    for i in range(5):
+        await service.create({"title": f"s{i}"}, user_id=1)
+    await session.commit()
+
+    batches = [batch async for batch in service.stream(batch_size=2)]
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [x.title for b in batches for x in b] == [f"s{i}" for i in range(5)]
+    assert not session.in_transaction()
+
+
+async def test_bulk_create_chunks_and_keeps_input_order(repo):
+    results = await repo.bulk_create(
+        [{"title": f"b{i}", "user_id": 1} for i in range(5)], chunk_size=2
+    )
+
+    assert all(r.ok for r in results)
+    assert [r.index for r in results] == list(range(5))
+    assert [r.obj.title for r in results] == [f"b{i}" for i in range(5)]
+
+
+async def test_bulk_update_and_delete_report_missing_items(service):
+    a = await service.create({"title": "a"}, user_id=1)
+    b = await service.create({"title": "b"}, user_id=1)
+
+    updated = await service.bulk_update(
+        [(a.id, {"is_done": True}), (999, {"is_done": True}), (b.id, {"title": "bb"})]
+    )
+    assert [r.ok for r in updated] == [True, False, True]
+    assert updated[0].obj.is_done is True
+    assert updated[2].obj.title == "bb"
+    assert updated[1].error == "Not found"
+
+    deleted = await service.bulk_delete([a.id, 999])
+    assert [r.ok for r in deleted] == [True, False]
+    assert {x.id for x in await service.list()} == {b.id}
+
+
+async def test_update_respects_ownership_and_soft_delete(service):
+    r = await service.create({"title": "Mine"}, user_id=1)
+
+    assert await service.update(r.id, {"title": "Theirs"}, user_id=2) is None
+
+    await service.delete(r.id, user_id=1)
+    assert await service.update(r.id, {"title": "Gone"}, user_id=1) is None
+
+
+async def test_set_flag_is_idempotent(repo, service):
+    r = await service.create({"title": "Flag"}, user_id=1)
+
+    first = await repo.set_flag(r.id, "is_done", True)
+    stamp = first.updated_at
+    second = await repo.set_flag(r.id, "is_done", True)
+
+    assert second.is_done is True
+    assert second.updated_at == stamp
+    assert await repo.set_flag(999, "is_done", True) is None
+
+
+async def test_update_with_expected_version_is_conditional(service):
+    r = await service.create({"title": "v1"}, user_id=1)
+    version = r.updated_at
+
+    stale = await service.update(
+        r.id, {"title": "lost"}, expected_updated_at=[datetime(2000, 1, 1)]
+    )
+    assert stale is None
+
+    updated = await service.update(r.id, {"title": "v2"}, expected_updated_at=[version])
+    assert updated is not None
+    assert updated.title == "v2"
+
+
+async def test_list_page_with_columns_returns_rows(service):
+    for i in range(3):
+        await service.create({"title": f"c{i}"}, user_id=1)
+
+    rows, cursor = await service.list_page(limit=2, columns=["title"])
+    assert [row.title for row in rows] == ["c0", "c1"]
+
+    rows, cursor = await service.list_page(limit=2, cursor=cursor, columns=["title"])
+    assert [row._asdict()["title"] for row in rows] == ["c2"]
+    assert cursor is None
+
+
+async def test_list_page_sorts_descending_across_pages(service):
+    for title in ["b", "d", "a", "c", "e"]:
+        await service.create({"title": title}, user_id=1)
+    query = ListQuery(sort="-title")
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = await service.list_page(limit=2, cursor=cursor, query=query)
+        seen.extend(x.title for x in items)
+        if cursor is None:
+            break
+
+    assert seen == ["e", "d", "c", "b", "a"]
+    with pytest.raises(InvalidCursorError):
+        first_page_cursor = (await service.list_page(limit=1))[1]
+        await service.list_page(limit=1, cursor=first_page_cursor, query=query)
+
+
+async def test_list_page_applies_filters_and_search(service):
+    await service.create({"title": "Buy milk", "is_done": True}, user_id=1)
+    await service.create({"title": "buy 100% bread"}, user_id=1)
+    await service.create({"title": "Call mom"}, user_id=1)
+
+    done, _ = await service.list_page(query=ListQuery((Filter("is_done", "eq", True),)))
+    found, _ = await service.list_page(query=ListQuery(q="BUY"))
+    escaped, _ = await service.list_page(query=ListQuery(q="100%"))
+
+    assert [x.title for x in done] == ["Buy milk"]
+    assert [x.title for x in found] == ["Buy milk", "buy 100% bread"]
+    assert [x.title for x in escaped] == ["buy 100% bread"]
+    with pytest.raises(ValueError):
+        await service.list_page(query=ListQuery(sort="user_id"))
+
+
+async def test_changes_returns_only_rows_changed_since_token(service):
+    first = await service.create({"title": "a"}, user_id=1)
+    second = await service.create({"title": "b"}, user_id=1)
+
+    changed, token, has_more = await service.changes(limit=1)
+    assert [x.id for x in changed] == [first.id]
+    assert has_more is True
+    changed, token, has_more = await service.changes(token)
+    assert [x.id for x in changed] == [second.id]
+    assert has_more is False
+
+    await service.update(first.id, {"title": "a2"})
+    await service.delete(second.id)
+    changed, token, _ = await service.changes(token)
+
+    assert [(x.id, x.is_deleted) for x in changed] == [
+        (first.id, False),
+        (second.id, True),
+    ]
+    assert await service.changes(token) == ([], token, False)
+    with pytest.raises(InvalidCursorError):
+        await service.changes("not-a-token")
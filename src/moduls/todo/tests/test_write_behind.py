@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.shared.db.write_behind import WriteCoalescer
+
+
+@pytest.fixture()
+def sessions(engine):
+    return async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+@pytest.fixture()
+def statements(engine):
+    seen = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    return seen
+
+
+async def _seed(repo, count: int):
+    return [await repo.create({"title": f"t{i}", "user_id": 1}) for i in range(count)]
+
+
+async def test_update_rows_sets_per_row_values_in_one_statement(repo, statements):
+    a, b, c = await _seed(repo, 3)
+    statements.clear()
+
+    updated = await repo.update_rows({a.id: {"title": "A"}, b.id: {"title": "B"}})
+
+    assert [s for s in statements if s.startswith("UPDATE")] == [statements[0]]
+    assert {i: o.title for i, o in updated.items()} == {a.id: "A", b.id: "B"}
+    assert (await repo.get(c.id)).title == "t2"
+
+
+async def test_update_rows_keeps_updated_at_of_unchanged_rows(repo):
+    (todo,) = await _seed(repo, 1)
+    updated = await repo.update_rows({todo.id: {"title": "t0"}})
+    assert updated[todo.id].updated_at == todo.updated_at
+
+
+async def test_concurrent_updates_are_merged_into_one_flush(
+    repo, sessions, statements, ToDoRepositoryClass, ToDoServiceClass
+):
+    a, b = await _seed(repo, 2)
+    writes = WriteCoalescer(sessions, ToDoRepositoryClass, window=0.01)
+    service = ToDoServiceClass(repo, writes=writes)
+    statements.clear()
+
+    results = await asyncio.gather(
+        service.update(a.id, {"is_done": True}),
+        service.update(a.id, {"title": "merged"}),
+        service.update(b.id, {"title": "other"}),
+        service.update(999, {"title": "missing"}),
+    )
+
+    assert len([s for s in statements if s.startswith("UPDATE")]) == 2  # two field sets
+    assert (results[0].title, results[0].is_done) == ("merged", True)
+    assert results[1] is results[0]
+    assert results[2].title == "other"
+    assert results[3] is None
+
+
+async def test_failing_record_only_fails_its_callers(
+    repo, sessions, ToDoRepositoryClass
+):
+    a, b = await _seed(repo, 2)
+    writes = WriteCoalescer(sessions, ToDoRepositoryClass, window=0.01)
+
+    bad, good = await asyncio.gather(
+        writes.update(a.id, {"title": None}),
+        writes.update(b.id, {"is_done": True}),
+        return_exceptions=True,
+    )
+
+    assert isinstance(bad, IntegrityError)
+    assert good.is_done is True
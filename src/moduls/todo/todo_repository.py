@@ -1,5 +1,5 @@
 from src.shared.base_repo import BaseRepository
-from src.shared.db.models.todo_model import ToDo
+from src.shared.db.models.todo_model import ToDo, todos_archive
 
 
 class ToDoRepository(BaseRepository[ToDo]):
@@ -21,5 +21,11 @@ class ToDoRepository(BaseRepository[ToDo]):
         executing database operations.
     """
 
+    sortable_fields = ("created_at", "updated_at", "title")
+    search_fields = ("title", "description")
+    outbox_topic = "todo"
+    archive_table = todos_archive
+    archive_flags = ("is_deleted", "is_completed")
+
     def __init__(self, db_session):
         super().__init__(db_session, ToDo)
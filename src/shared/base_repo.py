@@ -1,10 +1,48 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from copy import copy
+from datetime import datetime
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from pydantic_core import to_jsonable_python
+from sqlalchemy import (
+    Delete,
+    Row,
+    Select,
+    Table,
+    Update,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.shared.bulk import BulkItemResult, chunked
+from src.shared.configs.get_settings import get_settings
+from src.shared.db.models.outbox_model import OutboxEvent
+from src.shared.list_query import FILTER_OPERATORS, ListQuery
+from src.shared.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+errors_log = logging.getLogger("errors_log")
 
 ModelType = TypeVar("ModelType")
+StmtType = TypeVar("StmtType", Select, Update, Delete)
 
 
 class BaseRepository(Generic[ModelType]):
@@ -19,8 +57,28 @@ class BaseRepository(Generic[ModelType]):
     Attributes:
         session (AsyncSession): Active SQLAlchemy asynchronous session.
         model (type[ModelType]): SQLAlchemy model class associated with this repository.
+        sortable_fields (tuple[str, ...]): Columns `list_page` may order by.
+        search_fields (tuple[str, ...]): Columns matched by free-text search
+            when the model has no `search_vector` (or the database is not
+            PostgreSQL).
+        outbox_topic (str | None): When set, every write also records
+            `<topic>.created/updated/deleted` events in the outbox table,
+            in the same transaction (see `src.shared.outbox`).
+        archive_table (Table | None): When set, cold records are moved there
+            by `archive` (see `src.shared.db.archive`). Reads only see the
+            live table unless archived records are requested; a write to an
+            archived record first moves it back to the live table.
+        archive_flags (tuple[str, ...]): Boolean columns marking a record as
+            finished; records with any of them set are archived once they
+            have not been updated for a while.
     """
 
+    sortable_fields: tuple[str, ...] = ()
+    search_fields: tuple[str, ...] = ()
+    outbox_topic: str | None = None
+    archive_table: Table | None = None
+    archive_flags: tuple[str, ...] = ("is_deleted",)
+
     def __init__(self, session: AsyncSession, model: type[ModelType]):
         """
         Initialize a new repository instance.
@@ -32,12 +90,320 @@ class BaseRepository(Generic[ModelType]):
         self.session = session
         self.model = model
 
+    def _with_archive(self) -> BaseRepository[ModelType]:
+        """
+        Return a copy of the repository reading live and archived records.
+
+        The copy queries `UNION ALL` of both tables through an alias of the
+        model, so it returns the usual ORM objects. Filters on the alias are
+        pushed down into both sides of the union by the database.
+
+        Returns:
+            BaseRepository[ModelType]: The repository copy, or this
+            repository if the model has no archive.
+        """
+        if self.archive_table is None:
+            return self
+        table = self.model.__table__
+        both = union_all(
+            select(*table.columns),
+            select(*(self.archive_table.c[c.name] for c in table.columns)),
+        ).subquery(f"{table.name}_all")
+        view = copy(self)
+        view.model = aliased(self.model, both, adapt_on_names=True)
+        view.archive_table = None
+        return view
+
+    async def _restore(
+        self, ids: Sequence[int], user_id: int | None, *conditions: Any
+    ) -> set[int]:
+        """
+        Move archived records back to the live table so they can be written.
+
+        Called by the write methods for the records they did not find, in
+        their transaction: the archived rows are locked, copied back whole
+        and deleted from the archive, so the caller can simply retry its
+        statement. Soft-deleted and foreign records stay archived, and so do
+        records failing `conditions`: a write that would not match them
+        must not restore them.
+
+        Args:
+            ids (Sequence[int]): Primary keys missing from the live table.
+            user_id (int | None): Optional user ID for ownership validation.
+            *conditions (ColumnElement[bool]): Further conditions on the
+                archive table, e.g. the version check of the write.
+
+        Returns:
+            set[int]: Primary keys of the restored records.
+        """
+        if self.archive_table is None or not ids:
+            return set()
+        archive = self.archive_table
+        stmt = select(archive.c.id).where(archive.c.id.in_(set(ids)), *conditions)
+        if "is_deleted" in archive.c:
+            stmt = stmt.where(~archive.c.is_deleted)
+        if user_id is not None and "user_id" in archive.c:
+            stmt = stmt.where(archive.c.user_id == user_id)
+        restored = set((await self.session.scalars(stmt.with_for_update())).all())
+        if restored:
+            table = self.model.__table__
+            names = [c.name for c in table.columns if c.computed is None]
+            rows = select(*(archive.c[name] for name in names)).where(
+                archive.c.id.in_(restored)
+            )
+            await self.session.execute(insert(table).from_select(names, rows))
+            await self.session.execute(
+                delete(archive).where(archive.c.id.in_(restored))
+            )
+        return restored
+
+    async def _write_one(
+        self, stmt: Update | Delete, obj_id: int, user_id: int | None, *conditions: Any
+    ) -> Any:
+        """
+        Run a write of one record, restoring the record if it is archived.
+
+        Args:
+            stmt (Update | Delete): The write, returning one value per record.
+            obj_id (int): Primary key of the record.
+            user_id (int | None): Optional user ID for ownership validation.
+            *conditions (ColumnElement[bool]): Passed to `_restore`.
+
+        Returns:
+            Any: The value returned by the write, or None if it matched nothing.
+        """
+        result = (await self.session.scalars(stmt)).one_or_none()
+        if result is None and self.archive_table is not None:
+            await self._restore([obj_id], user_id, *conditions)
+            # Rerun even if nothing was restored: a concurrent write may have
+            # restored the record while `_restore` waited for its lock.
+            result = (await self.session.scalars(stmt)).one_or_none()
+        return result
+
+    async def _write_many(
+        self,
+        ids: set[int],
+        user_id: int | None,
+        write: Callable[[set[int]], Awaitable[dict[int, Any]]],
+    ) -> dict[int, Any]:
+        """
+        Run a write of many records, restoring the archived ones it missed.
+
+        Args:
+            ids (set[int]): Primary keys of the records.
+            user_id (int | None): Optional user ID for ownership validation.
+            write (Callable[[set[int]], Awaitable[dict[int, Any]]]): Writes the
+                given records and returns what it returned by primary key.
+
+        Returns:
+            dict[int, Any]: The values returned by the write, by primary key;
+            records not found are missing.
+        """
+        done = await write(ids)
+        missing = ids - done.keys()
+        if missing and self.archive_table is not None:
+            await self._restore(missing, user_id)
+            # Rerun for every miss, as in `_write_one`.
+            done.update(await write(missing))
+        return done
+
+    def _apply_default_filters(self, stmt: StmtType, user_id: int | None) -> StmtType:
+        """
+        Apply the soft-delete and ownership filters shared by all queries.
+
+        Args:
+            stmt (Select | Update | Delete): The statement to restrict.
+            user_id (int | None): Optional user ID for filtering owned records.
+
+        Returns:
+            Select | Update | Delete: The restricted statement.
+        """
+        if hasattr(self.model, "is_deleted"):
+            # Plain `NOT is_deleted` so Postgres can match the partial index.
+            stmt = stmt.where(~self.model.is_deleted)
+        if user_id is not None and hasattr(self.model, "user_id"):
+            stmt = stmt.where(self.model.user_id == user_id)
+        return stmt
+
+    def _keyset_columns(
+        self, sort: str | None = None
+    ) -> tuple[str, tuple[Any, ...], bool]:
+        """
+        Return the ordering used for keyset pagination.
+
+        By default models with a `created_at` column are paged over
+        `(created_at, id)`, everything else over the primary key alone. An
+        explicit `sort` orders by `(<column>, id)`, both in the same direction,
+        so the ordering stays total and matches a `(<column>, id)` index.
+
+        Args:
+            sort (str | None): One of `sortable_fields`, prefixed with `-` for
+                descending order.
+
+        Returns:
+            tuple[str, tuple[Any, ...], bool]: The ordering key name, its
+            columns and whether the order is descending.
+
+        Raises:
+            ValueError: If the column is not sortable.
+        """
+        if sort is None:
+            if hasattr(self.model, "created_at"):
+                return "created_at", (self.model.created_at, self.model.id), False
+            return "id", (self.model.id,), False
+
+        name = sort.removeprefix("-")
+        if name not in self.sortable_fields:
+            raise ValueError(f"Cannot sort by {name!r}")
+        columns = (self.model.id,)
+        if name != "id":
+            columns = (getattr(self.model, name), self.model.id)
+        return sort, columns, sort.startswith("-")
+
+    def _search_clause(self, q: str) -> Any:
+        """
+        Build the free-text search condition.
+
+        On PostgreSQL models with a `search_vector` (tsvector) attribute are
+        matched with `websearch_to_tsquery`, which uses a GIN index over it. Otherwise
+        a case-insensitive substring match over `search_fields` is used.
+
+        Args:
+            q (str): The search text.
+
+        Returns:
+            ColumnElement[bool]: The condition.
+
+        Raises:
+            ValueError: If the model is not searchable.
+        """
+        if (
+            hasattr(self.model, "search_vector")
+            and self.session.get_bind().dialect.name == "postgresql"
+        ):
+            query = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), q)
+            return self.model.search_vector.op("@@")(query)
+        if not self.search_fields:
+            raise ValueError(f"{self.model.__name__} is not searchable")
+        return or_(
+            *(
+                getattr(self.model, name).icontains(q, autoescape=True)
+                for name in self.search_fields
+            )
+        )
+
+    def _apply_list_query(self, stmt: Select, query: ListQuery | None) -> Select:
+        """
+        Apply the filters and search of a list request.
+
+        Args:
+            stmt (Select): The statement to restrict.
+            query (ListQuery | None): Filtering and search options.
+
+        Returns:
+            Select: The restricted statement.
+
+        Raises:
+            ValueError: If a filter names an unknown column or operator.
+        """
+        if query is None:
+            return stmt
+        for condition in query.filters:
+            column = getattr(self.model, condition.field, None)
+            compare = FILTER_OPERATORS.get(condition.op)
+            if column is None or compare is None:
+                raise ValueError(
+                    f"Unsupported filter {condition.field!r} {condition.op!r}"
+                )
+            stmt = stmt.where(compare(column, condition.value))
+        if query.q:
+            stmt = stmt.where(self._search_clause(query.q))
+        return stmt
+
+    def _select(
+        self, columns: Sequence[str] | None, required: Sequence[Any] = ()
+    ) -> Select:
+        """
+        Build a SELECT of whole ORM objects or of the given columns only.
+
+        Selecting columns skips ORM hydration entirely: the query returns
+        lightweight `Row` tuples that support attribute access.
+
+        Args:
+            columns (Sequence[str] | None): Names of the columns to select, or
+                None to select ORM objects.
+            required (Sequence[Any]): Columns that must be selected in addition
+                to `columns` (e.g. the keyset ordering).
+
+        Returns:
+            Select: The statement.
+        """
+        if columns is None:
+            return select(self.model)
+        selected = [getattr(self.model, name) for name in columns]
+        selected += [column for column in required if column.key not in columns]
+        return select(*selected)
+
+    def _event_payload(self, obj: Any) -> dict[str, Any]:
+        if isinstance(obj, int):
+            return {"id": obj}
+        state = sa_inspect(obj)
+        return to_jsonable_python(
+            {
+                attr.key: getattr(obj, attr.key)
+                for attr in state.mapper.column_attrs
+                if attr.key not in state.unloaded
+            }
+        )
+
+    async def _record_events(self, action: str, objs: Sequence[Any]) -> None:
+        """
+        Add outbox events for changed records to the current transaction.
+
+        All events are inserted with one statement; nothing is done when the
+        repository has no `outbox_topic`.
+
+        Args:
+            action (str): `created`, `updated` or `deleted`.
+            objs (Sequence[Any]): The changed ORM objects, or the primary
+                keys of deleted records.
+        """
+        if self.outbox_topic is None or not objs:
+            return
+        topic = f"{self.outbox_topic}.{action}"
+        rows = []
+        for obj in objs:
+            payload = self._event_payload(obj)
+            rows.append(
+                {"topic": topic, "aggregate_id": payload["id"], "payload": payload}
+            )
+        await self.session.execute(insert(OutboxEvent), rows)
+
+    async def _end_read(self, owns_transaction: bool) -> None:
+        """
+        End a read transaction opened by the calling method.
+
+        Committing right after the read returns the connection to the pool
+        instead of keeping it idle in transaction until the session is closed
+        at the end of the request. Transactions started by the caller are
+        left open.
+
+        Args:
+            owns_transaction (bool): Whether the session was outside a
+                transaction before the read.
+        """
+        if owns_transaction and self.session.in_transaction():
+            await self.session.commit()
+
     async def create(self, data: BaseModel | dict) -> ModelType | None:
         """
         Create a new database record.
 
-        Accepts a Pydantic model or dictionary, adds the corresponding ORM
-        object to the database, commits the transaction, and refreshes it.
+        Accepts a Pydantic model or dictionary and inserts it with a single
+        `INSERT ... RETURNING *`, then commits. Server-generated columns come
+        back with the insert, so no refresh query is needed and the connection
+        is released with the commit. With an `outbox_topic`, the outbox event
+        is inserted in the same transaction.
 
         Args:
             data (BaseModel | dict): The data to insert into the database.
@@ -48,10 +414,10 @@ class BaseRepository(Generic[ModelType]):
 
         if isinstance(data, BaseModel):
             data = data.model_dump()
-        obj = self.model(**data)
-        self.session.add(obj)
+        stmt = insert(self.model).values(**data).returning(self.model)
+        obj = (await self.session.scalars(stmt)).one()
+        await self._record_events("created", [obj])
         await self.session.commit()
-        await self.session.refresh(obj)
         return obj
 
     async def add_all(self, objects: list[Any]):
@@ -65,97 +431,734 @@ class BaseRepository(Generic[ModelType]):
         """
         self.session.add_all(objects)
 
-    async def get(self, obj_id: int, user_id: int | None = None) -> ModelType | None:
+    async def bulk_create(
+        self,
+        items: list[BaseModel | dict],
+        chunk_size: int | None = None,
+    ) -> list[BulkItemResult]:
         """
-        Retrieve a single record by ID, optionally filtered by user ID.
+        Create many records with one `INSERT ... RETURNING` per chunk.
+
+        Each chunk is committed in its own transaction. If a chunk fails, it is
+        rolled back and all of its items are reported as failed, while the
+        other chunks are still applied.
 
         Args:
-            obj_id (int): The primary key of the record.
+            items (list[BaseModel | dict]): The data of the records to insert.
+            chunk_size (int | None): Rows per statement; defaults to the
+                `BULK_CHUNK_SIZE` setting.
+
+        Returns:
+            list[BulkItemResult]: One result per input item, in input order.
+        """
+        chunk_size = chunk_size or get_settings().bulk_chunk_size
+        rows = [
+            item.model_dump() if isinstance(item, BaseModel) else dict(item)
+            for item in items
+        ]
+
+        results: list[BulkItemResult] = []
+        offset = 0
+        for chunk in chunked(rows, chunk_size):
+            stmt = insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            )
+            try:
+                created = (await self.session.scalars(stmt, chunk)).all()
+                await self._record_events("created", created)
+                await self.session.commit()
+            except SQLAlchemyError:
+                await self.session.rollback()
+                errors_log.exception("bulk_create chunk failed")
+                results.extend(
+                    BulkItemResult(offset + i, error="Database error")
+                    for i in range(len(chunk))
+                )
+            else:
+                results.extend(
+                    BulkItemResult(offset + i, obj=obj) for i, obj in enumerate(created)
+                )
+            offset += len(chunk)
+        return results
+
+    async def bulk_update(
+        self,
+        items: list[tuple[int, BaseModel | dict]],
+        user_id: int | None = None,
+        chunk_size: int | None = None,
+    ) -> list[BulkItemResult]:
+        """
+        Update many records with set-based `UPDATE ... WHERE id IN (...)`.
+
+        Within a chunk, items carrying identical changes are grouped and
+        applied with a single `UPDATE ... RETURNING` statement; the chunk is
+        committed in its own transaction. Archived records are restored
+        first (see `_restore`). Items whose record does not exist, is
+        soft-deleted or belongs to another user are reported as not found.
+
+        Args:
+            items (list[tuple[int, BaseModel | dict]]): Pairs of primary key and
+                the fields to change.
             user_id (int | None): Optional user ID for ownership validation.
+            chunk_size (int | None): Items per chunk; defaults to the
+                `BULK_CHUNK_SIZE` setting.
 
         Returns:
-            ModelType | None: The ORM object if found, otherwise None.
+            list[BulkItemResult]: One result per input item, in input order.
         """
+        chunk_size = chunk_size or get_settings().bulk_chunk_size
+        results: dict[int, BulkItemResult] = {}
 
-        stmt = select(self.model).where(self.model.id == obj_id)
+        indexed = list(enumerate(items))
+        for chunk in chunked(indexed, chunk_size):
+            groups: dict[str, tuple[dict, list[tuple[int, int]]]] = {}
+            for index, (obj_id, data) in chunk:
+                if isinstance(data, BaseModel):
+                    data = data.model_dump(exclude_unset=True)
+                if not data:
+                    results[index] = BulkItemResult(index, error="No fields to update")
+                    continue
+                key = json.dumps(data, sort_keys=True, default=str)
+                groups.setdefault(key, (data, []))[1].append((index, obj_id))
 
-        if hasattr(self.model, "is_deleted"):
-            stmt = stmt.where(self.model.is_deleted.is_(False))
+            try:
+                updated: dict[int, Any] = {}
+                for data, members in groups.values():
 
-        if user_id is not None and hasattr(self.model, "user_id"):
-            stmt = stmt.where(self.model.user_id == user_id)
+                    async def write(ids: set[int], data: dict = data) -> dict:
+                        stmt = self._apply_default_filters(
+                            update(self.model).where(self.model.id.in_(ids)),
+                            user_id,
+                        )
+                        stmt = stmt.values(**data).returning(self.model)
+                        objs = (await self.session.scalars(stmt)).all()
+                        return {obj.id: obj for obj in objs}
+
+                    ids = {obj_id for _, obj_id in members}
+                    updated.update(await self._write_many(ids, user_id, write))
+                    for index, obj_id in members:
+                        results[index] = (
+                            BulkItemResult(index, obj=updated[obj_id])
+                            if obj_id in updated
+                            else BulkItemResult(index, error="Not found")
+                        )
+                await self._record_events("updated", list(updated.values()))
+                await self.session.commit()
+            except SQLAlchemyError:
+                await self.session.rollback()
+                errors_log.exception("bulk_update chunk failed")
+                for _, members in groups.values():
+                    for index, _ in members:
+                        results[index] = BulkItemResult(index, error="Database error")
+
+        return [results[i] for i in range(len(items))]
+
+    async def bulk_soft_delete(
+        self,
+        ids: list[int],
+        user_id: int | None = None,
+        chunk_size: int | None = None,
+    ) -> list[BulkItemResult]:
+        """
+        Delete many records with one statement per chunk.
+
+        Models with an `is_deleted` column are soft-deleted with
+        `UPDATE ... SET is_deleted = true WHERE id IN (...)`, other models are
+        removed with `DELETE ... WHERE id IN (...)`. Archived records are
+        restored first (see `_restore`).
 
+        Args:
+            ids (list[int]): Primary keys of the records to delete.
+            user_id (int | None): Optional user ID for ownership validation.
+            chunk_size (int | None): Ids per statement; defaults to the
+                `BULK_CHUNK_SIZE` setting.
+
+        Returns:
+            list[BulkItemResult]: One result per input id, in input order; `obj`
+            holds the deleted primary key.
+        """
+        chunk_size = chunk_size or get_settings().bulk_chunk_size
+        results: list[BulkItemResult] = []
+        offset = 0
+        for chunk in chunked(ids, chunk_size):
+            try:
+
+                async def write(ids: set[int]) -> dict:
+                    stmt = self._delete_stmt(list(ids), user_id)
+                    return {i: i for i in (await self.session.scalars(stmt)).all()}
+
+                deleted = await self._write_many(set(chunk), user_id, write)
+                await self._record_events("deleted", sorted(deleted))
+                await self.session.commit()
+            except SQLAlchemyError:
+                await self.session.rollback()
+                errors_log.exception("bulk_soft_delete chunk failed")
+                results.extend(
+                    BulkItemResult(offset + i, error="Database error")
+                    for i in range(len(chunk))
+                )
+            else:
+                results.extend(
+                    BulkItemResult(offset + i, obj=obj_id)
+                    if obj_id in deleted
+                    else BulkItemResult(offset + i, error="Not found")
+                    for i, obj_id in enumerate(chunk)
+                )
+            offset += len(chunk)
+        return results
+
+    async def get(
+        self,
+        obj_id: int,
+        user_id: int | None = None,
+        columns: Sequence[str] | None = None,
+        archived: bool = False,
+    ) -> ModelType | Row | None:
+        """
+        Retrieve a single record by ID, optionally filtered by user ID.
+
+        Args:
+            obj_id (int): The primary key of the record.
+            user_id (int | None): Optional user ID for ownership validation.
+            columns (Sequence[str] | None): Select only these columns and return
+                a `Row` instead of an ORM object.
+            archived (bool): Also look in the archive table.
+
+        Returns:
+            ModelType | Row | None: The ORM object (or row) if found, otherwise None.
+        """
+        if archived and self.archive_table is not None:
+            return await self._with_archive().get(obj_id, user_id, columns)
+
+        stmt = self._select(columns).where(self.model.id == obj_id)
+        stmt = self._apply_default_filters(stmt, user_id)
+
+        owns_transaction = not self.session.in_transaction()
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        obj = result.scalar_one_or_none() if columns is None else result.one_or_none()
+        await self._end_read(owns_transaction)
+        return obj
 
-    async def list(self, user_id: int | None = None) -> list[ModelType]:
+    async def list(
+        self, user_id: int | None = None, archived: bool = False
+    ) -> list[ModelType]:
         """
         Retrieve all records, optionally filtered by user ID.
 
         Args:
             user_id (int | None): Optional user ID for filtering owned records.
+            archived (bool): Include the records of the archive table.
 
         Returns:
             list[ModelType]: List of ORM objects.
         """
+        if archived and self.archive_table is not None:
+            return await self._with_archive().list(user_id)
+
+        stmt = self._apply_default_filters(select(self.model), user_id)
+
+        owns_transaction = not self.session.in_transaction()
+        result = await self.session.execute(stmt)
+        items = result.scalars().all()
+        await self._end_read(owns_transaction)
+        return items
+
+    async def list_page(
+        self,
+        user_id: int | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        columns: Sequence[str] | None = None,
+        query: ListQuery | None = None,
+    ) -> tuple[list[ModelType] | list[Row], str | None]:
+        """
+        Retrieve one page of records using keyset (cursor) pagination.
+
+        Rows are ordered by `(created_at, id)` when the model has a
+        `created_at` column, otherwise by `id`, unless `query.sort` asks for
+        another ordering. The next page starts strictly after the last row of
+        the previous one, so the cost of a page does not depend on how deep
+        into the table it is.
+
+        Args:
+            user_id (int | None): Optional user ID for filtering owned records.
+            limit (int): Maximum number of records to return.
+            cursor (str | None): Opaque cursor returned with the previous page.
+            columns (Sequence[str] | None): Select only these columns and return
+                `Row` tuples instead of ORM objects. The ordering columns are
+                always selected as well.
+            query (ListQuery | None): Filters, ordering and search to apply;
+                `query.archived` includes the archive table. The cursor must
+                come from a page with the same ordering.
+
+        Returns:
+            tuple[list[ModelType] | list[Row], str | None]: The page of ORM
+            objects (or rows) and the cursor of the next page, or None if this
+            is the last one.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for
+            a different ordering.
+            ValueError: If `query` names unsupported columns.
+        """
+        if query is not None and query.archived and self.archive_table is not None:
+            return await self._with_archive().list_page(
+                user_id, limit=limit, cursor=cursor, columns=columns, query=query
+            )
+        key, order_by, descending = self._keyset_columns(query and query.sort)
+
+        stmt = self._apply_default_filters(self._select(columns, order_by), user_id)
+        stmt = self._apply_list_query(stmt, query)
+        if cursor is not None:
+            values = decode_cursor(cursor, key)
+            if len(values) != len(order_by):
+                raise InvalidCursorError("Cursor does not match the requested ordering")
+            if descending:
+                stmt = stmt.where(tuple_(*order_by) < tuple_(*values))
+            else:
+                stmt = stmt.where(tuple_(*order_by) > tuple_(*values))
+        if descending:
+            stmt = stmt.order_by(*(column.desc() for column in order_by))
+        else:
+            stmt = stmt.order_by(*order_by)
+        stmt = stmt.limit(limit + 1)
+
+        owns_transaction = not self.session.in_transaction()
+        result = await self.session.execute(stmt)
+        items = list(result.scalars().all() if columns is None else result.all())
+        await self._end_read(owns_transaction)
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                key, [getattr(last, column.key) for column in order_by]
+            )
+        return items, next_cursor
+
+    async def changes(
+        self,
+        since: str | None = None,
+        limit: int = 500,
+        user_id: int | None = None,
+    ) -> tuple[list[ModelType], str | None, bool]:
+        """
+        Retrieve records changed after a sync token, soft-deleted ones included.
+
+        Models with a `change_seq` column are read in change sequence order,
+        other models in `(updated_at, id)` order. Either way the query is a
+        range scan starting at the token, so its cost depends on the number
+        of changes since the last sync, not on the table size.
+
+        On PostgreSQL, when the model also has a `change_xid` column, changes
+        made by transactions that may still be running (at or after the
+        snapshot xmin) are held back until they are all finished, so a
+        sequence number taken earlier but committed later is not skipped.
+
+        Archived records are included: archiving does not change a record,
+        and a client that last synced before it was deleted still needs the
+        tombstone.
+
+        Args:
+            since (str | None): Token returned by the previous call, or None to
+                read from the beginning.
+            limit (int): Maximum number of records to return.
+            user_id (int | None): Optional user ID for filtering owned records.
+
+        Returns:
+            tuple[list[ModelType], str | None, bool]: The changed records
+            (tombstones have `is_deleted` set), the token to resume from and
+            whether more changes are immediately available.
+
+        Raises:
+            InvalidCursorError: If the token is malformed or was issued for
+            a different ordering.
+        """
+        if self.archive_table is not None:
+            return await self._with_archive().changes(since, limit, user_id)
+        if hasattr(self.model, "change_seq"):
+            key, order_by = "change_seq", (self.model.change_seq,)
+        else:
+            key, order_by = "updated_at", (self.model.updated_at, self.model.id)
 
         stmt = select(self.model)
-        if hasattr(self.model, "is_deleted"):
-            stmt = stmt.where(self.model.is_deleted.is_(False))
         if user_id is not None and hasattr(self.model, "user_id"):
             stmt = stmt.where(self.model.user_id == user_id)
+        if since is not None:
+            values = decode_cursor(since, key)
+            if len(values) != len(order_by):
+                raise InvalidCursorError("Token does not match the change ordering")
+            stmt = stmt.where(tuple_(*order_by) > tuple_(*values))
+        if (
+            hasattr(self.model, "change_xid")
+            and self.session.get_bind().dialect.name == "postgresql"
+        ):
+            xmin = func.pg_snapshot_xmin(func.pg_current_snapshot())
+            stmt = stmt.where(self.model.change_xid < xmin)
+        stmt = stmt.order_by(*order_by).limit(limit + 1)
 
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        owns_transaction = not self.session.in_transaction()
+        items = list((await self.session.scalars(stmt)).all())
+        await self._end_read(owns_transaction)
+        has_more = len(items) > limit
+        items = items[:limit]
+        token = since
+        if items:
+            last = items[-1]
+            token = encode_cursor(key, [getattr(last, c.key) for c in order_by])
+        return items, token, has_more
 
-    async def update(self, obj_id: int, data: dict, user_id: int) -> ModelType | None:
+    async def stream(
+        self,
+        user_id: int | None = None,
+        batch_size: int = 1000,
+        columns: Sequence[str] | None = None,
+    ) -> AsyncIterator[list[ModelType] | list[Row]]:
+        """
+        Stream all records in batches using a server-side cursor.
+
+        Rows are fetched with `yield_per`, so at most `batch_size` ORM objects
+        are held in memory at a time regardless of the table size, and the
+        first batch is available before the whole result set is read.
+
+        If the session was not already inside a transaction, the read
+        transaction opened for the stream is ended once it is exhausted or
+        the consumer stops iterating, releasing the connection.
+
+        Args:
+            user_id (int | None): Optional user ID for filtering owned records.
+            batch_size (int): Number of rows fetched from the cursor at once.
+            columns (Sequence[str] | None): Select only these columns and yield
+                `Row` tuples instead of ORM objects.
+
+        Yields:
+            list[ModelType] | list[Row]: Consecutive batches of ORM objects
+            (or rows).
+        """
+        _, order_by, _ = self._keyset_columns()
+        stmt = (
+            self._apply_default_filters(self._select(columns), user_id)
+            .order_by(*order_by)
+            .execution_options(yield_per=batch_size)
+        )
+
+        owns_transaction = not self.session.in_transaction()
+        if columns is None:
+            result = await self.session.stream_scalars(stmt)
+        else:
+            result = await self.session.stream(stmt)
+        try:
+            async for batch in result.partitions():
+                yield batch
+        finally:
+            await result.close()
+            await self._end_read(owns_transaction)
+
+    async def update(
+        self,
+        obj_id: int,
+        data: dict | BaseModel,
+        user_id: int | None = None,
+        expected_updated_at: Sequence[datetime] | None = None,
+    ) -> ModelType | None:
         """
         Update an existing record by ID.
 
-        Retrieves the object, applies changes from a dictionary or Pydantic model,
-        commits, and refreshes the object.
+        Applies changes from a dictionary or Pydantic model with a single
+        `UPDATE ... WHERE id = :id RETURNING *` statement and commits, so the
+        write costs one round trip plus the commit (and the outbox insert,
+        when the repository has an `outbox_topic`).
+
+        When `expected_updated_at` is given, the record is only updated if its
+        current `updated_at` is one of those values, which makes the version
+        check and the write a single atomic statement. An archived record is
+        restored first (see `_restore`), unless its version does not match.
 
         Args:
             obj_id (int): The primary key of the record to update.
             data (dict | BaseModel): The data used to update the record.
-            user_id (int): Optional user ID for ownership validation.
+            user_id (int | None): Optional user ID for ownership validation.
+            expected_updated_at (Sequence[datetime] | None): Accepted current
+                versions of the record for optimistic concurrency control.
 
         Returns:
-            ModelType | None: The updated ORM object, or None if not found.
+            ModelType | None: The updated ORM object, or None if not found or
+            the version did not match.
         """
-        obj = await self.get(obj_id)
-        if not obj:
-            return None
         if isinstance(data, BaseModel):
             data = data.model_dump(exclude_unset=True)
-        for key, value in data.items():
-            setattr(obj, key, value)
+        if data:
+            stmt = update(self.model).values(**data).returning(self.model)
+        else:
+            stmt = select(self.model)
+        stmt = self._apply_default_filters(stmt.where(self.model.id == obj_id), user_id)
+        if expected_updated_at is not None:
+            stmt = stmt.where(self.model.updated_at.in_(expected_updated_at))
+
+        if not data:
+            owns_transaction = not self.session.in_transaction()
+            obj = (await self.session.scalars(stmt)).one_or_none()
+            await self._end_read(owns_transaction)
+            return obj
+
+        conditions = []
+        if expected_updated_at is not None and self.archive_table is not None:
+            conditions.append(self.archive_table.c.updated_at.in_(expected_updated_at))
+        obj = await self._write_one(stmt, obj_id, user_id, *conditions)
+        if obj is not None:
+            await self._record_events("updated", [obj])
         await self.session.commit()
-        await self.session.refresh(obj)
         return obj
 
-    async def delete(self, obj_id: int, user_id: int) -> bool:
+    def _update_rows_stmt(self, fields: tuple[str, ...], rows: list[tuple[int, dict]]):
+        """
+        Build one `UPDATE` giving each row its own values for `fields`.
+
+        On PostgreSQL the values are joined in with `UPDATE ... FROM (VALUES
+        ...)`; other databases get the same result with `CASE id WHEN ...`
+        expressions. `updated_at` (when the model has one) only moves for rows
+        whose values actually change.
+
+        Args:
+            fields (tuple[str, ...]): Columns set by every row.
+            rows (list[tuple[int, dict]]): Primary keys and their new values.
+
+        Returns:
+            Update: The statement, without ownership filters.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            source = values(
+                column("id", self.model.id.type),
+                *(column(f, getattr(self.model, f).type) for f in fields),
+                name="v",
+            ).data([(obj_id, *(data[f] for f in fields)) for obj_id, data in rows])
+            stmt = update(self.model).where(self.model.id == source.c.id)
+            new = {f: source.c[f] for f in fields}
+        else:
+            ids = [obj_id for obj_id, _ in rows]
+            stmt = update(self.model).where(self.model.id.in_(ids))
+            new = {
+                f: case({obj_id: data[f] for obj_id, data in rows}, value=self.model.id)
+                for f in fields
+            }
+
+        assignments = dict(new)
+        if hasattr(self.model, "updated_at") and "updated_at" not in fields:
+            changed = or_(
+                *(getattr(self.model, f).is_distinct_from(new[f]) for f in fields)
+            )
+            assignments["updated_at"] = case(
+                (changed, func.now()), else_=self.model.updated_at
+            )
+        # The returned rows refresh any copies already in the identity map.
+        return stmt.values(**assignments).execution_options(
+            synchronize_session=False, populate_existing=True
+        )
+
+    async def update_rows(
+        self, changes: dict[int, dict], user_id: int | None = None
+    ) -> dict[int, ModelType]:
+        """
+        Apply different changes to many records in one transaction.
+
+        Records sharing the same set of changed fields are updated by a
+        single statement (see `_update_rows_stmt`), so a burst of similar
+        updates costs one round trip plus the commit. Archived records are
+        restored first (see `_restore`).
+
+        Args:
+            changes (dict[int, dict]): New field values by primary key.
+            user_id (int | None): Optional user ID for ownership validation.
+
+        Returns:
+            dict[int, ModelType]: The updated records by primary key; records
+            not found are missing.
+        """
+
+        async def write(ids: set[int]) -> dict:
+            groups: dict[tuple[str, ...], list[tuple[int, dict]]] = {}
+            for obj_id in ids:
+                data = changes[obj_id]
+                groups.setdefault(tuple(sorted(data)), []).append((obj_id, data))
+            done: dict[int, ModelType] = {}
+            for fields, rows in groups.items():
+                stmt = self._apply_default_filters(
+                    self._update_rows_stmt(fields, rows), user_id
+                ).returning(self.model)
+                for obj in (await self.session.scalars(stmt)).all():
+                    done[obj.id] = obj
+            return done
+
+        updated = await self._write_many(set(changes), user_id, write)
+        await self._record_events("updated", list(updated.values()))
+        await self.session.commit()
+        return updated
+
+    async def set_flag(
+        self, obj_id: int, field: str, value: bool, user_id: int | None = None
+    ) -> ModelType | None:
+        """
+        Atomically set a boolean column and return the record.
+
+        Runs a single `UPDATE ... RETURNING *`. The operation is idempotent:
+        if the flag already has the requested value, `updated_at` (when the
+        model has one) is left untouched. An archived record is restored
+        first (see `_restore`).
+
+        Args:
+            obj_id (int): The primary key of the record to update.
+            field (str): Name of the boolean column to set.
+            value (bool): The value to set.
+            user_id (int | None): Optional user ID for ownership validation.
+
+        Returns:
+            ModelType | None: The updated ORM object, or None if not found.
+        """
+        column = getattr(self.model, field)
+        values: dict[str, Any] = {field: value}
+        if hasattr(self.model, "updated_at"):
+            values["updated_at"] = case(
+                (column.is_(value), self.model.updated_at), else_=func.now()
+            )
+
+        stmt = self._apply_default_filters(
+            update(self.model).where(self.model.id == obj_id), user_id
+        )
+        stmt = stmt.values(**values).returning(self.model)
+        obj = await self._write_one(stmt, obj_id, user_id)
+        if obj is not None:
+            await self._record_events("updated", [obj])
+        await self.session.commit()
+        return obj
+
+    def _delete_stmt(self, ids: list[int], user_id: int | None) -> Update | Delete:
+        """
+        Build the statement deleting the given records.
+
+        Models with an `is_deleted` column are soft-deleted, other models are
+        removed physically. The statement returns the affected primary keys.
+
+        Args:
+            ids (list[int]): Primary keys of the records to delete.
+            user_id (int | None): Optional user ID for ownership validation.
+
+        Returns:
+            Update | Delete: The statement to execute.
+        """
+        if hasattr(self.model, "is_deleted"):
+            stmt = update(self.model).values(is_deleted=True)
+        else:
+            stmt = delete(self.model)
+        stmt = stmt.where(self.model.id.in_(set(ids)))
+        return self._apply_default_filters(stmt, user_id).returning(self.model.id)
+
+    async def delete(self, obj_id: int, user_id: int | None = None) -> bool:
         """
         Delete a record by ID.
 
+        Soft-deletes the record when the model has an `is_deleted` column and
+        removes it physically otherwise, in a single statement. An archived
+        record is restored first (see `_restore`).
+
         Args:
             obj_id (int): The primary key of the record to delete.
-            user_id (int): Optional user ID for ownership validation.
+            user_id (int | None): Optional user ID for ownership validation.
 
         Returns:
             bool: True if the record was deleted, False if not found.
         """
-        obj = await self.get(obj_id, user_id)
-        if not obj:
-            return False
+        deleted = await self._write_one(
+            self._delete_stmt([obj_id], user_id), obj_id, user_id
+        )
+        if deleted is not None:
+            await self._record_events("deleted", [deleted])
+        await self.session.commit()
+        return deleted is not None
 
-        # Если есть поле is_deleted — делаем мягкое удаление
-        if hasattr(obj, "is_deleted"):
-            obj.is_deleted = True
-            await self.session.commit()
-            return True
+    async def archive(self, before: datetime, batch_size: int = 1000) -> list[int]:
+        """
+        Move one batch of cold records to the archive table.
+
+        A record is cold when one of `archive_flags` is set and it was last
+        updated before `before`. The batch is claimed with `SELECT ... FOR
+        UPDATE SKIP LOCKED`, so records being changed right now are left for
+        a later run, copied to the archive and deleted from the live table in
+        one short transaction. Records keep their primary key and change
+        sequence; no outbox events are recorded. Cached copies of the
+        records are the caller's to invalidate.
 
-        # Иначе физическое удаление
-        await self.session.delete(obj)
+        Args:
+            before (datetime): Only records not updated since are moved.
+            batch_size (int): Maximum number of records to move.
+
+        Returns:
+            list[int]: Primary keys of the archived records.
+
+        Raises:
+            ValueError: If the repository has no `archive_table`.
+        """
+        if self.archive_table is None:
+            raise ValueError(f"{self.model.__name__} has no archive table")
+        cold = or_(*(getattr(self.model, flag) for flag in self.archive_flags))
+        stmt = (
+            select(self.model.id)
+            .where(cold, self.model.updated_at < before)
+            .order_by(self.model.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list((await self.session.scalars(stmt)).all())
+        if ids:
+            table = self.model.__table__
+            names = [c.name for c in self.archive_table.columns if c.computed is None]
+            rows = select(*(table.c[name] for name in names)).where(table.c.id.in_(ids))
+            await self.session.execute(
+                insert(self.archive_table).from_select(names, rows)
+            )
+            await self.session.execute(delete(table).where(table.c.id.in_(ids)))
+        await self.session.commit()
+        return ids
+
+    async def purge(self, before: datetime, batch_size: int = 500) -> dict[str, int]:
+        """
+        Permanently delete one batch of records soft-deleted before `before`.
+
+        Runs `DELETE ... WHERE id IN (SELECT id ... LIMIT n FOR UPDATE SKIP
+        LOCKED)`, oldest deletions first, on the live table and then, with
+        what is left of the batch, on the archive table: the batch bounds the
+        locks held and the WAL written per transaction, and rows locked by
+        other transactions are left for a later run. The deletion time is
+        `updated_at`, which soft deletes bump. No outbox events are recorded.
+
+        Args:
+            before (datetime): Only records deleted before it are purged.
+            batch_size (int): Maximum number of records to delete.
+
+        Returns:
+            dict[str, int]: Number of purged records by name of the table they
+            were purged from; tables the batch did not reach are missing.
+
+        Raises:
+            ValueError: If the model has no `is_deleted` column.
+        """
+        if not hasattr(self.model, "is_deleted"):
+            raise ValueError(f"{self.model.__name__} is not soft-deleted")
+        purged: dict[str, int] = {}
+        for table in (self.model.__table__, self.archive_table):
+            left = batch_size - sum(purged.values())
+            if table is None or left <= 0:
+                break
+            claim = (
+                select(table.c.id)
+                .where(table.c.is_deleted, table.c.updated_at < before)
+                .order_by(table.c.updated_at)
+                .limit(left)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.session.execute(
+                delete(table).where(table.c.id.in_(claim))
+            )
+            purged[table.name] = result.rowcount
         await self.session.commit()
-        return True
+        return purged
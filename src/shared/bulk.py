@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class BulkItemResult:
+    """
+    Outcome of a single item of a bulk repository operation.
+
+    Attributes:
+        index (int): Position of the item in the input sequence.
+        obj (Any | None): The affected ORM object (or primary key for deletes).
+        error (str | None): Error message if the item was not applied.
+    """
+
+    index: int
+    obj: Any | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was applied successfully."""
+        return self.error is None
+
+
+def chunked(items: list[Any], size: int) -> list[list[Any]]:
+    """
+    Split a list into consecutive chunks of at most `size` elements.
+
+    Args:
+        items (list[Any]): Items to split.
+        size (int): Maximum chunk length.
+
+    Returns:
+        list[list[Any]]: The chunks, in input order.
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
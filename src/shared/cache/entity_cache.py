@@ -0,0 +1,286 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.shared.cache.local_cache import MISSING, LocalTTLCache
+from src.shared.cache.redis_client import get_redis
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+app_log = logging.getLogger("app_log")
+
+_registry: list["EntityCache"] = []
+
+
+class EntityCache(Generic[SchemaType]):
+    """
+    Read-through Redis cache of serialized entities keyed by primary key.
+
+    Values are stored as the JSON dump of `schema`, so a hit is returned
+    without touching the database or the ORM. A miss is loaded by the caller
+    supplied loader under a short Redis lock, so concurrent misses of the same
+    key issue a single database query while the others wait for the value.
+
+    Writers call `invalidate` after committing. Invalidation also leaves a
+    short-lived tombstone so a reader that loaded the old row just before the
+    write does not put it back into the cache.
+
+    Any Redis error is logged and the cache is bypassed for
+    `failure_backoff` seconds, falling back to the loader.
+
+    An optional in-process `LocalTTLCache` sits in front of Redis so repeated
+    reads within a worker skip the network hop. Invalidations are published
+    on the `<prefix>:invalidate` channel and applied to the local tier of
+    every worker by `run_invalidation_listener`; the short local TTL bounds
+    staleness if a message is missed.
+
+    Attributes:
+        prefix (str): Key namespace, e.g. `"todo:v1"`.
+        schema (type[SchemaType]): Schema used to (de)serialize cached values.
+        ttl (int): Time to live of cached values in seconds.
+        local (LocalTTLCache | None): In-process tier, if enabled.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        schema: type[SchemaType],
+        ttl: int,
+        client_factory: Callable[[], Redis | None] = get_redis,
+        lock_ttl_ms: int = 2000,
+        lock_wait_ms: int = 500,
+        lock_poll_ms: int = 20,
+        failure_backoff: float = 5.0,
+        local: LocalTTLCache | None = None,
+        tombstone_ttl_ms: int | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            prefix (str): Key namespace for this entity type.
+            schema (type[SchemaType]): Schema of cached values.
+            ttl (int): Time to live of cached values in seconds.
+            client_factory (Callable[[], Redis | None]): Returns the Redis client,
+                or None when caching is disabled.
+            lock_ttl_ms (int): Lifetime of the loader lock and of tombstones.
+            lock_wait_ms (int): How long a miss waits for another loader.
+            lock_poll_ms (int): Poll interval while waiting for another loader.
+            failure_backoff (float): Seconds to bypass Redis after an error.
+            local (LocalTTLCache | None): Optional in-process tier.
+            tombstone_ttl_ms (int | None): How long an invalidated key refuses
+                new values; defaults to `lock_ttl_ms`. Should cover the lag of
+                read replicas the loader may read from.
+        """
+        self.prefix = prefix
+        self.schema = schema
+        self.ttl = ttl
+        self._client_factory = client_factory
+        self._lock_ttl_ms = lock_ttl_ms
+        self._tombstone_ttl_ms = tombstone_ttl_ms or lock_ttl_ms
+        self._lock_wait_ms = lock_wait_ms
+        self._lock_poll_ms = lock_poll_ms
+        self._failure_backoff = failure_backoff
+        self._disabled_until = 0.0
+        self.local = local
+        self.channel = f"{prefix}:invalidate"
+        _registry.append(self)
+
+    def key(self, obj_id: Any) -> str:
+        """Return the cache key of an entity."""
+        return f"{self.prefix}:{obj_id}"
+
+    def _client(self) -> Redis | None:
+        if time.monotonic() < self._disabled_until:
+            return None
+        return self._client_factory()
+
+    def _on_error(self, action: str, error: Exception) -> None:
+        self._disabled_until = time.monotonic() + self._failure_backoff
+        app_log.warning("Redis %s failed, bypassing cache: %s", action, error)
+
+    def _to_schema(self, obj: Any) -> SchemaType | None:
+        if obj is None or isinstance(obj, self.schema):
+            return obj
+        return self.schema.model_validate(obj)
+
+    def _remember(self, key: str, obj: SchemaType | None) -> SchemaType | None:
+        if self.local is not None and obj is not None:
+            self.local.set(key, obj)
+        return obj
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the counters of the in-process tier.
+
+        Returns:
+            dict[str, int]: Size and hit/miss/eviction counts, empty if the
+            local tier is disabled.
+        """
+        return self.local.stats() if self.local is not None else {}
+
+    async def get_or_load(
+        self, obj_id: Any, loader: Callable[[], Awaitable[Any]]
+    ) -> SchemaType | None:
+        """
+        Return the cached entity, loading and caching it on a miss.
+
+        Args:
+            obj_id (Any): Primary key of the entity.
+            loader (Callable[[], Awaitable[Any]]): Loads the entity from the
+                database; may return an ORM object or None.
+
+        Returns:
+            SchemaType | None: The entity, or None if the loader found nothing.
+        """
+        key = self.key(obj_id)
+        if self.local is not None:
+            cached = self.local.get(key)
+            if cached is not MISSING:
+                return cached
+
+        client = self._client()
+        if client is None:
+            return self._remember(key, self._to_schema(await loader()))
+
+        lock_key = f"{key}:lock"
+        try:
+            raw = await client.get(key)
+            if raw is not None:
+                return self._remember(key, self.schema.model_validate_json(raw))
+            locked = await client.set(lock_key, b"1", nx=True, px=self._lock_ttl_ms)
+            if not locked:
+                raw = await self._wait_for_value(client, key)
+                if raw is not None:
+                    return self._remember(key, self.schema.model_validate_json(raw))
+        except RedisError as e:
+            self._on_error("read", e)
+            return self._remember(key, self._to_schema(await loader()))
+
+        obj = self._to_schema(await loader())
+        try:
+            if obj is not None and not await client.exists(f"{key}:tombstone"):
+                await client.set(key, obj.model_dump_json(), ex=self.ttl)
+                self._remember(key, obj)
+            if locked:
+                await client.delete(lock_key)
+        except RedisError as e:
+            self._on_error("write", e)
+        return obj
+
+    async def _wait_for_value(self, client: Redis, key: str) -> bytes | None:
+        deadline = time.monotonic() + self._lock_wait_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self._lock_poll_ms / 1000)
+            raw = await client.get(key)
+            if raw is not None:
+                return raw
+        return None
+
+    async def invalidate(self, *obj_ids: Any) -> None:
+        """
+        Drop cached entities after they were changed in the database.
+
+        Args:
+            *obj_ids (Any): Primary keys of the changed entities.
+        """
+        if not obj_ids:
+            return
+        if self.local is not None:
+            for obj_id in obj_ids:
+                self.local.pop(self.key(obj_id))
+
+        client = self._client()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                for obj_id in obj_ids:
+                    key = self.key(obj_id)
+                    pipe.delete(key)
+                    pipe.set(f"{key}:tombstone", b"1", px=self._tombstone_ttl_ms)
+                if self.local is not None:
+                    pipe.publish(self.channel, ",".join(map(str, obj_ids)))
+                await pipe.execute()
+        except RedisError as e:
+            self._on_error("invalidate", e)
+
+    async def run_invalidation_listener(self, retry_delay: float = 1.0) -> None:
+        """
+        Apply invalidations published by other workers to the local tier.
+
+        Runs until cancelled. The local tier is cleared every time the
+        subscription is (re)established, since messages may have been missed
+        while it was down.
+
+        Args:
+            retry_delay (float): Seconds to wait before resubscribing after
+                a Redis error.
+        """
+        if self.local is None:
+            return
+        while True:
+            client = self._client_factory()
+            if client is None:
+                return
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    self.local.clear()
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is None:
+                            continue
+                        for obj_id in message["data"].decode().split(","):
+                            self.local.pop(self.key(obj_id))
+            except RedisError as e:
+                app_log.warning("Cache invalidation listener failed: %s", e)
+                self.local.clear()
+                await asyncio.sleep(retry_delay)
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Return the local tier counters of every cache of the current worker.
+
+    Returns:
+        dict[str, dict[str, int]]: `EntityCache.stats()` by cache prefix,
+        for the caches with a local tier.
+    """
+    return {
+        cache.prefix: cache.stats() for cache in _registry if cache.local is not None
+    }
+
+
+_listener_tasks: list[asyncio.Task] = []
+
+
+async def start_invalidation_listeners() -> None:
+    """
+    Start the invalidation listener of every cache with a local tier.
+
+    Called once per worker on application startup.
+    """
+    for cache in _registry:
+        if cache.local is not None:
+            _listener_tasks.append(
+                asyncio.create_task(cache.run_invalidation_listener())
+            )
+
+
+async def stop_invalidation_listeners() -> None:
+    """
+    Cancel the listeners started by `start_invalidation_listeners`.
+    """
+    for task in _listener_tasks:
+        task.cancel()
+    await asyncio.gather(*_listener_tasks, return_exceptions=True)
+    _listener_tasks.clear()
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+MISSING = object()
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU cache with per-entry time to live.
+
+    Not shared between workers and not thread-safe; it is meant to be used
+    from a single event loop. Entries are evicted in least-recently-used
+    order once `maxsize` is reached and lazily dropped when they expire.
+
+    Attributes:
+        maxsize (int): Maximum number of entries.
+        ttl (float): Time to live of an entry in seconds.
+        hits (int): Number of lookups that found a live entry.
+        misses (int): Number of lookups that found nothing or an expired entry.
+        evictions (int): Number of entries dropped to respect `maxsize`.
+        expirations (int): Number of entries dropped because they expired.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float): Time to live of an entry in seconds.
+            clock (Callable[[], float]): Monotonic clock, injectable for tests.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """
+        Return the live value of `key`, or `MISSING`.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Any: The cached value or the `MISSING` sentinel.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entries.
+
+        Args:
+            key (str): Cache key.
+            value (Any): Value to store.
+        """
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: str) -> None:
+        """Drop `key` if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict[str, int]: Current size and hit/miss/eviction/expiration counts.
+        """
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
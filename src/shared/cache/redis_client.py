@@ -0,0 +1,41 @@
+from functools import lru_cache
+
+from redis.asyncio import Redis
+
+from src.shared.configs.get_settings import get_settings
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> Redis | None:
+    """
+    Return the shared asynchronous Redis client of the current worker.
+
+    The client is created lazily on first use with short socket timeouts,
+    so an unreachable Redis fails fast instead of stalling requests.
+
+    Returns:
+        Redis | None: The client, or None if `REDIS_URL` is not configured.
+    """
+    settings = get_settings()
+    if not settings.redis_url:
+        return None
+    return Redis.from_url(
+        settings.redis_url,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        health_check_interval=30,
+    )
+
+
+async def close_redis() -> None:
+    """
+    Close the shared Redis client and forget it.
+
+    The client's connections belong to the running event loop: code that
+    runs each job in its own loop (Celery tasks) calls this before the loop
+    ends, so the next job gets a fresh client.
+    """
+    client = get_redis()
+    get_redis.cache_clear()
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,98 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls within one worker.
+
+    The first caller of a key runs the loader; callers arriving while it is
+    in flight await the same result (or exception) instead of issuing their
+    own query. Nothing is kept once the call completes, so this is not a
+    cache: it only flattens bursts of identical requests.
+
+    Keys are grouped so that a write can drop every in-flight call it may
+    have made stale with `forget`. Callers already waiting keep their result,
+    but callers arriving after `forget` start a fresh call that observes the
+    write.
+
+    If the leading call is cancelled (e.g. its client disconnected), each
+    waiter runs its own loader instead of failing.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry of in-flight calls.
+        """
+        self._groups: dict[Hashable, dict[Hashable, asyncio.Future]] = {}
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently in flight."""
+        return sum(len(calls) for calls in self._groups.values())
+
+    async def do(
+        self,
+        group: Hashable,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Run `loader` or join the identical call already in flight.
+
+        Args:
+            group (Hashable): Invalidation group of the call, e.g. the
+                record id or `"list"`.
+            key (Hashable): Identifies the call within its group (method
+                and arguments).
+            loader (Callable[[], Awaitable[T]]): Performs the call.
+
+        Returns:
+            T: The loader's result.
+        """
+        calls = self._groups.setdefault(group, {})
+        future = calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                return await loader()
+
+        future = asyncio.get_running_loop().create_future()
+        calls[key] = future
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._discard(group, key, future)
+
+    def _discard(self, group: Hashable, key: Hashable, future: asyncio.Future) -> None:
+        calls = self._groups.get(group)
+        if calls is not None and calls.get(key) is future:
+            del calls[key]
+            if not calls:
+                del self._groups[group]
+
+    def forget(self, *groups: Any) -> None:
+        """
+        Stop sharing the in-flight calls of the given groups with new callers.
+
+        Args:
+            *groups (Any): Groups whose data was just changed.
+        """
+        for group in groups:
+            self._groups.pop(group, None)
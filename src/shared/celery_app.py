@@ -0,0 +1,61 @@
+import os
+
+from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
+
+from src.shared.configs.get_settings import get_settings
+from src.shared.metrics import mark_process_dead, start_metrics_server
+
+
+def create_celery_app() -> Celery:
+    """
+    Create the Celery application running the side effects of writes.
+
+    The broker is `CELERY_BROKER_URL`, falling back to `REDIS_URL` and, when
+    neither is set (tests, local runs), to the in-memory transport, which
+    only works within one process. Periodic maintenance tasks are scheduled
+    by `celery beat`; with `WORKER_METRICS_PORT` set, workers serve their
+    Prometheus metrics on that port.
+
+    Returns:
+        Celery: The configured application.
+    """
+    settings = get_settings()
+    broker = settings.celery_broker_url or settings.redis_url or "memory://"
+    app = Celery("todo", broker=broker, include=["src.moduls.todo.tasks"])
+    app.conf.update(
+        task_serializer="json",
+        accept_content=["json"],
+        # Outbox events are deleted once published: acknowledge a task only
+        # after it ran, so a crashed worker does not lose it.
+        task_acks_late=True,
+        task_reject_on_worker_lost=True,
+        worker_prefetch_multiplier=1,
+        broker_connection_retry_on_startup=True,
+        beat_schedule={
+            "archive-todos": {
+                "task": "todo.archive",
+                "schedule": settings.archive_interval,
+            },
+            "purge-todos": {
+                "task": "todo.purge",
+                "schedule": settings.purge_interval,
+            },
+        },
+    )
+    return app
+
+
+@worker_init.connect
+def _serve_metrics(**kwargs) -> None:
+    port = get_settings().worker_metrics_port
+    if port is not None:
+        start_metrics_server(port)
+
+
+@worker_process_shutdown.connect
+def _forget_process(**kwargs) -> None:
+    mark_process_dead(os.getpid())
+
+
+celery_app = create_celery_app()
@@ -1,65 +1,182 @@
-from logging.config import dictConfig
+import logging
+import queue
+import random
+import zlib
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from src.shared.configs.get_settings import get_settings
+from src.shared.request_context import get_request_id
+
 LOG_DIR = Path(__file__).parent.parent.parent.parent / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+LOGGERS = ("app_log", "errors_log")
+
+_listener: QueueListener | None = None
+
+
+class CorrelationIdFilter(logging.Filter):
+    """
+    Attach the correlation id of the current request as `record.request_id`.
+
+    Must run in the thread that logs, where the request context is set,
+    so it is installed on the queue handler rather than the file handlers.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = get_request_id()
+        return True
+
+
+class InfoSamplingFilter(logging.Filter):
+    """
+    Keep only a share of INFO and lower records; warnings and errors always pass.
+
+    Records of a request are kept or dropped together (the decision is
+    derived from its correlation id), so sampled requests stay complete.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Initialize the filter.
+
+        Args:
+            rate (float): Share of INFO and lower records to keep, 0 to 1.
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or self.rate >= 1:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            return zlib.crc32(request_id.encode()) % 10_000 < self.rate * 10_000
+        return random.random() < self.rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    When the bounded queue is full the record is dropped and counted; the
+    number of dropped records is logged as a warning once there is room
+    again.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        """
+        Initialize the handler.
+
+        Args:
+            log_queue (queue.Queue): Bounded queue drained by the listener.
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self._dropped_notice(record.name))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _dropped_notice(self, name: str) -> logging.LogRecord:
+        notice = logging.LogRecord(
+            name,
+            logging.WARNING,
+            __file__,
+            0,
+            "%d log records dropped: logging queue full",
+            (self.dropped,),
+            None,
+        )
+        notice.request_id = None
+        return self.prepare(notice)
+
+
+def _formatter(fmt: str) -> logging.Formatter:
+    if fmt == "text":
+        return logging.Formatter(
+            "[{asctime}] {levelname}: {name}: [{request_id}] {message}", style="{"
+        )
+    from pythonjsonlogger.json import JsonFormatter
+
+    return JsonFormatter(
+        "%(asctime)s %(levelname)s %(name)s %(request_id)s %(message)s"
+    )
+
 
 def setup_logger() -> None:
     """
     Configure application-wide logging using the built-in logging system.
 
-    Sets up rotating file handlers for application and error logs, defines
-    human-readable and JSON formatters, and assigns handlers to custom loggers.
+    Log calls only put the record on a bounded in-memory queue; a
+    `QueueListener` thread formats the records and writes them to the
+    rotating files, so request handling never waits for disk I/O. When the
+    queue is full, records are dropped instead of blocking.
+
+    Every record carries the correlation id of its request. INFO and
+    lower records are sampled according to `log_info_sample_rate`.
 
     Log files:
         - app.log: General application logs (INFO level and above)
         - errors.log: Error logs (ERROR level and above)
 
     The log configuration includes:
-        - Two formatters (plain text and JSON)
-        - RotatingFileHandler for each log type
+        - JSON formatter by default (`log_format="text"` for plain text)
+        - RotatingFileHandler for each log type, fed by the listener
         - Logger definitions: 'app_log' and 'errors_log'
     """
-    dictConfig(
-        {
-            "version": 1,
-            "disable_existing_loggers": False,
-            "formatters": {
-                "default": {
-                    "format": "[{asctime}] {levelname}: {name}: {message}",
-                    "style": "{",
-                },
-                "json": {
-                    "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
-                    "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
-                },
-            },
-            "handlers": {
-                "app": {
-                    "class": "logging.handlers.RotatingFileHandler",
-                    "filename": str(LOG_DIR / "app.log"),
-                    "maxBytes": 5 * 1024 * 1024,
-                    "backupCount": 5,
-                    "formatter": "default",
-                    "level": "INFO",
-                },
-                "errors": {
-                    "class": "logging.handlers.RotatingFileHandler",
-                    "filename": str(LOG_DIR / "errors.log"),
-                    "maxBytes": 5 * 1024 * 1024,
-                    "backupCount": 5,
-                    "formatter": "default",
-                    "level": "ERROR",
-                },
-            },
-            "loggers": {
-                "app_log": {"handlers": ["app"], "level": "DEBUG", "propagate": False},
-                "errors_log": {
-                    "handlers": ["errors"],
-                    "level": "DEBUG",
-                    "propagate": False,
-                },
-            },
-        }
+    global _listener
+    stop_logger()
+    settings = get_settings()
+    formatter = _formatter(settings.log_format)
+
+    handlers = []
+    for name, filename, level in (
+        ("app_log", "app.log", logging.INFO),
+        ("errors_log", "errors.log", logging.ERROR),
+    ):
+        handler = RotatingFileHandler(
+            LOG_DIR / filename, maxBytes=5 * 1024 * 1024, backupCount=5
+        )
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+        # One listener serves both files; route records by logger name.
+        handler.addFilter(logging.Filter(name))
+        handlers.append(handler)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(settings.log_queue_size))
+    queue_handler.addFilter(CorrelationIdFilter())
+    queue_handler.addFilter(InfoSamplingFilter(settings.log_info_sample_rate))
+
+    for name in LOGGERS:
+        logger = logging.getLogger(name)
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+            handler.close()
+        logger.addHandler(queue_handler)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+
+    _listener = QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
     )
+    _listener.start()
+
+
+def stop_logger() -> None:
+    """
+    Stop the listener thread after writing out the queued records.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,7 +20,72 @@ class Settings(BaseSettings):
         database_url (str | None): Full async database URL (if defined).
         sync_database_url (str | None): Full sync database URL (if defined).
         debug_db (bool): Enable SQLAlchemy engine echo for debugging.
-        use_pgbouncer (bool): Flag to switch SQLAlchemy engines into NullPool mode when using PgBouncer.
+        use_pgbouncer (bool): Connect through PgBouncer (transaction pooling);
+            selects the `pgbouncer` profile unless `db_profile` is set.
+        db_profile (str | None): Connection profile: `direct` (app-side pool
+            straight to PostgreSQL), `pgbouncer` (app-side pool to PgBouncer in
+            transaction mode, prepared statements made safe) or `nullpool`
+            (a new connection per checkout, for short-lived processes).
+        db_pool_size (int): Connections kept open by each worker's pool.
+        db_max_overflow (int): Extra connections a worker may open under load.
+        db_pool_timeout (float): Seconds to wait for a free pooled connection.
+        db_pool_recycle (int): Seconds after which pooled connections are replaced.
+        db_statement_cache_size (int): Prepared statements cached per connection
+            in the `pgbouncer` profile (`statement_cache_size` of asyncpg,
+            `prepared_max` of psycopg); 0 disables server-side prepared
+            statements. Keep 0 unless PgBouncer runs with
+            `max_prepared_statements` enabled.
+        database_replica_urls (str | None): Comma-separated async URLs of read
+            replicas; read-only endpoints are spread over them when set.
+        replica_strategy (str): How a replica is picked: `round_robin` or
+            `least_connections` (fewest connections checked out in this worker).
+        read_your_writes_seconds (float): After a write, the client's reads stay
+            on the primary for this long (tracked with a cookie).
+        metrics_enabled (bool): Record request and query metrics and serve them
+            on `/metrics`.
+        query_profiling (bool): Debug/staging mode counting the statements and DB
+            time of each request, adding `Server-Timing` headers and logging slow
+            queries with their plan and requests over the query budget.
+        query_budget (int): Statements a request may run before it is reported.
+        query_repeat_threshold (int): Executions of the same statement within a
+            request from which it is reported as a likely N+1.
+        slow_query_ms (float): Statements slower than this are logged with EXPLAIN.
+        log_format (str): Format of the log files: `json` (default) or `text`.
+        log_queue_size (int): Records buffered for the logging thread; further
+            records are dropped rather than blocking requests.
+        log_info_sample_rate (float): Share of requests whose INFO and lower
+            records are kept (warnings and errors are always kept).
+        bulk_chunk_size (int): Number of rows written by one statement in bulk operations.
+        write_behind_window_ms (float): Opt-in write-behind: field updates arriving
+            within this many milliseconds are merged into one transaction
+            (0 disables it).
+        write_behind_max_batch (int): Records after which a write-behind batch
+            is flushed without waiting for the window.
+        fast_json_responses (bool): Serve list/export endpoints from row tuples
+            encoded directly to JSON, skipping ORM hydration and response validation.
+        redis_url (str | None): Redis connection URL; caching is disabled when unset.
+        celery_broker_url (str | None): Broker of the side-effect tasks; defaults
+            to `redis_url`, then to the in-memory transport.
+        outbox_batch_size (int): Outbox events published per relay transaction.
+        outbox_poll_interval (float): Seconds the outbox relay waits when drained.
+        archive_after_days (int): Completed or deleted todos not updated for
+            this many days are moved to the archive table.
+        archive_batch_size (int): Records moved per archival transaction.
+        archive_pause (float): Seconds the archival job sleeps between batches.
+        archive_interval (float): Seconds between runs of the archival job
+            (Celery beat).
+        purge_after_days (int): Soft-deleted records are permanently deleted
+            this many days after their deletion. Sync clients that stay
+            offline longer miss those deletions and must resync from scratch.
+        purge_batch_size (int): Records deleted per purge transaction.
+        purge_pause (float): Seconds the purge job sleeps between batches.
+        purge_interval (float): Seconds between runs of the purge job.
+        worker_metrics_port (int | None): Port on which Celery workers serve
+            Prometheus metrics (disabled when unset).
+        redis_socket_timeout (float): Redis connect/read timeout in seconds.
+        cache_ttl_seconds (int): Time to live of cached entities.
+        local_cache_size (int): Entries of the per-worker in-process cache tier (0 disables it).
+        local_cache_ttl_seconds (float): Time to live of in-process cache entries.
 
     Config:
         env_file (str): Path to the `.env` file.
@@ -37,6 +104,63 @@ class Settings(BaseSettings):
     sync_database_url: str | None = Field(None, alias="SYNC_DATABASE_URL")
     debug_db: bool = Field(False, alias="DEBUG_DB")
     use_pgbouncer: bool = Field(False, alias="USE_PGBOUNCER")
+    db_profile: Literal["direct", "pgbouncer", "nullpool"] | None = Field(
+        None, alias="DB_PROFILE"
+    )
+    db_pool_size: int = Field(20, alias="DB_POOL_SIZE", gt=0)
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW", ge=0)
+    db_pool_timeout: float = Field(30.0, alias="DB_POOL_TIMEOUT", gt=0)
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    db_statement_cache_size: int = Field(0, alias="DB_STATEMENT_CACHE_SIZE", ge=0)
+    database_replica_urls: str | None = Field(None, alias="DATABASE_REPLICA_URLS")
+    replica_strategy: Literal["round_robin", "least_connections"] = Field(
+        "round_robin", alias="REPLICA_STRATEGY"
+    )
+    read_your_writes_seconds: float = Field(5.0, alias="READ_YOUR_WRITES_SECONDS", ge=0)
+    metrics_enabled: bool = Field(True, alias="METRICS_ENABLED")
+    query_profiling: bool = Field(False, alias="QUERY_PROFILING")
+    query_budget: int = Field(3, alias="QUERY_BUDGET", gt=0)
+    query_repeat_threshold: int = Field(3, alias="QUERY_REPEAT_THRESHOLD", gt=1)
+    slow_query_ms: float = Field(100.0, alias="SLOW_QUERY_MS", ge=0)
+    log_format: Literal["json", "text"] = Field("json", alias="LOG_FORMAT")
+    log_queue_size: int = Field(10_000, alias="LOG_QUEUE_SIZE", gt=0)
+    log_info_sample_rate: float = Field(1.0, alias="LOG_INFO_SAMPLE_RATE", ge=0, le=1)
+    bulk_chunk_size: int = Field(500, alias="BULK_CHUNK_SIZE", gt=0)
+    write_behind_window_ms: float = Field(0.0, alias="WRITE_BEHIND_WINDOW_MS", ge=0)
+    write_behind_max_batch: int = Field(500, alias="WRITE_BEHIND_MAX_BATCH", gt=0)
+    fast_json_responses: bool = Field(False, alias="FAST_JSON_RESPONSES")
+
+    redis_url: str | None = Field(None, alias="REDIS_URL")
+    celery_broker_url: str | None = Field(None, alias="CELERY_BROKER_URL")
+    outbox_batch_size: int = Field(100, alias="OUTBOX_BATCH_SIZE", gt=0)
+    outbox_poll_interval: float = Field(1.0, alias="OUTBOX_POLL_INTERVAL", gt=0)
+    archive_after_days: int = Field(30, alias="ARCHIVE_AFTER_DAYS", gt=0)
+    archive_batch_size: int = Field(1000, alias="ARCHIVE_BATCH_SIZE", gt=0)
+    archive_pause: float = Field(0.1, alias="ARCHIVE_PAUSE", ge=0)
+    archive_interval: float = Field(3600.0, alias="ARCHIVE_INTERVAL", gt=0)
+    purge_after_days: int = Field(90, alias="PURGE_AFTER_DAYS", gt=0)
+    purge_batch_size: int = Field(500, alias="PURGE_BATCH_SIZE", gt=0)
+    purge_pause: float = Field(0.2, alias="PURGE_PAUSE", ge=0)
+    purge_interval: float = Field(3600.0, alias="PURGE_INTERVAL", gt=0)
+    worker_metrics_port: int | None = Field(None, alias="WORKER_METRICS_PORT")
+    redis_socket_timeout: float = Field(0.25, alias="REDIS_SOCKET_TIMEOUT")
+    cache_ttl_seconds: int = Field(300, alias="CACHE_TTL_SECONDS", gt=0)
+    local_cache_size: int = Field(10_000, alias="LOCAL_CACHE_SIZE", ge=0)
+    local_cache_ttl_seconds: float = Field(5.0, alias="LOCAL_CACHE_TTL_SECONDS", gt=0)
+
+    @property
+    def connection_profile(self) -> str:
+        """The effective connection profile (see `db_profile`)."""
+        if self.db_profile is not None:
+            return self.db_profile
+        return "pgbouncer" if self.use_pgbouncer else "direct"
+
+    @property
+    def replica_urls(self) -> list[str]:
+        """The read replica URLs parsed from `database_replica_urls`."""
+        if not self.database_replica_urls:
+            return []
+        return [u.strip() for u in self.database_replica_urls.split(",") if u.strip()]
 
     model_config = SettingsConfigDict(
         env_file=".env",
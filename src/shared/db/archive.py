@@ -0,0 +1,95 @@
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Column, Index, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.cache.entity_cache import EntityCache
+from src.shared.db.maintenance import run_in_batches
+from src.shared.metrics import record_maintenance_batch
+
+app_log = logging.getLogger("app_log")
+
+
+def archive_table(table: Table, *indexes: Index, name: str | None = None) -> Table:
+    """
+    Define the archive counterpart of a table.
+
+    The archive has the same columns (generated columns included) but no
+    defaults, sequences or indexes of its own: rows only ever arrive from
+    the live table, whole. Its indexes are given explicitly, as the archive
+    is queried far less, and in fewer ways, than the live table.
+
+    Args:
+        table (Table): The live table.
+        *indexes (Index): Indexes of the archive table.
+        name (str | None): Name of the archive; defaults to `<table>_archive`.
+
+    Returns:
+        Table: The archive table, in the metadata of the live one.
+    """
+    columns = [
+        Column(
+            column.name,
+            column.type.copy(),
+            *([column.computed._copy()] if column.computed is not None else []),
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            autoincrement=False,
+        )
+        for column in table.columns
+    ]
+    return Table(name or f"{table.name}_archive", table.metadata, *columns, *indexes)
+
+
+async def archive_cold_rows(
+    session_factory: Callable[[], AsyncSession],
+    repo_class: Callable[[AsyncSession], Any],
+    before: datetime,
+    batch_size: int = 1000,
+    pause: float = 0.1,
+    cache: EntityCache | None = None,
+) -> int:
+    """
+    Move every cold record last changed before `before` to the archive.
+
+    Works in batches of `batch_size` records, each in its own short
+    transaction (see `BaseRepository.archive`), sleeping `pause` seconds
+    between them so that replicas and autovacuum keep up. Each batch is
+    invalidated in `cache` once committed, so plain reads stop returning
+    the archived records.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates sessions of
+            the primary database.
+        repo_class (Callable[[AsyncSession], Any]): Repository of the table.
+        before (datetime): Only records not updated since are moved.
+        batch_size (int): Records moved per transaction.
+        pause (float): Seconds to sleep between batches.
+        cache (EntityCache | None): Cache of the records, if any.
+
+    Returns:
+        int: Number of archived records.
+    """
+
+    async def step() -> int:
+        async with session_factory() as session:
+            repo = repo_class(session)
+            started = time.perf_counter()
+            ids = await repo.archive(before, batch_size)
+            record_maintenance_batch(
+                "archive",
+                repo.model.__table__.name,
+                len(ids),
+                time.perf_counter() - started,
+            )
+        if cache is not None and ids:
+            await cache.invalidate(*ids)
+        return len(ids)
+
+    archived = await run_in_batches(step, batch_size, pause, "Archival")
+    app_log.info("Archived %d records updated before %s", archived, before)
+    return archived
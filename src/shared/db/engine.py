@@ -3,12 +3,16 @@ from __future__ import annotations
 import os
 from functools import lru_cache
 from typing import Any
+from uuid import uuid4
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from src.shared.configs.get_settings import get_settings
+from src.shared.db.profiling import profile_engine
+from src.shared.metrics import InstrumentedQueuePool, instrument_engine
 
 
 def _resolve_urls() -> tuple[str, str]:
@@ -31,7 +35,62 @@ def _resolve_urls() -> tuple[str, str]:
     return async_url, sync_url
 
 
-def _async_engine_options() -> dict[str, Any]:
+def _pgbouncer_connect_args(url: str, cache_size: int) -> dict[str, Any]:
+    """
+    Параметры драйвера, при которых prepared statements безопасны
+    в transaction-режиме PgBouncer.
+
+    Без `max_prepared_statements` в PgBouncer (cache_size = 0) серверные
+    prepared statements отключаются. Иначе PgBouncer сам отслеживает
+    протокольные prepared statements и кэш драйвера можно оставить; размер
+    кэша psycopg задаётся не здесь, а в `_limit_prepared_statements`.
+    """
+    driver = make_url(url).get_driver_name()
+    if driver == "asyncpg":
+        if cache_size:
+            return {
+                "statement_cache_size": cache_size,
+                "prepared_statement_cache_size": cache_size,
+            }
+        # asyncpg готовит каждый запрос: уникальные имена, без кэша
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    if driver == "psycopg" and not cache_size:
+        return {"prepare_threshold": None}
+    return {}
+
+
+def _limit_prepared_statements(engine: Engine, url: str, cache_size: int) -> None:
+    """
+    Ограничивает кэш prepared statements psycopg размером `cache_size`.
+
+    Размер кэша psycopg (`prepared_max`) — атрибут соединения, а не параметр
+    подключения, поэтому он выставляется при открытии каждого соединения.
+    Для других драйверов и при cache_size = 0 ничего не делает.
+    """
+    if make_url(url).get_driver_name() != "psycopg" or not cache_size:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_prepared_max(dbapi_connection: Any, connection_record: Any) -> None:
+        # У async-движка это адаптер SQLAlchemy вокруг AsyncConnection
+        connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+        connection.prepared_max = cache_size
+
+
+def _configure_driver(engine: Engine, url: str) -> None:
+    """
+    Настройки драйвера, которые нельзя передать через `connect_args`.
+    """
+    settings = get_settings()
+    if settings.connection_profile == "pgbouncer":
+        _limit_prepared_statements(engine, url, settings.db_statement_cache_size)
+
+
+def _async_engine_options(async_url: str) -> dict[str, Any]:
     settings = get_settings()
     opts: dict[str, Any] = {
         "echo": settings.debug_db,
@@ -39,40 +98,129 @@ def _async_engine_options() -> dict[str, Any]:
         "pool_pre_ping": True,
     }
 
-    async_url, _ = _resolve_urls()
+    profile = settings.connection_profile
 
-    # Если PgBouncer – без собственного пула
-    if settings.use_pgbouncer:
+    # Для SQLite пулы не нужны/вредны
+    if async_url.startswith("sqlite+aiosqlite"):
+        return opts
+
+    if profile == "pgbouncer":
+        opts["connect_args"] = _pgbouncer_connect_args(
+            async_url, settings.db_statement_cache_size
+        )
+
+    if profile == "nullpool":
         opts["poolclass"] = NullPool
     else:
-        # Для SQLite пулы не нужны/вредны
-        if not async_url.startswith("sqlite+aiosqlite"):
-            opts.update(
-                {
-                    "pool_size": 20,
-                    "max_overflow": 10,
-                    "pool_timeout": 30,
-                    "pool_recycle": 1800,
-                }
-            )
+        # Свой пул и для PgBouncer: соединение к нему не открывается на каждый запрос
+        if settings.metrics_enabled:
+            opts["poolclass"] = InstrumentedQueuePool
+        opts.update(
+            {
+                "pool_size": settings.db_pool_size,
+                "max_overflow": settings.db_max_overflow,
+                "pool_timeout": settings.db_pool_timeout,
+                "pool_recycle": settings.db_pool_recycle,
+            }
+        )
     return opts
 
 
 def _sync_engine_options() -> dict[str, Any]:
     settings = get_settings()
     opts: dict[str, Any] = {"echo": settings.debug_db}
-    if settings.use_pgbouncer:
+    _, sync_url = _resolve_urls()
+    profile = settings.connection_profile
+    # Синхронный движок нужен скриптам/миграциям — пул не держим
+    if profile in ("pgbouncer", "nullpool"):
         opts.update({"poolclass": NullPool, "pool_pre_ping": True})
+    if profile == "pgbouncer":
+        opts["connect_args"] = _pgbouncer_connect_args(
+            sync_url, settings.db_statement_cache_size
+        )
     return opts
 
 
+def _instrument(engine: AsyncEngine, label: str) -> None:
+    """
+    Подключает метрики и профилирование запросов, если они включены.
+    """
+    settings = get_settings()
+    if settings.metrics_enabled:
+        instrument_engine(engine, label)
+    if settings.query_profiling:
+        profile_engine(engine, settings.slow_query_ms)
+
+
 @lru_cache(maxsize=1)
 def get_async_engine() -> AsyncEngine:
     async_url, _ = _resolve_urls()
-    return create_async_engine(async_url, **_async_engine_options())
+    engine = create_async_engine(async_url, **_async_engine_options(async_url))
+    _configure_driver(engine.sync_engine, async_url)
+    _instrument(engine, "primary")
+    return engine
+
+
+def create_task_engine() -> AsyncEngine:
+    """
+    Движок основной БД для фоновых задач Celery, запускающих корутины
+    через asyncio.run.
+
+    Соединения пула привязаны к циклу событий, а у каждого запуска задачи
+    он свой, поэтому пул не используется; движок закрывается задачей.
+    """
+    async_url, _ = _resolve_urls()
+    opts = _async_engine_options(async_url)
+    for option in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle"):
+        opts.pop(option, None)
+    if not async_url.startswith("sqlite+aiosqlite"):
+        opts["poolclass"] = NullPool
+    engine = create_async_engine(async_url, **opts)
+    _configure_driver(engine.sync_engine, async_url)
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_replica_engines() -> tuple[AsyncEngine, ...]:
+    """
+    Движки реплик для чтения (пустой кортеж, если реплики не заданы).
+    Пулы настраиваются так же, как у основного движка.
+    """
+    urls = get_settings().replica_urls
+    engines = tuple(
+        create_async_engine(url, **_async_engine_options(url)) for url in urls
+    )
+    for url, engine in zip(urls, engines, strict=True):
+        _configure_driver(engine.sync_engine, url)
+        _instrument(engine, "replica")
+    return engines
 
 
 @lru_cache(maxsize=1)
 def get_sync_engine() -> Engine:
     _, sync_url = _resolve_urls()
-    return create_engine(sync_url, **_sync_engine_options())
+    engine = create_engine(sync_url, **_sync_engine_options())
+    _configure_driver(engine, sync_url)
+    return engine
+
+
+def get_pool_stats(engine: AsyncEngine | None = None) -> dict[str, Any]:
+    """
+    Состояние пула соединений текущего воркера.
+
+    Returns:
+        dict[str, Any]: pid воркера, класс пула и, для QueuePool, размер,
+        свободные/занятые соединения и overflow.
+    """
+    pool = (engine or get_async_engine()).pool
+    stats: dict[str, Any] = {"pid": os.getpid(), "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    return stats
@@ -0,0 +1,59 @@
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class LazyAsyncSession:
+    """
+    Proxy that creates its `AsyncSession` on first use.
+
+    Requests served without touching the database (e.g. cache hits) never
+    create a session, and for read-only routes the replica is only chosen
+    when the first statement is about to run. Attribute access is forwarded
+    to the real session, so repositories use the proxy like an
+    `AsyncSession`.
+
+    The session itself checks out a connection on its first statement and
+    returns it to the pool when the transaction ends; repositories end their
+    read transactions right after reading (see `BaseRepository._end_read`),
+    so the connection is not held while the response is serialized.
+
+    Attributes:
+        replica (bool): The session may be bound to a read replica, which can
+            lag behind the primary.
+    """
+
+    def __init__(self, factory: Callable[[], AsyncSession], replica: bool = False):
+        """
+        Initialize the proxy.
+
+        Args:
+            factory (Callable[[], AsyncSession]): Creates the real session.
+            replica (bool): The factory may bind the session to a read replica.
+        """
+        self._factory = factory
+        self._session: AsyncSession | None = None
+        self.replica = replica
+
+    @property
+    def started(self) -> bool:
+        """Whether the real session has been created."""
+        return self._session is not None
+
+    def _get_session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def in_transaction(self) -> bool:
+        """Whether a transaction is open, without creating the session."""
+        return self._session is not None and self._session.in_transaction()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get_session(), name)
+
+    async def close(self) -> None:
+        """Close the real session, if it was created."""
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.metrics import record_maintenance_batch
+
+app_log = logging.getLogger("app_log")
+
+Step = Callable[[], Awaitable[int]]
+
+
+async def run_in_batches(step: Step, batch_size: int, pause: float, job: str) -> int:
+    """
+    Run a batch step until it processes fewer than `batch_size` rows.
+
+    Each step is expected to be one short transaction; sleeping `pause`
+    seconds between steps spreads the I/O and WAL of a large job out, so
+    replicas and autovacuum keep up with it.
+
+    Args:
+        step (Step): Processes one batch and returns its number of rows.
+        batch_size (int): Rows per step; a smaller result ends the run.
+        pause (float): Seconds to sleep between steps.
+        job (str): Name of the job, for the logs.
+
+    Returns:
+        int: Total number of processed rows.
+    """
+    total = 0
+    while True:
+        rows = await step()
+        total += rows
+        if rows < batch_size:
+            return total
+        app_log.info("%s: %d rows so far", job, total)
+        await asyncio.sleep(pause)
+
+
+async def purge_deleted_rows(
+    session_factory: Callable[[], AsyncSession],
+    repo_class: Callable[[AsyncSession], Any],
+    before: datetime,
+    batch_size: int = 500,
+    pause: float = 0.2,
+) -> int:
+    """
+    Permanently delete every record soft-deleted before `before`.
+
+    Works in batches of `batch_size` records, each in its own short
+    transaction covering the live table and then the archive table, if the
+    repository has one (see `BaseRepository.purge`).
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates sessions of
+            the primary database.
+        repo_class (Callable[[AsyncSession], Any]): Repository of the table.
+        before (datetime): Only records deleted (last updated) before it are
+            purged.
+        batch_size (int): Records deleted per transaction.
+        pause (float): Seconds to sleep between batches.
+
+    Returns:
+        int: Number of purged records.
+    """
+
+    async def step() -> int:
+        async with session_factory() as session:
+            repo = repo_class(session)
+            started = time.perf_counter()
+            purged = await repo.purge(before, batch_size)
+            elapsed = time.perf_counter() - started
+        for table, rows in purged.items():
+            record_maintenance_batch("purge", table, rows, elapsed)
+        return sum(purged.values())
+
+    purged = await run_in_batches(step, batch_size, pause, "Purge")
+    app_log.info("Purged %d records deleted before %s", purged, before)
+    return purged
@@ -0,0 +1,2 @@
+from src.shared.db.models.outbox_model import OutboxEvent
+from src.shared.db.models.todo_model import ToDo
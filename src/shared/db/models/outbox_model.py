@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.shared.db.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    SQLAlchemy ORM model of a pending side effect of a write (transactional outbox).
+
+    Rows are inserted by repositories in the same transaction as the change
+    they describe, so an event exists if and only if the change was
+    committed. The outbox relay publishes them to Celery and deletes them.
+
+    Attributes:
+        id (int): Primary key; also the publication order.
+        topic (str): Event name, which is also the Celery task it is sent
+            to, e.g. `todo.created`.
+        aggregate_id (int): Primary key of the changed record.
+        payload (dict[str, Any]): State of the record after the change.
+        created_at (datetime): Timestamp when the event was recorded.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSON().with_variant(JSONB, "postgresql"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
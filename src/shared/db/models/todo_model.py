@@ -1,9 +1,45 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, func
-from sqlalchemy.orm import Mapped, mapped_column
+# Registers the typed full-text search functions (`func.to_tsvector`).
+import sqlalchemy.dialects.postgresql  # noqa: F401
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    FetchedValue,
+    Index,
+    Integer,
+    Sequence,
+    String,
+    Text,
+    false,
+    func,
+    text,
+)
+from sqlalchemy.orm import Mapped, column_property, mapped_column
+from sqlalchemy.sql import ColumnElement
 
+from src.shared.db.archive import archive_table
 from src.shared.db.base import Base
+from src.shared.db.types import XID8
+
+# Global order of changes to todos, see GET /todos/changes.
+todos_change_seq = Sequence("todos_change_seq", metadata=Base.metadata)
+
+
+def search_document(title: ColumnElement, description: ColumnElement) -> ColumnElement:
+    """
+    Build the full-text document of a todo from its title and description.
+
+    Searches must use this exact expression for PostgreSQL to match them
+    with the `ix_todos_search_vector` expression index.
+    """
+    return func.to_tsvector(
+        text("'simple'::regconfig"),
+        func.coalesce(title, text("''"))
+        .op("||")(text("' '"))
+        .op("||")(func.coalesce(description, text("''"))),
+    )
 
 
 class ToDo(Base):
@@ -21,11 +57,67 @@ class ToDo(Base):
         created_at (datetime): Timestamp when the record was created.
         updated_at (datetime): Timestamp when the record was last updated.
         is_deleted (bool): Soft delete flag.
+        user_id (int | None): Owner of the task, if any.
+        search_vector (str | None): Full-text document of title and
+            description. Computed by the query, never stored nor loaded by
+            default; searches are served by an expression index over it.
+        change_seq (int): Position of the last change of the record in the
+            changes feed. Assigned on insert and, by the `todos_bump_change_seq`
+            trigger, on every update that changes the row (including soft
+            deletes).
+        change_xid (str): Id of the transaction that made the last change,
+            maintained by the same trigger and never loaded by default.
     """
 
     __tablename__ = "todos"
+    __table_args__ = (
+        # Keyset pagination over live rows (see BaseRepository.list_page).
+        Index(
+            "ix_todos_live_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Same ordering restricted to one owner.
+        Index(
+            "ix_todos_user_id_is_deleted_created_at_id",
+            "user_id",
+            "is_deleted",
+            "created_at",
+            "id",
+        ),
+        # Alternative orderings and the `is_completed` filter of GET /todos.
+        Index(
+            "ix_todos_live_updated_at_id",
+            "updated_at",
+            "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index(
+            "ix_todos_live_title_id",
+            "title",
+            "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index(
+            "ix_todos_live_is_completed_created_at_id",
+            "is_completed",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Changes feed, globally and per owner.
+        Index("ix_todos_change_seq", "change_seq", unique=True),
+        Index("ix_todos_user_id_change_seq", "user_id", "change_seq"),
+        # Candidates of the archival and purge jobs (see BaseRepository).
+        Index(
+            "ix_todos_cold_updated_at",
+            "updated_at",
+            postgresql_where=text("is_deleted OR is_completed"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -37,4 +129,48 @@ class ToDo(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
-    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_deleted: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    search_vector: Mapped[str | None] = column_property(
+        search_document(title, description), deferred=True
+    )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        server_default=todos_change_seq.next_value(),
+        server_onupdate=FetchedValue(),
+        nullable=False,
+    )
+    change_xid: Mapped[str] = mapped_column(
+        XID8,
+        server_default=func.pg_current_xact_id(),
+        server_onupdate=FetchedValue(),
+        nullable=False,
+        deferred=True,
+    )
+
+
+# Full-text search (see BaseRepository._search_clause). An expression index
+# rather than a stored column, so that adding it does not rewrite the table.
+Index(
+    "ix_todos_search_vector",
+    search_document(ToDo.__table__.c.title, ToDo.__table__.c.description),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+
+# Finished todos moved out of `todos` by the archival job, so that the live
+# table and its indexes only hold the working set (see ToDoRepository).
+todos_archive = archive_table(
+    ToDo.__table__,
+    Index("ix_todos_archive_user_id_created_at_id", "user_id", "created_at", "id"),
+    Index("ix_todos_archive_change_seq", "change_seq", unique=True),
+    Index("ix_todos_archive_user_id_change_seq", "user_id", "change_seq"),
+    # Candidates of the purge job (see BaseRepository.purge).
+    Index(
+        "ix_todos_archive_deleted_updated_at",
+        "updated_at",
+        postgresql_where=text("is_deleted"),
+    ),
+)
@@ -0,0 +1,246 @@
+import logging
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+from sqlalchemy import TextClause, text
+
+# Helpers for revisions that change large tables under live traffic. They are
+# called from `upgrade()`/`downgrade()` of an Alembic revision and rely on
+# `transaction_per_migration=True` (see `alembic/env.py`): each helper commits
+# the work of the revision so far and runs outside a transaction, so a
+# revision using them is not atomic and must be safe to rerun.
+#
+# The lock-avoiding paths are PostgreSQL-specific; on other databases the
+# helpers fall back to the plain Alembic operations.
+
+log = logging.getLogger("alembic.online")
+
+
+def _op():
+    from alembic import op
+
+    return op
+
+
+def _is_postgres() -> bool:
+    return _op().get_bind().dialect.name == "postgresql"
+
+
+@contextmanager
+def _without_lock_timeout() -> Iterator[None]:
+    """
+    Lift the `lock_timeout` of the migration session for a concurrent step.
+
+    `alembic/env.py` bounds lock waits so that DDL never queues live queries
+    behind it. Concurrent index builds and constraint validation take locks
+    that do not block reads or writes, but they wait for every older
+    transaction to finish; a timeout there only aborts the step half done
+    (leaving an INVALID index behind). The previous value is restored for
+    the statements that follow.
+    """
+    bind = _op().get_bind()
+    previous = bind.execute(text("SHOW lock_timeout")).scalar()
+    bind.execute(text("SET lock_timeout = 0"))
+    try:
+        yield
+    finally:
+        bind.execute(text(f"SET lock_timeout = '{previous}'"))
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str | TextClause],
+    unique: bool = False,
+    where: str | None = None,
+    using: str | None = None,
+) -> None:
+    """
+    Build an index without blocking writes to the table.
+
+    `CREATE INDEX CONCURRENTLY` takes a SHARE UPDATE EXCLUSIVE lock instead of
+    SHARE, so inserts and updates go on while the index is built. It cannot
+    run in a transaction block, and a failed build leaves an INVALID index
+    behind; such a leftover is dropped first, so a failed revision can simply
+    be rerun. The build runs without `lock_timeout`, as it has to wait for
+    the transactions already running.
+
+    Args:
+        name (str): Name of the index.
+        table (str): Table to index.
+        columns (Sequence[str | TextClause]): Indexed columns, or expressions
+            as `text()`.
+        unique (bool): Whether to create a unique index.
+        where (str | None): Predicate of a partial index, as SQL.
+        using (str | None): PostgreSQL index method, e.g. `"gin"`.
+    """
+    op = _op()
+    kwargs = (
+        {"postgresql_where": text(where), "sqlite_where": text(where)} if where else {}
+    )
+    if using:
+        kwargs["postgresql_using"] = using
+    if not _is_postgres():
+        op.create_index(name, table, list(columns), unique=unique, **kwargs)
+        return
+
+    with op.get_context().autocommit_block(), _without_lock_timeout():
+        bind = op.get_bind()
+        valid = bind.execute(
+            text(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND c.relkind = 'i' "
+                "AND pg_table_is_visible(c.oid)"
+            ),
+            {"name": name},
+        ).scalar()
+        if valid:
+            log.info("Index %s already exists", name)
+            return
+        if valid is False:
+            log.warning("Dropping invalid index %s left by a failed build", name)
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+        started = time.monotonic()
+        log.info("Building index %s on %s", name, table)
+        op.create_index(
+            name,
+            table,
+            list(columns),
+            unique=unique,
+            postgresql_concurrently=True,
+            **kwargs,
+        )
+        log.info("Built index %s in %.1fs", name, time.monotonic() - started)
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """
+    Drop an index without blocking reads and writes of the table.
+
+    Like the concurrent build, the drop waits for the transactions using the
+    table and runs without `lock_timeout`.
+
+    Args:
+        name (str): Name of the index.
+        table (str): Table the index belongs to.
+    """
+    op = _op()
+    if not _is_postgres():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block(), _without_lock_timeout():
+        op.drop_index(
+            name, table_name=table, postgresql_concurrently=True, if_exists=True
+        )
+
+
+def backfill(
+    table: str,
+    set_clause: str,
+    where: str | None = None,
+    batch_size: int = 10_000,
+    pause: float = 0.1,
+    key: str = "id",
+) -> int:
+    """
+    Update every row of a table in short, separately committed batches.
+
+    A single `UPDATE` of a large table holds its row locks until it commits
+    and produces one burst of WAL; here each statement covers `batch_size`
+    consecutive keys and commits at once, so concurrent writers wait at most
+    for one batch, and `pause` seconds between batches leave room for
+    replication and autovacuum. Progress, rate and an estimate of the
+    remaining time are logged after every batch.
+
+    The statement must be idempotent (typically `where` excludes rows that
+    were already done), so an interrupted backfill can be rerun.
+
+    Args:
+        table (str): Table to update.
+        set_clause (str): SQL of the `SET` clause, e.g. `"priority = 0"`.
+        where (str | None): SQL filter of the rows to update, e.g.
+            `"priority IS NULL"`.
+        batch_size (int): Range of keys covered by one statement.
+        pause (float): Seconds to sleep between batches.
+        key (str): Integer, indexed column used to walk the table.
+
+    Returns:
+        int: Number of updated rows.
+    """
+    op = _op()
+    condition = f" AND ({where})" if where else ""
+    update = text(
+        f"UPDATE {table} SET {set_clause} WHERE {key} >= :lo AND {key} < :hi{condition}"
+    )
+    updated = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        low, high = bind.execute(
+            text(f"SELECT min({key}), max({key}) FROM {table}")
+        ).one()
+        if low is None:
+            log.info("Backfill of %s: table is empty", table)
+            return 0
+
+        started = time.monotonic()
+        total = high - low + 1
+        for lo in range(low, high + 1, batch_size):
+            hi = lo + batch_size
+            # Autocommit: each statement is its own transaction.
+            updated += bind.execute(update, {"lo": lo, "hi": hi}).rowcount
+
+            done = min(hi, high + 1) - low
+            elapsed = time.monotonic() - started
+            eta = elapsed / done * (total - done)
+            log.info(
+                "Backfill of %s: %.1f%% of keys, %d rows updated, "
+                "%.0f rows/s, %.0fs left",
+                table,
+                100 * done / total,
+                updated,
+                updated / elapsed if elapsed else 0,
+                eta,
+            )
+            if hi <= high and pause:
+                time.sleep(pause)
+    return updated
+
+
+def set_not_null(table: str, column: str) -> None:
+    """
+    Make a column NOT NULL without scanning the table under an exclusive lock.
+
+    `ALTER COLUMN ... SET NOT NULL` scans the whole table while holding
+    ACCESS EXCLUSIVE. A `CHECK (... IS NOT NULL) NOT VALID` constraint is
+    added instantly and validated under a SHARE UPDATE EXCLUSIVE lock that
+    lets writes through; PostgreSQL 12+ then uses it to skip the scan of
+    `SET NOT NULL`, and the helper constraint is dropped. Only the validation
+    runs without `lock_timeout`; the other statements take ACCESS EXCLUSIVE
+    briefly and keep it.
+
+    Run it after the column was backfilled.
+
+    Args:
+        table (str): Table of the column.
+        column (str): Column to constrain.
+    """
+    op = _op()
+    if not _is_postgres():
+        with op.batch_alter_table(table) as batch:
+            batch.alter_column(column, nullable=False)
+        return
+
+    check = f"{table}_{column}_not_null"
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check}, "
+            f"ADD CONSTRAINT {check} CHECK ({column} IS NOT NULL) NOT VALID"
+        )
+        log.info("Validating %s.%s IS NOT NULL", table, column)
+        with _without_lock_timeout():
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+        op.alter_column(table, column, nullable=False)
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {check}")
@@ -0,0 +1,187 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+app_log = logging.getLogger("app_log")
+
+# Prefix turning a statement into a plan query, per dialect.
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements executed while serving one request.
+
+    Attributes:
+        count (int): Number of statements.
+        db_seconds (float): Total execution time of the statements.
+        statements (Counter[str]): Executions per SQL text; the same text run
+            many times in one request usually means an N+1 pattern.
+    """
+
+    count: int = 0
+    db_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> tuple[str, int] | None:
+        """Return the most executed statement and its count, if any."""
+        common = self.statements.most_common(1)
+        return common[0] if common else None
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Return the statistics of the request being served, if it is profiled."""
+    return _current_stats.get()
+
+
+def _explain(conn: Any, statement: str, parameters: Any) -> str | None:
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None:
+        return None
+    # A separate DBAPI cursor: the original one still holds the results, and
+    # going through the raw connection keeps the plan query out of the stats.
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def profile_engine(engine: AsyncEngine, slow_query_ms: float) -> None:
+    """
+    Count the statements of an engine against the profiled request.
+
+    Statements slower than `slow_query_ms` are logged with their plan.
+    Only SELECTs are explained: the statement has just succeeded with the
+    same parameters, so the plan query cannot abort the transaction.
+
+    Args:
+        engine (AsyncEngine): The engine to profile.
+        slow_query_ms (float): Threshold for logging a statement as slow.
+    """
+
+    # Kept on the execution context, so a failed statement leaves nothing
+    # behind on the connection.
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._profile_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._profile_start
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.db_seconds += elapsed
+            stats.statements[statement] += 1
+
+        if elapsed * 1000 < slow_query_ms:
+            return
+        plan = None
+        is_select = statement.lstrip()[:6].upper() in ("SELECT", "WITH")
+        if is_select and not executemany:
+            try:
+                plan = _explain(conn, statement, parameters)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+        app_log.warning(
+            "Slow query (%.1f ms): %s\nParameters: %r\nPlan:\n%s",
+            elapsed * 1000,
+            statement,
+            parameters,
+            plan or "n/a",
+        )
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI middleware counting the SQL statements and DB time of each request.
+
+    Adds a `Server-Timing` header (`db` and `app` durations in milliseconds,
+    shown by browser dev tools) and logs requests that run more statements
+    than the budget or repeat one statement too often (a likely N+1).
+
+    Durations in the header are measured when the response starts; work of
+    streaming responses after that point is only included in the log.
+    Engines must be set up with `profile_engine` for statements to be counted.
+    """
+
+    def __init__(self, app: Any, budget: int, repeat_threshold: int):
+        """
+        Initialize the middleware.
+
+        Args:
+            app (Any): The wrapped ASGI application.
+            budget (int): Maximum number of statements a request should run.
+            repeat_threshold (int): Executions of one statement from which a
+                request is reported as a likely N+1.
+        """
+        self.app = app
+        self.budget = budget
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                app_ms = (time.perf_counter() - start) * 1000
+                timing = (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.count} queries"'
+                    f", app;dur={app_ms:.1f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats, time.perf_counter() - start)
+
+    def _report(self, scope: dict, stats: QueryStats, elapsed: float) -> None:
+        route = getattr(scope.get("route"), "path", scope["path"])
+        if stats.count > self.budget:
+            app_log.warning(
+                "Query budget exceeded: %s %s ran %d statements (budget %d), "
+                "db %.1f ms of %.1f ms",
+                scope["method"],
+                route,
+                stats.count,
+                self.budget,
+                stats.db_seconds * 1000,
+                elapsed * 1000,
+            )
+        repeated = stats.most_repeated()
+        if repeated is not None and repeated[1] >= self.repeat_threshold:
+            app_log.warning(
+                "Possible N+1: %s %s ran the same statement %d times: %s",
+                scope["method"],
+                route,
+                repeated[1],
+                repeated[0],
+            )
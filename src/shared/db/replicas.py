@@ -0,0 +1,96 @@
+import itertools
+import time
+from collections.abc import Sequence
+from functools import lru_cache
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from src.shared.configs.get_settings import get_settings
+from src.shared.db.engine import get_replica_engines
+
+PRIMARY_COOKIE = "db_primary_until"
+
+
+class ReplicaSelector:
+    """
+    Picks the read replica engine a read-only request is served from.
+
+    Attributes:
+        engines (tuple[AsyncEngine, ...]): Replica engines to choose from.
+        strategy (str): `round_robin` or `least_connections`.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine], strategy: str = "round_robin"):
+        """
+        Initialize the selector.
+
+        Args:
+            engines (Sequence[AsyncEngine]): Replica engines; may be empty.
+            strategy (str): `round_robin` cycles through the replicas,
+                `least_connections` picks the one with the fewest connections
+                checked out of this worker's pools.
+        """
+        self.engines = tuple(engines)
+        self.strategy = strategy
+        self._counter = itertools.count()
+
+    def choose(self) -> AsyncEngine | None:
+        """
+        Return the replica to use, or None if there are no replicas.
+        """
+        if not self.engines:
+            return None
+        if self.strategy == "least_connections":
+            return min(self.engines, key=_checked_out)
+        return self.engines[next(self._counter) % len(self.engines)]
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    pool = engine.pool
+    return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+@lru_cache(maxsize=1)
+def get_replica_selector() -> ReplicaSelector:
+    """
+    Return the selector over the replicas configured in the settings.
+    """
+    return ReplicaSelector(get_replica_engines(), get_settings().replica_strategy)
+
+
+def wants_primary(request: Request) -> bool:
+    """
+    Whether the client wrote recently and must read its writes from the primary.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        bool: True while the cookie set by `stick_to_primary` is fresh.
+    """
+    try:
+        until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+def stick_to_primary(response: Response) -> None:
+    """
+    Keep the client's reads on the primary for the read-your-writes window.
+
+    Args:
+        response (Response): The response of the write request.
+    """
+    window = get_settings().read_your_writes_seconds
+    if not window:
+        return
+    response.set_cookie(
+        PRIMARY_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=max(1, round(window)),
+        httponly=True,
+        samesite="lax",
+    )
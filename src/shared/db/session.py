@@ -4,10 +4,13 @@ from __future__ import annotations
 from collections.abc import AsyncGenerator
 from contextlib import contextmanager
 
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.shared.db.engine import get_async_engine, get_sync_engine
+from src.shared.db.lazy_session import LazyAsyncSession
+from src.shared.db.replicas import get_replica_selector, stick_to_primary, wants_primary
 
 # ленивые фабрики sessionmaker — создаются при первом вызове
 AsyncSessionLocal = async_sessionmaker(
@@ -26,6 +29,48 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_write_session(
+    response: Response,
+) -> AsyncGenerator[LazyAsyncSession, None]:
+    """
+    Ленивая сессия основной БД для изменяющих запросов.
+
+    При настроенных репликах клиент получает cookie, и его чтения
+    остаются на основной БД, пока реплики догоняют запись.
+    """
+    if get_replica_selector().engines:
+        stick_to_primary(response)
+    session = LazyAsyncSession(AsyncSessionLocal)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_read_session(
+    request: Request,
+) -> AsyncGenerator[LazyAsyncSession, None]:
+    """
+    Ленивая сессия для запросов только на чтение: реплика, если она есть
+    и клиент недавно ничего не записывал, иначе основная БД.
+    Реплика выбирается при первом запросе к БД.
+    """
+
+    primary = wants_primary(request)
+
+    def factory() -> AsyncSession:
+        engine = None if primary else get_replica_selector().choose()
+        if engine is None:
+            return AsyncSessionLocal()
+        return AsyncSessionLocal(bind=engine)
+
+    session = LazyAsyncSession(factory, replica=not primary)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
 @contextmanager
 def get_sync_session() -> Session:
     """
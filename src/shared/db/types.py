@@ -0,0 +1,15 @@
+from sqlalchemy.types import UserDefinedType
+
+
+class XID8(UserDefinedType):
+    """
+    PostgreSQL `xid8` (64-bit transaction id) column type.
+
+    Only used in SQL expressions (e.g. against `pg_snapshot_xmin`); columns
+    of this type should be deferred so they are never loaded into Python.
+    """
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "xid8"
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+errors_log = logging.getLogger("errors_log")
+
+_Key = tuple[int, int | None]
+
+
+class _Batch:
+    def __init__(self):
+        self.changes: dict[_Key, dict] = {}
+        self.futures: dict[_Key, asyncio.Future] = {}
+
+
+class WriteCoalescer:
+    """
+    Merges field updates arriving within a short window into one transaction.
+
+    The first update opens a batch that is flushed `window` seconds later
+    (or as soon as it holds `max_batch` records). Updates of the same record
+    within the batch are merged in arrival order, later values winning, and
+    the whole batch is written with `BaseRepository.update_rows` in a
+    session of its own. Callers wait for the commit, so an acknowledged
+    update is durable, and all callers of a record get its final state.
+
+    If the batch fails, its records are retried one by one so that a bad
+    record only fails its own callers.
+
+    One instance is shared by the requests of a worker; it must only be
+    used from that worker's event loop.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        repo_class: Callable[[AsyncSession], Any],
+        window: float = 0.02,
+        max_batch: int = 500,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Creates sessions of
+                the primary database for the flushes.
+            repo_class (Callable[[AsyncSession], Any]): Repository used to write.
+            window (float): Seconds an update may wait for others to join.
+            max_batch (int): Records after which a batch is flushed at once.
+        """
+        self.session_factory = session_factory
+        self.repo_class = repo_class
+        self.window = window
+        self.max_batch = max_batch
+        self._batch: _Batch | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def update(self, obj_id: int, data: dict, user_id: int | None = None):
+        """
+        Queue changes to a record and wait until they are committed.
+
+        Args:
+            obj_id (int): The primary key of the record to update.
+            data (dict): The fields to change; must not be empty.
+            user_id (int | None): Optional user ID for ownership validation.
+
+        Returns:
+            Any | None: The record after the flush, or None if not found.
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batch
+        if batch is None:
+            batch = self._batch = _Batch()
+            loop.call_later(self.window, self._start_flush, batch)
+
+        key = (obj_id, user_id)
+        batch.changes.setdefault(key, {}).update(data)
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = loop.create_future()
+        if len(batch.changes) >= self.max_batch:
+            self._start_flush(batch)
+        # The flush outlives a cancelled caller: the others still need it.
+        return await asyncio.shield(future)
+
+    def _start_flush(self, batch: _Batch) -> None:
+        if self._batch is not batch:
+            return
+        self._batch = None
+        task = asyncio.ensure_future(self._flush(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: _Batch) -> None:
+        by_user: dict[int | None, dict[int, dict]] = {}
+        for (obj_id, user_id), data in batch.changes.items():
+            by_user.setdefault(user_id, {})[obj_id] = data
+
+        for user_id, changes in by_user.items():
+            try:
+                async with self.session_factory() as session:
+                    updated = await self.repo_class(session).update_rows(
+                        changes, user_id
+                    )
+            except Exception:
+                errors_log.exception("Write-behind batch failed, retrying per record")
+                await self._flush_one_by_one(batch, changes, user_id)
+                continue
+            for obj_id in changes:
+                self._resolve(batch.futures[(obj_id, user_id)], updated.get(obj_id))
+
+    async def _flush_one_by_one(
+        self, batch: _Batch, changes: dict[int, dict], user_id: int | None
+    ) -> None:
+        for obj_id, data in changes.items():
+            future = batch.futures[(obj_id, user_id)]
+            try:
+                async with self.session_factory() as session:
+                    updated = await self.repo_class(session).update_rows(
+                        {obj_id: data}, user_id
+                    )
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                    # Retrieved here in case every caller was cancelled.
+                    future.exception()
+                continue
+            self._resolve(future, updated.get(obj_id))
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, obj: Any) -> None:
+        if not future.done():
+            future.set_result(obj)
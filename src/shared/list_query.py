@@ -0,0 +1,48 @@
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+FILTER_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Filter:
+    """
+    A single `<column> <op> <value>` condition.
+
+    Attributes:
+        field (str): Name of the model column.
+        op (str): One of the keys of `FILTER_OPERATORS`.
+        value (Any): Value to compare the column with.
+    """
+
+    field: str
+    op: str
+    value: Any
+
+
+@dataclass(frozen=True, slots=True)
+class ListQuery:
+    """
+    Filtering, ordering and search options of a list request.
+
+    Attributes:
+        filters (tuple[Filter, ...]): Conditions combined with AND.
+        sort (str | None): Column to order by, prefixed with `-` for
+            descending order; None for the default ordering.
+        q (str | None): Free-text search over the searchable columns.
+        archived (bool): Include archived records (see
+            `BaseRepository.archive_table`).
+    """
+
+    filters: tuple[Filter, ...] = ()
+    sort: str | None = None
+    q: str | None = None
+    archived: bool = False
@@ -0,0 +1,206 @@
+import os
+import shutil
+import time
+from typing import Any
+
+import prometheus_client
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Per-worker values are written to files in this directory and merged on
+# scrape, so /metrics reports the whole gunicorn server whichever worker
+# answers. Must be set before the workers start (see gunicorn.conf.py).
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000)
+
+HTTP_REQUESTS = prometheus_client.Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = prometheus_client.Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_LATENCY = prometheus_client.Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time.",
+    ["engine", "operation"],
+    buckets=QUERY_BUCKETS,
+)
+DB_QUERY_ROWS = prometheus_client.Histogram(
+    "db_query_rows",
+    "Rows returned or affected by a SQL statement.",
+    ["engine", "operation"],
+    buckets=ROW_BUCKETS,
+)
+DB_POOL_WAIT = prometheus_client.Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ["engine"],
+    buckets=QUERY_BUCKETS,
+)
+MAINTENANCE_ROWS = prometheus_client.Counter(
+    "maintenance_rows_total",
+    "Rows archived or purged by maintenance jobs.",
+    ["job", "table"],
+)
+MAINTENANCE_BATCH_LATENCY = prometheus_client.Histogram(
+    "maintenance_batch_duration_seconds",
+    "Duration of one maintenance job transaction.",
+    ["job", "table"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render the current metrics in the Prometheus text format.
+
+    In multiprocess mode the values of all workers are aggregated.
+
+    Returns:
+        tuple[bytes, str]: The payload and its content type.
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    payload = prometheus_client.generate_latest(registry)
+    return payload, prometheus_client.CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency.
+
+    Requests are labelled by the route template (e.g. `/todos/{todo_id}`)
+    rather than the raw path, so the number of series stays bounded;
+    requests that match no route are labelled `unmatched`.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: dict) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            labels = (scope["method"], route, str(status))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_LATENCY.labels(*labels).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long checkouts wait for a connection.
+    """
+
+    metrics_label = "primary"
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+        return keyword
+    return "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    """
+    Record the execution time and row count of every statement of an engine.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+        label (str): Value of the `engine` label, e.g. `"primary"`.
+    """
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics_label = label
+
+    # The start time lives on the execution context, which is dropped with
+    # the statement: a failed statement leaves nothing behind.
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_query_start
+        operation = _operation(statement)
+        DB_QUERY_LATENCY.labels(label, operation).observe(elapsed)
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            DB_QUERY_ROWS.labels(label, operation).observe(cursor.rowcount)
+
+
+def record_maintenance_batch(job: str, table: str, rows: int, seconds: float) -> None:
+    """
+    Record one batch of a maintenance job (archival, purge).
+
+    Args:
+        job (str): Name of the job, e.g. `"purge"`.
+        table (str): Table the batch was taken from.
+        rows (int): Rows processed by the batch.
+        seconds (float): Duration of the batch transaction.
+    """
+    MAINTENANCE_ROWS.labels(job, table).inc(rows)
+    MAINTENANCE_BATCH_LATENCY.labels(job, table).observe(seconds)
+
+
+def start_metrics_server(port: int) -> None:
+    """
+    Serve the metrics of a non-web process (a Celery worker) on `port`.
+
+    With `PROMETHEUS_MULTIPROC_DIR` set, the directory is emptied first and
+    the values of all child processes are aggregated, as for gunicorn.
+
+    Args:
+        port (int): TCP port of the metrics endpoint.
+    """
+    registry = prometheus_client.REGISTRY
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    prometheus_client.start_http_server(port, registry=registry)
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Drop the live-gauge files of a finished worker (gunicorn `child_exit`).
+
+    Args:
+        pid (int): Process id of the worker.
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import signal
+from collections.abc import Callable, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.db.models.outbox_model import OutboxEvent
+
+app_log = logging.getLogger("app_log")
+errors_log = logging.getLogger("errors_log")
+
+Publisher = Callable[[Sequence[OutboxEvent]], None]
+
+
+def publish_to_celery(events: Sequence[OutboxEvent]) -> None:
+    """
+    Send events to the Celery tasks named by their topics over one connection.
+
+    The task id is derived from the event id, so handlers can recognise a
+    redelivered event.
+
+    Args:
+        events (Sequence[OutboxEvent]): Events to publish, in order.
+    """
+    from src.shared.celery_app import celery_app
+
+    with celery_app.producer_or_acquire() as producer:
+        for event in events:
+            celery_app.send_task(
+                event.topic,
+                args=(event.payload,),
+                task_id=f"outbox-{event.id}",
+                producer=producer,
+            )
+
+
+class OutboxRelay:
+    """
+    Moves outbox events from the database to Celery.
+
+    Each batch is claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, published
+    and deleted in one transaction, so several relays can run side by side
+    without sending an event twice in the normal case. If the process dies
+    between publishing and committing, the batch is published again:
+    delivery is at least once.
+
+    Events are published in id order within a batch; with several relays,
+    batches may overtake each other.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        publish: Publisher = publish_to_celery,
+        batch_size: int = 100,
+    ):
+        """
+        Initialize the relay.
+
+        Args:
+            session_factory (Callable[[], AsyncSession]): Creates sessions of
+                the primary database.
+            publish (Publisher): Sends a batch of events; runs in a worker
+                thread because broker clients block.
+            batch_size (int): Maximum number of events per transaction.
+        """
+        self.session_factory = session_factory
+        self.publish = publish
+        self.batch_size = batch_size
+
+    async def relay_batch(self) -> int:
+        """
+        Publish and delete the oldest pending events.
+
+        Returns:
+            int: Number of events relayed.
+        """
+        async with self.session_factory() as session, session.begin():
+            stmt = (
+                select(OutboxEvent)
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            events = (await session.scalars(stmt)).all()
+            if not events:
+                return 0
+            await asyncio.to_thread(self.publish, events)
+            await session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_([e.id for e in events]))
+            )
+        return len(events)
+
+    async def run(self, poll_interval: float, stop: asyncio.Event) -> None:
+        """
+        Relay events until `stop` is set.
+
+        Full batches are followed immediately by the next one; otherwise the
+        relay waits `poll_interval` seconds. Failures are logged and retried
+        after the same delay.
+
+        Args:
+            poll_interval (float): Seconds to wait when the outbox is drained.
+            stop (asyncio.Event): Set to shut the relay down.
+        """
+        while not stop.is_set():
+            try:
+                relayed = await self.relay_batch()
+            except Exception:
+                errors_log.exception("Outbox relay batch failed")
+                relayed = 0
+            if relayed < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), poll_interval)
+                except TimeoutError:
+                    pass
+
+
+async def main() -> None:
+    """
+    Run the relay as a standalone process until SIGINT/SIGTERM.
+    """
+    from src.shared.configs.get_settings import get_settings
+    from src.shared.configs.log_conf import setup_logger, stop_logger
+    from src.shared.db.session import AsyncSessionLocal
+
+    setup_logger()
+    settings = get_settings()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    relay = OutboxRelay(AsyncSessionLocal, batch_size=settings.outbox_batch_size)
+    app_log.info("Outbox relay started")
+    try:
+        await relay.run(settings.outbox_poll_interval, stop)
+    finally:
+        stop_logger()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded or does not match
+    the ordering it is being applied to.
+    """
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        try:
+            return datetime.fromisoformat(value["dt"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursorError("Malformed cursor value") from e
+    return value
+
+
+def encode_cursor(key: str, values: Sequence[Any]) -> str:
+    """
+    Build an opaque keyset cursor.
+
+    The cursor stores the ordering key name and the values of the ordering
+    columns of the last returned row, so the next page can continue with a
+    `WHERE (col_1, ..., id) > (:v1, ..., :id)` predicate instead of OFFSET.
+
+    Args:
+        key (str): Name of the ordering the cursor belongs to.
+        values (Sequence[Any]): Values of the ordering columns of the last row.
+
+    Returns:
+        str: URL-safe base64 string without padding.
+    """
+    payload = {"k": key, "v": [_encode_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, key: str) -> list[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Opaque cursor received from the client.
+        key (str): Ordering key the cursor is expected to belong to.
+
+    Returns:
+        list[Any]: Values of the ordering columns of the last seen row.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for
+        a different ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+    if not isinstance(payload, dict) or payload.get("k") != key:
+        raise InvalidCursorError("Cursor does not match the requested ordering")
+    values = payload.get("v")
+    if not isinstance(values, list):
+        raise InvalidCursorError("Malformed cursor")
+    return [_decode_value(v) for v in values]
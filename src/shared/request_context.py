@@ -0,0 +1,58 @@
+import re
+from contextvars import ContextVar
+from typing import Any
+from uuid import uuid4
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Incoming ids are echoed into logs and headers, so only short tokens of
+# safe characters are trusted; anything else is replaced with a fresh id.
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+_request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> str | None:
+    """Return the correlation id of the request being served, if any."""
+    return _request_id.get()
+
+
+class CorrelationIdMiddleware:
+    """
+    ASGI middleware assigning a correlation id to every request.
+
+    The id is taken from the `X-Request-ID` header when the client (or a
+    proxy) sent a valid one, otherwise generated. It is available through
+    `get_request_id` while the request is served, attached to every log
+    record, and returned in the `X-Request-ID` response header.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid4().hex
+
+        async def send_with_id(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
@@ -1,6 +1,19 @@
-from typing import Generic, TypeVar
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from src.shared.cache.entity_cache import EntityCache
+    from src.shared.cache.single_flight import SingleFlight
+    from src.shared.db.write_behind import WriteCoalescer
+    from src.shared.list_query import ListQuery
 
 RepoType = TypeVar("RepoType")
+T = TypeVar("T")
 
 
 class BaseCRUDService(Generic[RepoType]):
@@ -15,16 +28,84 @@ class BaseCRUDService(Generic[RepoType]):
 
     Attributes:
         repo (RepoType): The repository instance handling database operations.
+        cache (EntityCache | None): Optional read-through cache used by `get`
+            and invalidated by every write.
+        flights (SingleFlight | None): Optional per-worker registry used to
+            coalesce identical concurrent `get`/`list`/`list_page` calls.
+        writes (WriteCoalescer | None): Optional per-worker write-behind
+            batcher; unconditional `update` calls are merged through it.
     """
 
-    def __init__(self, repo: RepoType):
+    def __init__(
+        self,
+        repo: RepoType,
+        cache: EntityCache | None = None,
+        flights: SingleFlight | None = None,
+        writes: WriteCoalescer | None = None,
+    ):
         """
         Initialize a CRUD service with the given repository.
 
         Args:
             repo (RepoType): Repository instance responsible for database interactions.
+            cache (EntityCache | None): Optional cache of single records by ID.
+            flights (SingleFlight | None): Optional single-flight registry shared
+                by the service instances of a worker.
+            writes (WriteCoalescer | None): Optional write-behind batcher shared
+                by the service instances of a worker.
         """
         self.repo = repo
+        self.cache = cache
+        self.flights = flights
+        self.writes = writes
+
+    def _flight_group(self, *parts: Hashable) -> tuple:
+        """Return a single-flight group namespaced by the repository class."""
+        return (type(self.repo).__name__, *parts)
+
+    async def _coalesce(
+        self,
+        group: tuple,
+        key: tuple,
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Run a read through the single-flight registry, if one is configured.
+
+        Reads that may go to a replica and reads pinned to the primary (write
+        services, clients that just wrote) are never shared: a primary read
+        joining a replica read could miss the client's own write.
+
+        Args:
+            group (tuple): Invalidation group, see `_flight_group`.
+            key (tuple): Method name and arguments of the call.
+            loader (Callable[[], Awaitable[T]]): Performs the read.
+
+        Returns:
+            T: The result of the read.
+        """
+        if self.flights is None:
+            return await loader()
+        replica = getattr(self.repo.session, "replica", False)
+        return await self.flights.do(group, (*key, replica), loader)
+
+    async def _invalidate(self, *obj_ids: Any) -> None:
+        """
+        Drop the given records from the cache and stop sharing in-flight reads.
+
+        Any write may change list results, so list reads in flight are never
+        shared past a write.
+
+        Args:
+            *obj_ids (Any): Primary keys of the changed records.
+        """
+        if self.flights is not None:
+            self.flights.forget(
+                self._flight_group("list"),
+                *(self._flight_group("get", obj_id) for obj_id in obj_ids),
+            )
+        if self.cache is not None:
+            await self.cache.invalidate(*obj_ids)
 
     async def create(self, data: dict, user_id=None):
         """
@@ -42,24 +123,79 @@ class BaseCRUDService(Generic[RepoType]):
         """
         if not data.get("user_id") or data["user_id"] == 0:
             data["user_id"] = user_id
-        return await self.repo.create(data)
+        obj = await self.repo.create(data)
+        await self._invalidate()
+        return obj
 
-    async def get(self, obj_id: int, user_id=None):
+    async def bulk_create(self, items: list[dict], user_id=None):
+        """
+        Create many records in chunked set-based statements.
+
+        Injects the `user_id` into every item that does not carry one,
+        then delegates the creation to the repository.
+
+        Args:
+            items (list[dict]): Data for creating the records.
+            user_id (int | None): Optional user ID associated with the records.
+
+        Returns:
+            list[BulkItemResult]: One result per item, in input order.
+        """
+        if user_id is not None:
+            for data in items:
+                if not data.get("user_id"):
+                    data["user_id"] = user_id
+        results = await self.repo.bulk_create(items)
+        await self._invalidate()
+        return results
+
+    async def get(
+        self,
+        obj_id: int,
+        user_id=None,
+        columns: Sequence[str] | None = None,
+        archived: bool = False,
+    ):
         """
         Retrieve a single record by ID.
 
-        Delegates the operation to the underlying repository.
+        Delegates the operation to the underlying repository. When a cache is
+        configured, lookups without ownership validation are served from it
+        and the cached schema instance is returned instead of the ORM object;
+        lookups including archived records bypass it. Identical concurrent
+        database lookups are coalesced into one.
 
         Args:
             obj_id (int): The primary key of the record.
             user_id (int | None): Optional user ID for ownership validation.
+            columns (Sequence[str] | None): Columns the caller needs. Uncached
+                lookups select only these and return a row; cached lookups
+                return the full cached record, which has all of them.
+            archived (bool): Also look in the archive table.
 
         Returns:
             Any: The retrieved record or None if not found.
         """
-        return await self.repo.get(obj_id, user_id)
+        group = self._flight_group("get", obj_id)
+        if self.cache is None or user_id is not None or archived:
+            key = ("get", obj_id, user_id, columns and tuple(columns), archived)
+            return await self._coalesce(
+                group,
+                key,
+                lambda: self.repo.get(
+                    obj_id, user_id, columns=columns, archived=archived
+                ),
+            )
+        return await self.cache.get_or_load(
+            obj_id,
+            lambda: self._coalesce(
+                group,
+                ("get", obj_id, None, None, False),
+                lambda: self.repo.get(obj_id),
+            ),
+        )
 
-    async def list(self, user_id: int | None = None):
+    async def list(self, user_id: int | None = None, archived: bool = False):
         """
         Retrieve a list of records.
 
@@ -67,27 +203,163 @@ class BaseCRUDService(Generic[RepoType]):
 
         Args:
             user_id (int | None): Optional user ID for filtering.
+            archived (bool): Include archived records.
 
         Returns:
             list[Any]: A list of retrieved records.
         """
-        return await self.repo.list(user_id)
+        return await self._coalesce(
+            self._flight_group("list"),
+            ("list", user_id, archived),
+            lambda: self.repo.list(user_id, archived=archived),
+        )
+
+    async def list_page(
+        self,
+        user_id: int | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        columns: Sequence[str] | None = None,
+        query: ListQuery | None = None,
+    ):
+        """
+        Retrieve one page of records using keyset pagination.
+
+        Delegates the operation to the repository, optionally filtering by user.
+
+        Args:
+            user_id (int | None): Optional user ID for filtering.
+            limit (int): Maximum number of records to return.
+            cursor (str | None): Opaque cursor returned with the previous page.
+            columns (Sequence[str] | None): Return rows of these columns only.
+            query (ListQuery | None): Filters, ordering and search to apply.
+
+        Returns:
+            tuple[list[Any], str | None]: The records of the page and the cursor
+            of the next page, or None if there are no more records.
+        """
+        key = ("list_page", user_id, limit, cursor, columns and tuple(columns), query)
+        return await self._coalesce(
+            self._flight_group("list"),
+            key,
+            lambda: self.repo.list_page(
+                user_id, limit=limit, cursor=cursor, columns=columns, query=query
+            ),
+        )
+
+    async def changes(
+        self,
+        since: str | None = None,
+        limit: int = 500,
+        user_id: int | None = None,
+    ):
+        """
+        Retrieve records changed after a sync token, tombstones included.
+
+        Delegates the operation to the repository, optionally filtering by user.
+
+        Args:
+            since (str | None): Token returned by the previous call.
+            limit (int): Maximum number of records to return.
+            user_id (int | None): Optional user ID for filtering.
+
+        Returns:
+            tuple[list[Any], str | None, bool]: The changed records, the token
+            to resume from and whether more changes are available.
+        """
+        return await self.repo.changes(since, limit=limit, user_id=user_id)
+
+    async def stream(
+        self,
+        user_id: int | None = None,
+        batch_size: int = 1000,
+        columns: Sequence[str] | None = None,
+    ):
+        """
+        Stream all records in batches.
+
+        Delegates the operation to the repository, optionally filtering by user.
+
+        Args:
+            user_id (int | None): Optional user ID for filtering.
+            batch_size (int): Number of records per batch.
+            columns (Sequence[str] | None): Yield rows of these columns only.
+
+        Yields:
+            list[Any]: Consecutive batches of records.
+        """
+        async for batch in self.repo.stream(
+            user_id, batch_size=batch_size, columns=columns
+        ):
+            yield batch
 
-    async def update(self, obj_id: int, data: dict, user_id: int | None = None):
+    async def update(
+        self,
+        obj_id: int,
+        data: dict | BaseModel,
+        user_id: int | None = None,
+        expected_updated_at: Sequence[datetime] | None = None,
+    ):
         """
         Update an existing record.
 
-        Delegates the update operation to the repository.
+        Delegates the update operation to the repository. When a write-behind
+        batcher is configured, updates without a version check are merged
+        with concurrent updates and written in one transaction; the call
+        still returns only after the commit.
 
         Args:
             obj_id (int): The primary key of the record to update.
-            data (dict): The data used to update the record.
+            data (dict | BaseModel): The data used to update the record.
+            user_id (int | None): Optional user ID for ownership validation.
+            expected_updated_at (Sequence[datetime] | None): Accepted current
+                versions of the record for optimistic concurrency control.
+
+        Returns:
+            Any | None: The updated record, or None if not found or the
+            version did not match.
+        """
+        if isinstance(data, BaseModel):
+            data = data.model_dump(exclude_unset=True)
+        if self.writes is not None and data and expected_updated_at is None:
+            obj = await self.writes.update(obj_id, data, user_id)
+        else:
+            obj = await self.repo.update(
+                obj_id, data, user_id, expected_updated_at=expected_updated_at
+            )
+        if obj is not None:
+            await self._invalidate(obj_id)
+        return obj
+
+    async def bulk_update(self, items: list[tuple[int, dict]], user_id=None):
+        """
+        Update many records in chunked set-based statements.
+
+        Args:
+            items (list[tuple[int, dict]]): Pairs of primary key and changes.
+            user_id (int | None): Optional user ID for ownership validation.
+
+        Returns:
+            list[BulkItemResult]: One result per item, in input order.
+        """
+        results = await self.repo.bulk_update(items, user_id)
+        await self._invalidate(*(r.obj.id for r in results if r.ok))
+        return results
+
+    async def bulk_delete(self, ids: list[int], user_id: int | None = None):
+        """
+        Delete many records in chunked set-based statements.
+
+        Args:
+            ids (list[int]): Primary keys of the records to delete.
             user_id (int | None): Optional user ID for ownership validation.
 
         Returns:
-            Any | None: The updated record, or None if not found.
+            list[BulkItemResult]: One result per id, in input order.
         """
-        return await self.repo.update(obj_id, data, user_id)
+        results = await self.repo.bulk_soft_delete(ids, user_id)
+        await self._invalidate(*(r.obj for r in results if r.ok))
+        return results
 
     async def delete(self, obj_id: int, user_id: int | None = None):
         """
@@ -102,4 +374,7 @@ class BaseCRUDService(Generic[RepoType]):
         Returns:
             bool: True if deletion succeeded, False otherwise.
         """
-        return await self.repo.delete(obj_id, user_id)
+        deleted = await self.repo.delete(obj_id, user_id)
+        if deleted:
+            await self._invalidate(obj_id)
+        return deleted
@@ -1,15 +1,17 @@
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.shared.db.session import get_async_session
+from src.shared.db.lazy_session import LazyAsyncSession
+from src.shared.db.session import get_read_session, get_write_session
 
 
-def base_get_service(service_class, repo_class, *extra_args):
+def base_get_service(service_class, repo_class, *extra_args, read_only=False):
     """
     Factory function that generates a FastAPI dependency for creating service instances.
 
     This utility dynamically constructs a dependency function that:
-      1. Injects a database session using FastAPI's dependency system.
+      1. Injects a lazy database session using FastAPI's dependency system
+         (a read replica session when `read_only` is set). No connection is
+         checked out unless the service actually queries the database.
       2. Initializes the specified repository with that session.
       3. Instantiates the given service class, passing the repository (and any extra arguments).
 
@@ -29,12 +31,17 @@ def base_get_service(service_class, repo_class, *extra_args):
         service_class: The service class to instantiate (e.g., `ToDoService`).
         repo_class: The repository class to instantiate (e.g., `ToDoRepository`).
         *extra_args: Optional additional arguments to pass to the service constructor.
+        read_only (bool): The service is only used by read-only routes, so its
+            session may come from a read replica. Other services always use the
+            primary and keep the client's reads on it for a short while.
 
     Returns:
         Callable: A dependency function that FastAPI can use to inject a service instance.
     """
 
-    async def _get(session: AsyncSession = Depends(get_async_session)):
+    get_session = get_read_session if read_only else get_write_session
+
+    async def _get(session: LazyAsyncSession = Depends(get_session)):
         repo = repo_class(session)
         return service_class(repo, *extra_args)
 
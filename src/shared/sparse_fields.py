@@ -0,0 +1,60 @@
+from functools import lru_cache
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+class InvalidFieldsError(ValueError):
+    """
+    Raised when a sparse fieldset names fields the schema does not have.
+    """
+
+
+def parse_fields(raw: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """
+    Parse a comma-separated `fields=` query parameter.
+
+    Args:
+        raw (str | None): Raw parameter value, e.g. `"id,title"`.
+        schema (type[BaseModel]): Schema the fields are validated against.
+
+    Returns:
+        tuple[str, ...] | None: Requested fields in schema order, or None if
+        the parameter is absent (the full representation is requested).
+
+    Raises:
+        InvalidFieldsError: If the list is empty or names unknown fields.
+    """
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    if not requested:
+        raise InvalidFieldsError("No fields requested")
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def sparse_model(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Build (and cache) a schema restricted to the given fields.
+
+    The fields keep their type and constraints from `schema`.
+
+    Args:
+        schema (type[BaseModel]): The full schema.
+        fields (tuple[str, ...]): Fields to keep, as returned by `parse_fields`.
+
+    Returns:
+        type[BaseModel]: A model with only `fields`, readable from attributes.
+    """
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in fields
+    }
+    return create_model(
+        f"{schema.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
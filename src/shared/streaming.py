@@ -0,0 +1,62 @@
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+from src.shared.fast_json import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson(
+    batches: AsyncIterable[Sequence[Any]],
+    schema: type[BaseModel],
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of objects as newline-delimited JSON.
+
+    Each object is validated against `schema` and dumped on its own line.
+    One chunk is produced per batch, so the response is flushed to the
+    client as soon as a batch is read from the database.
+
+    Args:
+        batches (AsyncIterable[Sequence[Any]]): Batches of ORM objects or dicts.
+        schema (type[BaseModel]): Schema used to serialize each object.
+
+    Yields:
+        bytes: Encoded NDJSON chunk for one batch.
+    """
+    async for batch in batches:
+        if not batch:
+            continue
+        yield b"".join(
+            schema.model_validate(obj).model_dump_json().encode() + b"\n"
+            for obj in batch
+        )
+
+
+async def iter_ndjson_rows(
+    batches: AsyncIterable[Sequence[Row]],
+    fields: Sequence[str],
+) -> AsyncIterator[bytes]:
+    """
+    Encode batches of row tuples as newline-delimited JSON.
+
+    Fast path of `iter_ndjson`: rows are encoded directly with `dumps`
+    without ORM hydration or pydantic validation.
+
+    Args:
+        batches (AsyncIterable[Sequence[Row]]): Batches of selected rows.
+        fields (Sequence[str]): Row fields to emit, in output order.
+
+    Yields:
+        bytes: Encoded NDJSON chunk for one batch.
+    """
+    async for batch in batches:
+        if not batch:
+            continue
+        yield b"".join(
+            dumps({name: getattr(row, name) for name in fields}) + b"\n"
+            for row in batch
+        )